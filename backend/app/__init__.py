@@ -1,21 +1,46 @@
 import os
 from flask import Flask
 from flask_cors import CORS
-from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
+from . import broker, cache, compression, metrics, serialization, sqlite
 
-db = SQLAlchemy()
-migrate = Migrate()
+db = sqlite.TunedSQLAlchemy()
+
+def init_migrate(app):
+    """Register Flask-Migrate, only once it is needed: importing alembic would double startup time"""
+    if 'migrate' not in app.extensions:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    return app.extensions['migrate']
 
 def create_app(test_config=None):
     """Create and configure the Flask app"""
     app = Flask(__name__, instance_relative_config=True)
+    # JSON or MessagePack request bodies
+    app.request_class = serialization.Request
     
     # Configure the app
     app.config.from_mapping(
         SECRET_KEY=os.environ.get('SECRET_KEY', 'dev'),
         SQLALCHEMY_DATABASE_URI=os.environ.get('DATABASE_URL', 'sqlite:///notscrum.sqlite'),
-        SQLALCHEMY_TRACK_MODIFICATIONS=False
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        SNAPSHOT_CACHE_MAX_BYTES=int(os.environ.get('SNAPSHOT_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+        # Response compression: smallest body worth compressing, gzip level (0 turns
+        # compression off) and brotli quality, used when the brotli package is installed
+        COMPRESS_MIN_SIZE=int(os.environ.get('COMPRESS_MIN_SIZE', 1024)),
+        COMPRESS_LEVEL=int(os.environ.get('COMPRESS_LEVEL', 4)),
+        COMPRESS_BROTLI_QUALITY=int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4)),
+        # SQLite tuning profile; SQLITE_TUNING=off keeps SQLite's defaults
+        SQLITE_PRAGMAS={} if os.environ.get('SQLITE_TUNING') == 'off' else dict(sqlite.DEFAULT_PRAGMAS),
+        SQLITE_POOL_SIZE=int(os.environ.get('SQLITE_POOL_SIZE', 5)),
+        SQLITE_MAINTENANCE_INTERVAL=int(os.environ.get('SQLITE_MAINTENANCE_INTERVAL', 300)),
+        # Board event stream: seconds between polls of the change table, events kept
+        # in memory per worker, seconds between keepalives, client reconnect delay (ms)
+        # and open streams per worker (0 for no limit; gunicorn.conf.py sets it from its threads)
+        EVENTS_POLL_INTERVAL=float(os.environ.get('EVENTS_POLL_INTERVAL', 1)),
+        EVENTS_BUFFER_SIZE=int(os.environ.get('EVENTS_BUFFER_SIZE', 1000)),
+        EVENTS_KEEPALIVE=float(os.environ.get('EVENTS_KEEPALIVE', 15)),
+        EVENTS_RETRY=int(os.environ.get('EVENTS_RETRY', 3000)),
+        EVENTS_MAX_STREAMS=int(os.environ.get('EVENTS_MAX_STREAMS', 0))
     )
     
     # Enable CORS for all routes
@@ -23,7 +48,14 @@ def create_app(test_config=None):
     
     # Initialize extensions
     db.init_app(app)
-    migrate.init_app(app, db)
+    if os.environ.get('FLASK_RUN_FROM_CLI'):
+        # `flask db ...` finds its configuration on the app
+        init_migrate(app)
+    cache.init_app(app)
+    compression.init_app(app)
+    sqlite.init_app(app, db)
+    broker.init_app(app)
+    metrics.init_app(app, db)
     
     # Ensure the instance folder exists
     try:
@@ -32,10 +64,20 @@ def create_app(test_config=None):
         pass
     
     # Register API blueprints
-    from .api import boards, lanes, cards
+    from .api import boards, lanes, cards, events, batch, search, system
     app.register_blueprint(boards.bp)
     app.register_blueprint(lanes.bp)
     app.register_blueprint(cards.bp)
+    app.register_blueprint(events.bp)
+    app.register_blueprint(batch.bp)
+    app.register_blueprint(search.bp)
+    app.register_blueprint(system.bp)
+    
+    # Register CLI commands
+    from . import importer, seed, startup
+    importer.init_app(app)
+    seed.init_app(app)
+    startup.init_app(app)
     
     # Configure Swagger UI
     from .api.swagger import configure_swagger
@@ -1,6 +1 @@
-from flask import Blueprint
-
-bp = Blueprint('api', __name__)
-
-# Import routes at the bottom to avoid circular imports
-from app.api import boards, lanes, cards
\ No newline at end of file
+"""API blueprints, one module each; create_app() imports and registers them"""
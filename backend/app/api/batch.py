@@ -0,0 +1,103 @@
+import re
+from flask import Blueprint, current_app, jsonify, request
+from werkzeug.exceptions import HTTPException
+from .. import db
+from ..sqlite import begin_immediate
+
+bp = Blueprint('batch', __name__, url_prefix='/api')
+
+MAX_BATCH_REQUESTS = 100
+METHODS = {'GET', 'POST', 'PUT', 'DELETE'}
+# Responses that never end (event streams) or could be arbitrarily large
+STREAMING_MIMETYPES = {'text/event-stream', 'application/x-ndjson'}
+# Endpoints that commit in chunks of their own, which would end the batch's transaction
+UNBATCHABLE_ENDPOINTS = {'cards.import_cards'}
+
+# "$2.id" stands for the "id" field of the response to the third request in the batch
+REFERENCE = re.compile(r'\$(\d+)\.(\w+)')
+
+def resolve(value, results):
+    """Replace references to earlier responses in a path or JSON body; raises ValueError if one is invalid"""
+    if isinstance(value, dict):
+        return {key: resolve(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve(item, results) for item in value]
+    if not isinstance(value, str) or '$' not in value:
+        return value
+
+    def lookup(match):
+        index, field = int(match.group(1)), match.group(2)
+        body = results[index]['body'] if index < len(results) else None
+        if not isinstance(body, dict) or field not in body:
+            raise ValueError(f'Invalid reference {match.group(0)}')
+        return body[field]
+
+    # A value that is only a reference keeps the referenced value's type
+    match = REFERENCE.fullmatch(value)
+    if match:
+        return lookup(match)
+    return REFERENCE.sub(lambda match: str(lookup(match)), value)
+
+def endpoint_for(method, path):
+    """The endpoint a request would be routed to, or None if it matches no route"""
+    try:
+        return current_app.url_map.bind(request.host).match(path.split('?')[0], method)[0]
+    except HTTPException:
+        return None
+
+def dispatch(session, method, path, body):
+    """Run one request through the app's routing inside a SAVEPOINT, which its commit releases"""
+    session.begin_nested()
+    with current_app.test_request_context(path, method=method, json=body):
+        response = current_app.full_dispatch_request()
+    if session.in_nested_transaction():
+        # Nothing committed, e.g. a read
+        session.commit()
+    return response
+
+@bp.route('/batch', methods=['POST'])
+def run_batch():
+    """Run several API requests in one database transaction"""
+    data = request.get_json()
+    requests = data.get('requests') if isinstance(data, dict) else None
+    if not isinstance(requests, list) or not 1 <= len(requests) <= MAX_BATCH_REQUESTS:
+        return jsonify({'error': f'requests must be a list of 1 to {MAX_BATCH_REQUESTS} requests'}), 400
+
+    session = db.session()
+    begin_immediate(session)
+    transaction = session.get_transaction()
+    results = []
+    for index, sub_request in enumerate(requests):
+        try:
+            method = sub_request.get('method', 'GET').upper()
+            path = resolve(sub_request['path'], results)
+            body = resolve(sub_request.get('body'), results)
+            if method not in METHODS or not path.startswith('/api/') or path.split('?')[0] == request.path:
+                raise ValueError(f'Unsupported request {method} {path}')
+            if endpoint_for(method, path) in UNBATCHABLE_ENDPOINTS:
+                raise ValueError(f'{method} {path} commits on its own and cannot be batched')
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            session.rollback()
+            error = str(e) if isinstance(e, ValueError) else 'Each request needs a method and path'
+            return jsonify({'error': error, 'index': index}), 400
+
+        response = dispatch(session, method, path, body)
+        if session.get_transaction() is not transaction:
+            # A handler committed more than once, which ended the batch's transaction early
+            session.rollback()
+            return jsonify({'error': f'{method} {path} commits on its own and cannot be batched',
+                            'index': index}), 409
+        if response.mimetype in STREAMING_MIMETYPES:
+            response.close()
+            session.rollback()
+            return jsonify({'error': 'Streaming responses cannot be batched', 'index': index}), 400
+
+        results.append({'status': response.status_code, 'body': response.get_json(silent=True)})
+        if response.status_code >= 400:
+            # All or nothing
+            session.rollback()
+            return jsonify({'error': f'Request {index} failed', 'index': index, 'results': results}), \
+                response.status_code
+
+    session.commit()
+    return jsonify({'results': results}), 200
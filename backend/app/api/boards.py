@@ -1,19 +1,29 @@
-from flask import Blueprint, jsonify, request
+import itertools
+import json
+from datetime import datetime
+from flask import Blueprint, Response, abort, json as flask_json, request, stream_with_context
 from .. import db
+from ..cache import cached_response
 from ..models.board import Board
 from ..models.lane import Lane
+from ..models.card import Card
+from ..models.event import BoardEvent
+from .conditional import board_validators, not_modified_response
+from .listing import STREAM_BATCH_SIZE, list_rows, wants_stream
+from .placement import read_placement
+from ..serialization import respond
+from ..ordering import keys_after
 
 bp = Blueprint('boards', __name__, url_prefix='/api')
 
 @bp.route('/boards', methods=['GET'])
 def get_all_boards():
     """Get all boards"""
-    boards = Board.query.all()
-    return jsonify([{
+    return list_rows(db.session.query(Board.id, Board.name, Board.description), [Board.id], lambda board: {
         'id': board.id,
         'name': board.name,
         'description': board.description
-    } for board in boards]), 200
+    })
 
 @bp.route('/boards', methods=['POST'])
 def create_board():
@@ -21,27 +31,27 @@ def create_board():
     data = request.get_json()
     
     if not data or 'name' not in data:
-        return jsonify({'error': 'Name is required'}), 400
+        return respond({'error': 'Name is required'}), 400
     
     board = Board(
         name=data.get('name'),
         description=data.get('description', '')
     )
     db.session.add(board)
-    db.session.commit()
+    db.session.flush()
+    BoardEvent.record(board.id, 'board.created', board)
     
     # Create default lanes
     default_lanes = ['To Do', 'In Progress', 'Done']
-    position = 1
     
-    for lane_title in default_lanes:
-        lane = Lane(name=lane_title, board_id=board.id, position=position)
+    for lane_title, rank in zip(default_lanes, keys_after(None, len(default_lanes))):
+        lane = Lane(name=lane_title, board_id=board.id, rank=rank)
         db.session.add(lane)
-        position += 1
+        BoardEvent.record(board.id, 'lane.created', lane)
     
     db.session.commit()
     
-    return jsonify({
+    return respond({
         'id': board.id,
         'name': board.name,
         'description': board.description
@@ -51,24 +61,42 @@ def create_board():
 def get_board(board_id):
     """Get a board by ID with its lanes"""
     board = Board.query.get_or_404(board_id)
-    # Get lanes ordered by position
-    lanes = Lane.query.filter_by(board_id=board_id).order_by(Lane.position).all()
     
-    # Format the response with board data and lanes
-    board_data = {
-        'id': board.id,
-        'name': board.name,
-        'description': board.description,
-        'lanes': [{
-            'id': lane.id,
-            'name': lane.name,
-            'board_id': lane.board_id,
-            'position': lane.position,
-            'cards': [] # Cards will be loaded separately
-        } for lane in lanes]
-    }
+    # Answer polling clients from the board version alone when nothing changed
+    headers, not_modified = board_validators(board.id, board.version, board.updated_at)
+    if not_modified:
+        return not_modified_response(headers)
     
-    return jsonify(board_data), 200
+    # ?include=cards returns the full board snapshot in a single response
+    include_cards = 'cards' in request.args.get('include', '').split(',')
+    
+    def build():
+        # Get lanes in board order
+        lanes = Lane.query.filter_by(board_id=board_id).order_by(Lane.rank).all()
+        
+        cards_by_lane = {lane.id: [] for lane in lanes}
+        if include_cards:
+            # One query for every card on the board instead of one per lane, as plain rows
+            cards = db.session.query(*Card.DICT_COLUMNS).join(Lane).filter(Lane.board_id == board_id).order_by(
+                Card.lane_id, Card.rank)
+            for card in cards:
+                cards_by_lane[card.lane_id].append(Card.row_dict(card))
+        
+        # Format the response with board data and lanes
+        return {
+            'id': board.id,
+            'name': board.name,
+            'description': board.description,
+            'version': board.version,
+            'lanes': [{
+                'id': lane.id,
+                'name': lane.name,
+                'board_id': lane.board_id,
+                'cards': cards_by_lane[lane.id]
+            } for lane in lanes]
+        }
+    
+    return cached_response((board.id, board.version, 'board', include_cards), build), 200, headers
 
 @bp.route('/boards/<int:board_id>', methods=['PUT'])
 def update_board(board_id):
@@ -81,9 +109,11 @@ def update_board(board_id):
     if data.get('description') is not None:
         board.description = data.get('description')
     
+    Board.touch(board.id)
+    BoardEvent.record(board.id, 'board.updated', board)
     db.session.commit()
     
-    return jsonify({
+    return respond({
         'id': board.id,
         'name': board.name,
         'description': board.description
@@ -93,23 +123,34 @@ def update_board(board_id):
 def delete_board(board_id):
     """Delete a board"""
     board = Board.query.get_or_404(board_id)
+    Board.touch(board.id)
+    BoardEvent.record(board.id, 'board.deleted', board)
+    # One DELETE each for the cards and lanes, rather than loading every lane's cards to cascade
+    lane_ids = db.session.query(Lane.id).filter_by(board_id=board.id)
+    Card.query.filter(Card.lane_id.in_(lane_ids)).delete(synchronize_session=False)
+    Lane.query.filter_by(board_id=board.id).delete(synchronize_session=False)
     db.session.delete(board)
     db.session.commit()
     
-    return jsonify({'message': 'Board deleted successfully'}), 200
+    return respond({'message': 'Board deleted successfully'}), 200
 
 @bp.route('/boards/<int:board_id>/lanes', methods=['GET'])
 def get_board_lanes(board_id):
     """Get all lanes for a board"""
-    Board.query.get_or_404(board_id)  # Check if board exists
-    lanes = Lane.query.filter_by(board_id=board_id).order_by(Lane.position).all()
+    board = Board.query.get_or_404(board_id)  # Check if board exists
+    headers, not_modified = board_validators(board.id, board.version, board.updated_at)
+    if not_modified:
+        return not_modified_response(headers)
     
-    return jsonify([{
-        'id': lane.id,
-        'name': lane.name,
-        'board_id': lane.board_id,
-        'position': lane.position
-    } for lane in lanes]), 200
+    def build():
+        lanes = Lane.query.filter_by(board_id=board_id).order_by(Lane.rank).all()
+        return [{
+            'id': lane.id,
+            'name': lane.name,
+            'board_id': lane.board_id
+        } for lane in lanes]
+    
+    return cached_response((board.id, board.version, 'lanes'), build), 200, headers
 
 @bp.route('/boards/<int:board_id>/lanes', methods=['POST'])
 def create_board_lane(board_id):
@@ -118,27 +159,231 @@ def create_board_lane(board_id):
     data = request.get_json()
     
     if not data or 'name' not in data:
-        return jsonify({'error': 'Name is required'}), 400
-    
-    # Find the highest position in the board
-    max_position = db.session.query(db.func.max(Lane.position)).filter_by(
-        board_id=board_id).scalar() or 0
+        return respond({'error': 'Name is required'}), 400
+    try:
+        index = read_placement(data)[0]
+    except ValueError as e:
+        return respond({'error': str(e)}), 400
     
-    # Use provided position or calculate based on existing lanes
-    position = data.get('position') if data.get('position') is not None else max_position + 1
+    # Place the lane at the given zero-based index, or after the existing lanes
+    rank = Lane.rank_for(board_id, index=index)
     
     lane = Lane(
         name=data.get('name'),
         board_id=board_id,
-        position=position
+        rank=rank
     )
     
     db.session.add(lane)
+    Board.touch(board_id)
+    BoardEvent.record(board_id, 'lane.created', lane)
+    db.session.commit()
+    
+    return respond({
+        'id': lane.id,
+        'name': lane.name,
+        'board_id': lane.board_id
+    }), 201
+
+@bp.route('/boards/<int:board_id>/lanes/reorder', methods=['PUT'])
+def reorder_board_lanes(board_id):
+    """Reorder all lanes in a board"""
+    Board.query.get_or_404(board_id)  # Check if board exists
+    data = request.get_json()
+    
+    lane_order = data.get('lane_order') if data else None
+    current = {lane_id for lane_id, in db.session.query(Lane.id).filter_by(board_id=board_id)}
+    if not isinstance(lane_order, list) or set(lane_order) != current or len(lane_order) != len(current):
+        return respond({'error': 'lane_order must list every lane in the board exactly once'}), 400
+    
+    # Rewrite the order keys in one bulk UPDATE and one commit
+    Lane.move_many([(lane_id, board_id, index) for index, lane_id in enumerate(lane_order)])
+    Board.touch(board_id)
+    BoardEvent.record_many(board_id, 'lane.moved', Lane, lane_order)
     db.session.commit()
     
-    return jsonify({
+    lanes = Lane.query.filter_by(board_id=board_id).order_by(Lane.rank).all()
+    return respond([{
         'id': lane.id,
         'name': lane.name,
-        'board_id': lane.board_id,
-        'position': lane.position
+        'board_id': lane.board_id
+    } for lane in lanes]), 200
+
+@bp.route('/boards/<int:board_id>/changes', methods=['GET'])
+def get_board_changes(board_id):
+    """Get the board, lanes and cards changed since a board version, with tombstones for deleted ones"""
+    try:
+        since = int(request.args['since'])
+    except (KeyError, ValueError):
+        return respond({'error': 'since must be a board version'}), 400
+    
+    # The board row is gone once deleted, but its events (and tombstone) are not
+    version = db.session.query(Board.version).filter_by(id=board_id).scalar()
+    logged = db.session.query(BoardEvent.version).filter_by(board_id=board_id)
+    first_logged = logged.order_by(BoardEvent.version).limit(1).scalar()
+    if version is None and first_logged is None:
+        abort(404)
+    if version is None:
+        version = logged.order_by(BoardEvent.version.desc()).limit(1).scalar()
+    
+    # Changes made before the board's history was logged cannot be replayed
+    if since < (first_logged or version + 1) - 1:
+        return respond({'error': 'Changes since this version are not available, reload the board'}), 410
+    
+    # Keep the latest change to each row
+    latest = {}
+    imports = []
+    for kind, entity_id, data in db.session.query(BoardEvent.kind, BoardEvent.entity_id, BoardEvent.data).filter(
+            BoardEvent.board_id == board_id, BoardEvent.version > since).order_by(
+            BoardEvent.version, BoardEvent.id):
+        if kind == 'cards.imported':
+            imports.append(json.loads(data))
+            continue
+        entity, action = kind.split('.')
+        latest[entity, entity_id] = action, data
+    
+    # An import logs one event per chunk rather than its cards, so read those that still exist
+    imported = []
+    if imports:
+        imported = [Card.row_dict(row) for row in db.session.query(*Card.DICT_COLUMNS).join(Lane).filter(
+            Lane.board_id == board_id, db.or_(*(Card.id.between(summary['first_id'], summary['last_id'])
+                                                for summary in imports)))]
+    imported_ids = {card['id'] for card in imported}
+    
+    changes = {'board': [], 'lane': [], 'card': imported}
+    deleted = {'board': [], 'lane': [], 'card': []}
+    for (entity, entity_id), (action, data) in latest.items():
+        if action == 'deleted':
+            deleted[entity].append(entity_id)
+        elif data is not None and not (entity == 'card' and entity_id in imported_ids):
+            changes[entity].append(json.loads(data))
+    
+    return respond({
+        'board_id': board_id,
+        'version': version,
+        'board': changes['board'][0] if changes['board'] else None,
+        'lanes': changes['lane'],
+        'cards': changes['card'],
+        'deleted': {
+            'board': bool(deleted['board']),
+            'lanes': deleted['lane'],
+            'cards': deleted['card']
+        }
+    }), 200
+
+@bp.route('/boards/<int:board_id>/export', methods=['GET'])
+def export_board(board_id):
+    """Export a board with all its lanes and cards as a JSON document or NDJSON"""
+    board = Board.query.get_or_404(board_id)
+    board_data = {
+        'id': board.id,
+        'name': board.name,
+        'description': board.description,
+        'version': board.version
+    }
+    ndjson = wants_stream()
+    
+    def board_lanes():
+        """Yield (lane, batches of its cards) in board order, all read by one streamed query"""
+        # Lanes joined to their cards walk the two rank indexes in order, so the rows come
+        # sorted without the board being held in memory or turned into ORM objects
+        # (to_dict only reads attributes), and lanes and cards are one consistent snapshot
+        lane_table = Lane.__table__
+        card_table = Card.__table__
+        result = db.session.execute(db.select([
+            lane_table.c.id.label('lane_key'), lane_table.c.name.label('lane_name')] + list(card_table.c)).select_from(
+            lane_table.outerjoin(card_table, card_table.c.lane_id == lane_table.c.id)).where(
+            lane_table.c.board_id == board_id).order_by(
+            lane_table.c.rank, lane_table.c.id, card_table.c.rank).execution_options(stream_results=True))
+        rows = itertools.chain.from_iterable(result.partitions(STREAM_BATCH_SIZE))
+        head = [next(rows, None)]
+        
+        def lane_cards(lane_id):
+            batch = []
+            while head[0] is not None and head[0].lane_key == lane_id:
+                if head[0].id is not None:  # Not the empty side of a lane without cards
+                    batch.append(Card.to_dict(head[0]))
+                head[0] = next(rows, None)
+                if len(batch) == STREAM_BATCH_SIZE:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        
+        while head[0] is not None:
+            row = head[0]
+            cards = lane_cards(row.lane_key)
+            yield {'id': row.lane_key, 'name': row.lane_name}, cards
+            for _ in cards:  # Skip whatever the caller did not read
+                pass
+    
+    def generate_ndjson():
+        yield flask_json.dumps(dict(board_data, type='board')) + '\n'
+        for lane, cards in board_lanes():
+            yield flask_json.dumps(dict(lane, type='lane')) + '\n'
+            for batch in cards:
+                yield ''.join(flask_json.dumps(dict(card, type='card')) + '\n' for card in batch)
+    
+    def generate_json():
+        # Write the document piece by piece: {...board, "lanes": [{...lane, "cards": [...]}, ...]}
+        yield flask_json.dumps(board_data)[:-1] + ',"lanes":['
+        for index, (lane, cards) in enumerate(board_lanes()):
+            yield (',' if index else '') + flask_json.dumps(lane)[:-1] + ',"cards":['
+            for batch_index, batch in enumerate(cards):
+                yield (',' if batch_index else '') + ','.join(flask_json.dumps(card) for card in batch)
+            yield ']}'
+        yield ']}\n'
+    
+    extension = 'ndjson' if ndjson else 'json'
+    return Response(stream_with_context(generate_ndjson() if ndjson else generate_json()),
+                    mimetype='application/x-ndjson' if ndjson else 'application/json',
+                    headers={'Content-Disposition': f'attachment; filename=board-{board_id}.{extension}'})
+
+@bp.route('/boards/<int:board_id>/clone', methods=['POST'])
+def clone_board(board_id):
+    """Copy a board with all its lanes and cards"""
+    source = Board.query.get_or_404(board_id)
+    data = request.get_json(silent=True) or {}
+    
+    board = Board(
+        name=data.get('name') or f'{source.name} (copy)',
+        description=source.description
+    )
+    db.session.add(board)
+    db.session.flush()
+    
+    # Copy the lanes with one INSERT ... SELECT, then every card with another, joined to a map
+    # from each source lane to its copy, so neither the statements nor the SQL grow with the board
+    lane_table = Lane.__table__
+    card_table = Card.__table__
+    now = datetime.utcnow()
+    lane_columns = ['name', 'rank']
+    db.session.execute(lane_table.insert().from_select(
+        lane_columns + ['board_id', 'created_at', 'updated_at'],
+        db.select([lane_table.c[column] for column in lane_columns] + [
+            db.literal(board.id), db.literal(now, db.DateTime), db.literal(now, db.DateTime)
+        ]).where(lane_table.c.board_id == board_id).order_by(lane_table.c.id)))
+    
+    def numbered_lanes(owner_id):
+        return db.select([lane_table.c.id, db.func.row_number().over(order_by=lane_table.c.id).label('n')]).where(
+            lane_table.c.board_id == owner_id).subquery()
+    
+    # The n-th source lane by id maps to the n-th copy: the copies were inserted in that order
+    source, copy = numbered_lanes(board_id), numbered_lanes(board.id)
+    card_columns = ['title', 'description', 'color', 'rank', 'due_date']
+    db.session.execute(card_table.insert().from_select(
+        card_columns + ['lane_id', 'created_at', 'updated_at'],
+        db.select([card_table.c[column] for column in card_columns] + [
+            copy.c.id, db.literal(now, db.DateTime), db.literal(now, db.DateTime)
+        ]).select_from(card_table.join(source, card_table.c.lane_id == source.c.id).join(
+            copy, copy.c.n == source.c.n))))
+    
+    # No events are logged for the copy: its history starts with its first change,
+    # so clients load it in full (and delta sync from version 0 asks them to)
+    db.session.commit()
+    
+    return respond({
+        'id': board.id,
+        'name': board.name,
+        'description': board.description
     }), 201
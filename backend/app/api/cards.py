@@ -1,14 +1,22 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, request
 from .. import db
+from ..models.board import Board
 from ..models.card import Card
+from ..models.event import BoardEvent
+from ..importer import CardImporter
+from ..models.lane import Lane
+from .listing import list_rows
+from .placement import read_index, read_placement
+from ..serialization import respond
+from ..ordering import key_between
 
 bp = Blueprint('cards', __name__, url_prefix='/api')
 
 @bp.route('/cards', methods=['GET'])
 def get_all_cards():
     """Get all cards"""
-    cards = Card.query.all()
-    return jsonify([card.to_dict() for card in cards]), 200
+    # Plain rows of the Card.to_dict() columns: no ORM objects, and datetimes are encoded natively
+    return list_rows(db.session.query(*Card.DICT_COLUMNS), [Card.id], Card.row_dict)
 
 @bp.route('/cards', methods=['POST'])
 def create_card():
@@ -16,30 +24,48 @@ def create_card():
     data = request.get_json()
     
     if not data or 'title' not in data or 'lane_id' not in data:
-        return jsonify({'error': 'Title and lane_id are required'}), 400
+        return respond({'error': 'Title and lane_id are required'}), 400
     
-    # Find the highest position in the lane
-    max_position = db.session.query(db.func.max(Card.position)).filter_by(
-        lane_id=data.get('lane_id')).scalar() or 0
+    # The lane's board, checked before the card is flushed
+    board_ids = Board.touch_lanes(data.get('lane_id'))
+    if not board_ids:
+        return respond({'error': 'Lane not found'}), 404
+    
+    # Find the highest order key in the lane
+    last_rank = Card.last_rank(data.get('lane_id'))
     
     card = Card(
         title=data.get('title'),
         description=data.get('description', ''),
         lane_id=data.get('lane_id'),
-        position=max_position + 1,
+        rank=key_between(last_rank, None),
         color=data.get('color', 'white')
     )
     
     db.session.add(card)
+    for board_id in board_ids:
+        BoardEvent.record(board_id, 'card.created', card)
     db.session.commit()
     
-    return jsonify(card.to_dict()), 201
+    return respond(card.to_dict()), 201
+
+@bp.route('/cards/import', methods=['POST'])
+def import_cards():
+    """Append many cards to their lanes from an NDJSON or CSV request body"""
+    importer = CardImporter()
+    try:
+        # Read line by line so large imports are never held in memory
+        importer.run(request.stream, 'csv' if request.mimetype == 'text/csv' else 'ndjson')
+    except ValueError as e:
+        return respond({'error': str(e), 'imported': importer.imported}), 400
+    
+    return respond({'imported': importer.imported}), 201
 
 @bp.route('/lanes/<int:lane_id>/cards', methods=['GET'])
 def get_cards_by_lane(lane_id):
     """Get all cards for a specific lane"""
-    cards = Card.query.filter_by(lane_id=lane_id).order_by(Card.position).all()
-    return jsonify([card.to_dict() for card in cards]), 200
+    cards = Card.query.filter_by(lane_id=lane_id).order_by(Card.rank).all()
+    return respond([card.to_dict() for card in cards]), 200
 
 @bp.route('/lanes/<int:lane_id>/cards', methods=['POST'])
 def create_card_in_lane(lane_id):
@@ -47,30 +73,36 @@ def create_card_in_lane(lane_id):
     data = request.get_json()
     
     if not data or 'title' not in data:
-        return jsonify({'error': 'Title is required'}), 400
+        return respond({'error': 'Title is required'}), 400
+    
+    # The lane's board, checked before the card is flushed
+    board_ids = Board.touch_lanes(lane_id)
+    if not board_ids:
+        return respond({'error': 'Lane not found'}), 404
     
-    # Find the highest position in the lane
-    max_position = db.session.query(db.func.max(Card.position)).filter_by(
-        lane_id=lane_id).scalar() or 0
+    # Find the highest order key in the lane
+    last_rank = Card.last_rank(lane_id)
     
     card = Card(
         title=data.get('title'),
         description=data.get('description', ''),
         lane_id=lane_id,
-        position=max_position + 1,
+        rank=key_between(last_rank, None),
         color=data.get('color', 'white')
     )
     
     db.session.add(card)
+    for board_id in board_ids:
+        BoardEvent.record(board_id, 'card.created', card)
     db.session.commit()
     
-    return jsonify(card.to_dict()), 201
+    return respond(card.to_dict()), 201
 
 @bp.route('/cards/<int:card_id>', methods=['GET'])
 def get_card(card_id):
     """Get a card by ID"""
     card = Card.query.get_or_404(card_id)
-    return jsonify(card.to_dict()), 200
+    return respond(card.to_dict()), 200
 
 @bp.route('/cards/<int:card_id>', methods=['PUT'])
 def update_card(card_id):
@@ -78,14 +110,36 @@ def update_card(card_id):
     card = Card.query.get_or_404(card_id)
     data = request.get_json()
     
+    try:
+        position, after_id, before_id = read_placement(data)
+    except ValueError as e:
+        return respond({'error': str(e)}), 400
+    
+    # Checked before any change is flushed
+    if data.get('lane_id') is not None and data.get('lane_id') != card.lane_id \
+            and Lane.query.get(data.get('lane_id')) is None:
+        return respond({'error': 'Lane not found'}), 404
+    
     if data.get('title'):
         card.title = data.get('title')
     if data.get('description') is not None:
         card.description = data.get('description')
+    
+    # Move between neighbours (or to the end of a new lane) with a single new order key
+    lane_id = data.get('lane_id') if data.get('lane_id') is not None else card.lane_id
+    try:
+        if after_id is not None or before_id is not None:
+            card.rank = Card.rank_for(lane_id, after_id=after_id, before_id=before_id, exclude_id=card.id)
+        elif position is not None:
+            card.rank = Card.rank_for(lane_id, index=position, exclude_id=card.id)
+        elif lane_id != card.lane_id:
+            card.rank = Card.rank_for(lane_id)
+    except ValueError:
+        return respond({'error': 'after_id and before_id must be other cards in the target lane'}), 400
+    for board_id in Board.touch_lanes(card.lane_id, lane_id):
+        BoardEvent.record(board_id, 'card.updated', card)
     if data.get('lane_id') is not None:
         card.lane_id = data.get('lane_id')
-    if data.get('position') is not None:
-        card.position = data.get('position')
     if data.get('color'):
         card.color = data.get('color')
     if data.get('due_date') is not None:
@@ -93,13 +147,101 @@ def update_card(card_id):
     
     db.session.commit()
     
-    return jsonify(card.to_dict()), 200
+    return respond(card.to_dict()), 200
 
 @bp.route('/cards/<int:card_id>', methods=['DELETE'])
 def delete_card(card_id):
     """Delete a card"""
     card = Card.query.get_or_404(card_id)
     db.session.delete(card)
+    for board_id in Board.touch_lanes(card.lane_id):
+        BoardEvent.record(board_id, 'card.deleted', card)
     db.session.commit()
     
-    return jsonify({'message': 'Card deleted successfully'}), 200
+    return respond({'message': 'Card deleted successfully'}), 200
+
+def _apply_moves(moves):
+    """Validate and apply (card_id, lane_id, position) moves; returns an error response or None"""
+    card_ids = [card_id for card_id, _, _ in moves]
+    lane_ids = {lane_id for _, lane_id, _ in moves}
+    if len(set(card_ids)) != len(card_ids):
+        return respond({'error': 'Each card can only be moved once'}), 400
+    
+    # Check every card and target lane up front so nothing is half-applied
+    card_boards = dict(db.session.query(Card.id, Lane.board_id).join(Lane).filter(
+        Card.id.in_(card_ids)).all())
+    lane_boards = dict(db.session.query(Lane.id, Lane.board_id).filter(Lane.id.in_(lane_ids)).all())
+    missing_cards = sorted(set(card_ids) - set(card_boards))
+    missing_lanes = sorted(lane_ids - set(lane_boards))
+    if missing_cards or missing_lanes:
+        return respond({'error': 'Cards or lanes not found', 'cards': missing_cards,
+                        'lanes': missing_lanes}), 404
+    if len(set(card_boards.values()) | set(lane_boards.values())) > 1:
+        return respond({'error': 'Cards can only be moved between lanes of the same board'}), 400
+    
+    board_id, = set(lane_boards.values())
+    Card.move_many(moves)
+    Board.touch(board_id)
+    BoardEvent.record_many(board_id, 'card.moved', Card, card_ids)
+    db.session.commit()
+    return None
+
+@bp.route('/cards/move', methods=['POST'])
+def move_cards():
+    """Move several cards in one transaction"""
+    data = request.get_json()
+    
+    if not data or not isinstance(data.get('moves'), list) or not data['moves']:
+        return respond({'error': 'A list of moves is required'}), 400
+    try:
+        moves = [(int(move['card_id']), int(move['lane_id']), read_index(move, 'position'))
+                 for move in data['moves']]
+    except (KeyError, TypeError, ValueError):
+        return respond({'error': 'Each move needs a card_id, a lane_id and an optional non-negative position'}), 400
+    
+    error = _apply_moves(moves)
+    if error:
+        return error
+    
+    cards = Card.query.filter(Card.id.in_([card_id for card_id, _, _ in moves])).order_by(
+        Card.lane_id, Card.rank).all()
+    return respond([card.to_dict() for card in cards]), 200
+
+@bp.route('/cards/<int:card_id>/move', methods=['PUT'])
+def move_card(card_id):
+    """Move a card to a different lane and/or position"""
+    card = Card.query.get_or_404(card_id)
+    data = request.get_json()
+    
+    if not data or data.get('lane_id') is None:
+        return respond({'error': 'lane_id is required'}), 400
+    
+    try:
+        lane_id = int(data['lane_id'])
+        position = read_index(data, 'position')
+    except (TypeError, ValueError):
+        return respond({'error': 'lane_id must be an integer and position a non-negative integer'}), 400
+    
+    error = _apply_moves([(card.id, lane_id, position)])
+    if error:
+        return error
+    
+    return respond(card.to_dict()), 200
+
+@bp.route('/lanes/<int:lane_id>/cards/reorder', methods=['PUT'])
+def reorder_cards(lane_id):
+    """Reorder all cards in a lane"""
+    Lane.query.get_or_404(lane_id)
+    data = request.get_json()
+    
+    card_order = data.get('card_order') if data else None
+    current = {card_id for card_id, in db.session.query(Card.id).filter_by(lane_id=lane_id)}
+    if not isinstance(card_order, list) or set(card_order) != current or len(card_order) != len(current):
+        return respond({'error': 'card_order must list every card in the lane exactly once'}), 400
+    
+    error = _apply_moves([(card_id, lane_id, index) for index, card_id in enumerate(card_order)])
+    if error:
+        return error
+    
+    cards = Card.query.filter_by(lane_id=lane_id).order_by(Card.rank).all()
+    return respond([card.to_dict() for card in cards]), 200
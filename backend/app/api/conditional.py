@@ -0,0 +1,26 @@
+from datetime import timezone
+from flask import current_app, request
+from werkzeug.http import http_date, quote_etag
+
+def board_validators(board_id, version, updated_at):
+    """Build ETag/Last-Modified headers for a board version and check them against the request.
+    
+    Returns (headers, not_modified), where not_modified is True when the
+    client's cached copy is still current and a 304 can be sent instead.
+    """
+    etag = f'board-{board_id}-v{version}'
+    headers = {'ETag': quote_etag(etag, weak=True)}
+    if updated_at is not None:
+        headers['Last-Modified'] = http_date(updated_at.replace(tzinfo=timezone.utc, microsecond=0))
+    
+    # Only the version ETag decides: If-Modified-Since has whole-second precision and
+    # cannot tell apart two writes within the same second
+    not_modified = bool(request.if_none_match) and request.if_none_match.contains_weak(etag)
+    return headers, not_modified
+
+def not_modified_response(headers):
+    """A bodiless 304 with the validators, varying on what the full response varies on"""
+    response = current_app.response_class(status=304, headers=headers)
+    del response.headers['Content-Type']
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    return response
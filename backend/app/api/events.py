@@ -0,0 +1,77 @@
+import json
+from flask import Blueprint, Response, current_app, request
+from ..models.board import Board
+from ..models.event import BoardEvent, serialize_event
+from ..serialization import respond
+
+bp = Blueprint('events', __name__, url_prefix='/api')
+
+# Events read from the table per query when a subscriber is behind the broker's buffer
+REPLAY_BATCH_SIZE = 500
+
+def format_event(event):
+    """Encode an event as a Server-Sent Events message"""
+    return f"id: {event['id']}\nevent: {event['kind']}\ndata: {json.dumps(event)}\n\n"
+
+@bp.route('/boards/<int:board_id>/events', methods=['GET'])
+def get_board_events(board_id):
+    """Stream the board's changes as Server-Sent Events"""
+    Board.query.get_or_404(board_id)  # Check if board exists
+
+    app = current_app._get_current_object()
+    broker = app.extensions['event_broker']
+    # Each open stream holds a server thread, so keep enough of them for ordinary requests
+    if not broker.open_stream(app.config['EVENTS_MAX_STREAMS']):
+        retry_after = max(1, app.config['EVENTS_RETRY'] // 1000)
+        return respond({'error': 'Too many event streams on this worker; retry later or poll '
+                                 f'/api/boards/{board_id}/changes instead'}), 503, {'Retry-After': str(retry_after)}
+    try:
+        newest = broker.start()
+    except Exception:
+        broker.close_stream()
+        raise
+
+    # Resume after the last event the client saw, or start with the next change
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        cursor = int(last_event_id) if last_event_id else newest
+    except ValueError:
+        cursor = newest
+    keepalive = app.config['EVENTS_KEEPALIVE']
+
+    def replay(after_id):
+        with app.app_context():
+            return [serialize_event(row) for row in BoardEvent.query.filter(
+                BoardEvent.board_id == board_id, BoardEvent.id > after_id).order_by(
+                BoardEvent.id).limit(REPLAY_BATCH_SIZE)]
+
+    def generate():
+        nonlocal cursor
+        yield f'retry: {app.config["EVENTS_RETRY"]}\n\n'
+        while True:
+            events = broker.wait(board_id, cursor, keepalive)
+            if events is None:
+                # Behind the buffer: read the table, up to what the broker had seen by then
+                horizon = broker.last_id
+                events = replay(cursor)
+                if len(events) < REPLAY_BATCH_SIZE:
+                    # The board has no other events up to horizon, so wait in the buffer from there
+                    cursor = max(cursor, horizon)
+                if not events:
+                    continue
+            if not events:
+                # Comment line that keeps proxies from closing an idle connection
+                yield ': keepalive\n\n'
+                continue
+            yield ''.join(format_event(event) for event in events)
+            cursor = max(cursor, events[-1]['id'])
+            if events[-1]['kind'] == 'board.deleted':
+                return
+
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # Called when the server closes the response, even if the body was never read
+    response.call_on_close(broker.close_stream)
+    return response
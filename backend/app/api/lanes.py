@@ -1,20 +1,25 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, abort, request
 from .. import db
+from ..models.board import Board
 from ..models.lane import Lane
 from ..models.card import Card
+from ..models.event import BoardEvent
+from .conditional import board_validators, not_modified_response
+from .listing import list_rows
+from .placement import read_placement
+from ..serialization import respond
+from ..ordering import key_between
 
 bp = Blueprint('lanes', __name__, url_prefix='/api')
 
 @bp.route('/lanes', methods=['GET'])
 def get_all_lanes():
     """Get all lanes"""
-    lanes = Lane.query.all()
-    return jsonify([{
+    return list_rows(db.session.query(Lane.id, Lane.name, Lane.board_id), [Lane.id], lambda lane: {
         'id': lane.id,
         'name': lane.name,
-        'board_id': lane.board_id,
-        'position': lane.position
-    } for lane in lanes]), 200
+        'board_id': lane.board_id
+    })
 
 @bp.route('/lanes', methods=['POST'])
 def create_lane():
@@ -22,37 +27,39 @@ def create_lane():
     data = request.get_json()
     
     if not data or 'name' not in data or 'board_id' not in data:
-        return jsonify({'error': 'Name and board_id are required'}), 400
+        return respond({'error': 'Name and board_id are required'}), 400
     
-    # Find the highest position in the board
-    max_position = db.session.query(db.func.max(Lane.position)).filter_by(
-        board_id=data.get('board_id')).scalar() or 0
+    if Board.query.get(data.get('board_id')) is None:
+        return respond({'error': 'Board not found'}), 404
+    
+    # Find the highest order key in the board
+    last_rank = Lane.last_rank(data.get('board_id'))
     
     lane = Lane(
         name=data.get('name'),
         board_id=data.get('board_id'),
-        position=max_position + 1
+        rank=key_between(last_rank, None)
     )
     
     db.session.add(lane)
+    Board.touch(data.get('board_id'))
+    BoardEvent.record(data.get('board_id'), 'lane.created', lane)
     db.session.commit()
     
-    return jsonify({
+    return respond({
         'id': lane.id,
         'name': lane.name,
-        'board_id': lane.board_id,
-        'position': lane.position
+        'board_id': lane.board_id
     }), 201
 
 @bp.route('/lanes/<int:lane_id>', methods=['GET'])
 def get_lane(lane_id):
     """Get a lane by ID"""
     lane = Lane.query.get_or_404(lane_id)
-    return jsonify({
+    return respond({
         'id': lane.id,
         'name': lane.name,
-        'board_id': lane.board_id,
-        'position': lane.position
+        'board_id': lane.board_id
     }), 200
 
 @bp.route('/lanes/<int:lane_id>', methods=['PUT'])
@@ -60,19 +67,31 @@ def update_lane(lane_id):
     """Update a lane"""
     lane = Lane.query.get_or_404(lane_id)
     data = request.get_json()
+    try:
+        position, after_id, before_id = read_placement(data)
+    except ValueError as e:
+        return respond({'error': str(e)}), 400
     
     if data.get('name'):
         lane.name = data.get('name')
-    if data.get('position') is not None:
-        lane.position = data.get('position')
     
+    # Move between neighbours with a single new order key
+    try:
+        if after_id is not None or before_id is not None:
+            lane.rank = Lane.rank_for(lane.board_id, after_id=after_id, before_id=before_id, exclude_id=lane.id)
+        elif position is not None:
+            lane.rank = Lane.rank_for(lane.board_id, index=position, exclude_id=lane.id)
+    except ValueError:
+        return respond({'error': 'after_id and before_id must be other lanes in the same board'}), 400
+    
+    Board.touch(lane.board_id)
+    BoardEvent.record(lane.board_id, 'lane.updated', lane)
     db.session.commit()
     
-    return jsonify({
+    return respond({
         'id': lane.id,
         'name': lane.name,
-        'board_id': lane.board_id,
-        'position': lane.position
+        'board_id': lane.board_id
     }), 200
 
 @bp.route('/lanes/<int:lane_id>', methods=['DELETE'])
@@ -80,21 +99,30 @@ def delete_lane(lane_id):
     """Delete a lane"""
     lane = Lane.query.get_or_404(lane_id)
     db.session.delete(lane)
+    Board.touch(lane.board_id)
+    BoardEvent.record(lane.board_id, 'lane.deleted', lane)
     db.session.commit()
     
-    return jsonify({'message': 'Lane deleted successfully'}), 200
+    return respond({'message': 'Lane deleted successfully'}), 200
 
 @bp.route('/lanes/<int:lane_id>/cards', methods=['GET'])
 def get_lane_cards(lane_id):
     """Get all cards for a lane"""
-    Lane.query.get_or_404(lane_id)  # Check if lane exists
-    cards = Card.query.filter_by(lane_id=lane_id).order_by(Card.position).all()
+    # Check the lane exists and get its board's version in one indexed lookup
+    board = db.session.query(Board.id, Board.version, Board.updated_at).join(Lane).filter(
+        Lane.id == lane_id).first()
+    if board is None:
+        abort(404)
+    headers, not_modified = board_validators(*board)
+    if not_modified:
+        return not_modified_response(headers)
     
-    return jsonify([{
+    cards = db.session.query(Card.id, Card.title, Card.description, Card.lane_id, Card.color,
+                             Card.rank).filter_by(lane_id=lane_id)
+    return list_rows(cards, [Card.rank, Card.id], lambda card: {
         'id': card.id,
         'title': card.title,
         'description': card.description,
         'lane_id': card.lane_id,
-        'position': card.position,
         'color': card.color
-    } for card in cards]), 200
+    }, headers, cache_key=(board.id, board.version, 'lane-cards', lane_id))
@@ -0,0 +1,86 @@
+import base64
+import json
+from flask import Response, json as flask_json, request, stream_with_context
+from sqlalchemy import tuple_
+from ..cache import cached_response
+from ..serialization import encode_datetime, respond
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+# Rows fetched from the database and written to the client per chunk when streaming
+STREAM_BATCH_SIZE = 1000
+
+def encode_cursor(values):
+    """Encode the sort key of the last row of a page as an opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(',', ':')).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, size):
+    """Decode a cursor produced by encode_cursor; raises ValueError if it is malformed"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != size or not all(
+            isinstance(value, (str, int, float)) for value in values):
+        raise ValueError('Invalid cursor')
+    return values
+
+def wants_stream():
+    """Whether the client asked for an NDJSON stream (Accept header or ?stream=1)"""
+    if request.args.get('stream') in ('1', 'true'):
+        return True
+    return request.accept_mimetypes.best_match(
+        ['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+
+def stream_rows(query, serialize, headers=None):
+    """Stream rows as NDJSON while they are read from the database in batches"""
+    def generate():
+        lines = []
+        for row in query.yield_per(STREAM_BATCH_SIZE):
+            lines.append(flask_json.dumps(serialize(row), default=encode_datetime))
+            if len(lines) == STREAM_BATCH_SIZE:
+                yield '\n'.join(lines) + '\n'
+                lines = []
+        if lines:
+            yield '\n'.join(lines) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers=headers)
+
+def list_rows(query, order_by, serialize, headers=None, cache_key=None):
+    """Respond with every row, one keyset page, or an NDJSON stream of every row.
+    
+    A page is returned when ?limit= or ?after= is given. order_by must be a
+    unique, indexed sort key (ending in the primary key) so that each page is
+    a single index range scan no matter how deep it is. The full listing is
+    served from the snapshot cache when a cache_key is given. serialize may
+    leave datetimes as they are; they are written in ISO 8601.
+    """
+    query = query.order_by(*order_by)
+    if wants_stream():
+        return stream_rows(query, serialize, headers)
+    if 'limit' not in request.args and 'after' not in request.args:
+        if cache_key is not None:
+            return cached_response(cache_key, lambda: [serialize(row) for row in query]), 200, headers
+        return respond([serialize(row) for row in query], headers=headers)
+    
+    try:
+        limit = int(request.args.get('limit', DEFAULT_LIMIT))
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f'limit must be between 1 and {MAX_LIMIT}')
+        if request.args.get('after'):
+            values = decode_cursor(request.args['after'], len(order_by))
+            query = query.filter(tuple_(*order_by) > tuple_(*values))
+    except ValueError as e:
+        return respond({'error': str(e)}, 400)
+    
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in order_by])
+    
+    return respond({
+        'items': [serialize(row) for row in rows],
+        'next': next_cursor
+    }, headers=headers)
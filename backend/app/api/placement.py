@@ -0,0 +1,23 @@
+"""Where a request asks to put a lane or card among its siblings"""
+
+PLACEMENT_FIELDS = ('position', 'after_id', 'before_id')
+
+def read_index(data, field):
+    """Return data[field] as a non-negative int, or None if it is absent.
+
+    Raises ValueError naming the field if it holds anything else.
+    """
+    value = data.get(field)
+    if value is None:
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        value = -1
+    if value < 0:
+        raise ValueError(f'{field} must be a non-negative integer')
+    return value
+
+def read_placement(data):
+    """Return (position, after_id, before_id) from a request body, each a non-negative int or None"""
+    return tuple(read_index(data, field) for field in PLACEMENT_FIELDS)
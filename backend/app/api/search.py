@@ -0,0 +1,76 @@
+import re
+from html import escape
+from flask import Blueprint, jsonify, request
+from sqlalchemy import text
+from .. import db
+from ..models import search as card_index  # Creates the index along with the card table
+from .listing import MAX_LIMIT, decode_cursor, encode_cursor
+
+bp = Blueprint('search', __name__, url_prefix='/api')
+
+DEFAULT_SEARCH_LIMIT = 20
+# Words of context around the matches in a snippet
+SNIPPET_TOKENS = 16
+
+# Control characters cannot occur in the text, so they safely mark matches until escaping
+MATCH_START, MATCH_END = '\x02', '\x03'
+
+def match_query(q):
+    """Turn user input into an FTS5 query matching every word, the last one as a prefix"""
+    words = re.findall(r'\w+', q)
+    if not words:
+        return None
+    return ' '.join(f'"{word}"' for word in words) + '*'
+
+@bp.route('/search', methods=['GET'])
+def search_cards():
+    """Search card titles and descriptions, best matches first"""
+    query = match_query(request.args.get('q', ''))
+    if query is None:
+        return jsonify({'error': 'q must contain at least one word'}), 400
+
+    params = {'query': query}
+    conditions = ['card_fts MATCH :query']
+    try:
+        limit = int(request.args.get('limit', DEFAULT_SEARCH_LIMIT))
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f'limit must be between 1 and {MAX_LIMIT}')
+        if request.args.get('board_id'):
+            params['board_id'] = int(request.args['board_id'])
+            conditions.append('lane.board_id = :board_id')
+        if request.args.get('after'):
+            # Keyset pagination on (relevance, id)
+            params['score'], params['id'] = decode_cursor(request.args['after'], 2)
+            conditions.append('(bm25(card_fts), card.id) > (:score, :id)')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    params['limit'] = limit + 1
+
+    rows = db.session.execute(text(f"""
+        SELECT card.id, card.title, card.lane_id, lane.board_id, bm25(card_fts) AS score,
+               snippet(card_fts, -1, '{MATCH_START}', '{MATCH_END}', '…', {SNIPPET_TOKENS}) AS snippet
+        FROM card_fts
+        JOIN card ON card.id = card_fts.rowid
+        JOIN lane ON lane.id = card.lane_id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY score, card.id
+        LIMIT :limit
+    """), params).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].score, rows[-1].id])
+
+    return jsonify({
+        'items': [{
+            'id': row.id,
+            'title': row.title,
+            'lane_id': row.lane_id,
+            'board_id': row.board_id,
+            # HTML-escaped, with the matched words wrapped in <mark>
+            'snippet': escape(row.snippet).replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>'),
+            'score': row.score
+        } for row in rows],
+        'next': next_cursor
+    }), 200
@@ -1,55 +1,146 @@
-from flask import jsonify, redirect
-from apispec import APISpec
-from apispec.ext.marshmallow import MarshmallowPlugin
+import hashlib
+import re
+from flask import redirect, request
 from flask_swagger_ui import get_swaggerui_blueprint
+from ..serialization import dumps
 
-def configure_swagger(app):
-    """Configure Swagger UI for the Flask app"""
-    
-    # Create APISpec object
-    spec = APISpec(
-        title="NotScrum API",
-        version="1.0.0",
-        openapi_version="3.0.2",
-        plugins=[MarshmallowPlugin()],
-    )
-    
-    # Define schemas for our API objects
-    spec.components.schema("Board", {
+SWAGGER_URL = "/api/docs"
+API_URL = "/static/swagger.json"
+
+# Routes that are not part of the API
+UNDOCUMENTED = {'static', 'swagger_json', 'api_root'}
+
+# <converter:name> or <name> in a Flask rule
+RULE_ARGUMENT = re.compile(r'<(?:(\w+)(?:\([^)]*\))?:)?(\w+)>')
+CONVERTER_TYPES = {'int': 'integer', 'float': 'number'}
+
+# Accepted on writes only: responses list lanes and cards in board order instead
+POSITION = {
+    "type": "integer",
+    "minimum": 0,
+    "writeOnly": True,
+    "deprecated": True,
+    "description": "Zero-based index to place the row at among its siblings; no longer returned"
+}
+
+SCHEMAS = {
+    "Board": {
         "type": "object",
         "properties": {
             "id": {"type": "integer"},
             "name": {"type": "string"},
             "description": {"type": "string"},
         }
-    })
-    
-    spec.components.schema("Lane", {
+    },
+    "Lane": {
         "type": "object",
         "properties": {
             "id": {"type": "integer"},
             "name": {"type": "string"},
             "board_id": {"type": "integer"},
-            "position": {"type": "integer"}
+            "position": POSITION
         }
-    })
-    
-    spec.components.schema("Card", {
+    },
+    "Card": {
         "type": "object",
         "properties": {
             "id": {"type": "integer"},
             "title": {"type": "string"},
             "description": {"type": "string"},
             "lane_id": {"type": "integer"},
-            "position": {"type": "integer"},
+            "position": POSITION,
             "color": {"type": "string"}
         }
-    })
-    
-    # Setup Swagger UI blueprint
-    SWAGGER_URL = "/api/docs"
-    API_URL = "/static/swagger.json"
-    
+    },
+}
+
+# What the routes cannot tell about an endpoint: (request body schema, response schema,
+# whether the response is a list of it, success status). Others answer 200 with no schema
+BODIES = {
+    'boards.get_all_boards': (None, 'Board', True, 200),
+    'boards.create_board': ('Board', 'Board', False, 201),
+    'boards.get_board': (None, 'Board', False, 200),
+    'boards.update_board': ('Board', 'Board', False, 200),
+    'boards.get_board_lanes': (None, 'Lane', True, 200),
+    'boards.create_board_lane': ('Lane', 'Lane', False, 201),
+    'boards.clone_board': (None, 'Board', False, 201),
+    'lanes.get_all_lanes': (None, 'Lane', True, 200),
+    'lanes.create_lane': ('Lane', 'Lane', False, 201),
+    'lanes.get_lane': (None, 'Lane', False, 200),
+    'lanes.update_lane': ('Lane', 'Lane', False, 200),
+    'lanes.get_lane_cards': (None, 'Card', True, 200),
+    'cards.get_all_cards': (None, 'Card', True, 200),
+    'cards.create_card': ('Card', 'Card', False, 201),
+    'cards.create_card_in_lane': ('Card', 'Card', False, 201),
+    'cards.import_cards': (None, None, False, 201),
+    'cards.get_card': (None, 'Card', False, 200),
+    'cards.update_card': ('Card', 'Card', False, 200),
+    'cards.move_card': (None, 'Card', False, 200),
+    'cards.move_cards': (None, 'Card', True, 200),
+    'cards.reorder_cards': (None, 'Card', True, 200),
+}
+
+def _content(schema, many=False):
+    reference = {"$ref": f"#/components/schemas/{schema}"}
+    return {"application/json": {"schema": {"type": "array", "items": reference} if many else reference}}
+
+def _operation(app, rule, arguments):
+    """Describe one route from its view's docstring, its arguments and BODIES"""
+    doc = (app.view_functions[rule.endpoint].__doc__ or '').strip()
+    request_schema, response_schema, many, status = BODIES.get(rule.endpoint, (None, None, False, 200))
+    operation = {"summary": doc.splitlines()[0] if doc else rule.endpoint, "responses": {}}
+    if arguments:
+        operation["parameters"] = [{
+            "name": name,
+            "in": "path",
+            "required": True,
+            "schema": {"type": CONVERTER_TYPES.get(converter, "string")},
+            "description": f"ID of the {name[:-3]}" if name.endswith('_id') else name
+        } for converter, name in arguments]
+    if request_schema:
+        operation["requestBody"] = {"required": True, "content": _content(request_schema)}
+
+    success = {"description": "Success" if status == 200 else "Created"}
+    if response_schema:
+        success["content"] = _content(response_schema, many)
+    operation["responses"][str(status)] = success
+    if request_schema:
+        operation["responses"]["400"] = {"description": "Invalid request data"}
+    if arguments:
+        operation["responses"]["404"] = {"description": "Not found"}
+    return operation
+
+def build_spec(app):
+    """The OpenAPI document of every route registered on app, so it cannot drift from them"""
+    # The documentation stack is only imported when the document is first requested
+    from apispec import APISpec
+
+    spec = APISpec(
+        title="NotScrum API",
+        version="1.0.0",
+        openapi_version="3.0.2",
+        info={"description": "API for the NotScrum kanban board application"},
+    )
+    for name, schema in SCHEMAS.items():
+        spec.components.schema(name, schema)
+
+    paths = {}
+    for rule in sorted(app.url_map.iter_rules(), key=lambda rule: rule.rule):
+        if rule.endpoint in UNDOCUMENTED or rule.endpoint.startswith('swagger_ui.'):
+            continue
+        arguments = RULE_ARGUMENT.findall(rule.rule)
+        operations = paths.setdefault(RULE_ARGUMENT.sub(r'{\2}', rule.rule), {})
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            # The first rule registered for a path and method is the one that serves it
+            if method.lower() not in operations:
+                operations[method.lower()] = _operation(app, rule, arguments)
+    for path, operations in paths.items():
+        spec.path(path=path, operations=operations)
+    return spec.to_dict()
+
+def configure_swagger(app):
+    """Configure Swagger UI for the Flask app"""
+
     swaggerui_blueprint = get_swaggerui_blueprint(
         SWAGGER_URL,
         API_URL,
@@ -57,480 +148,23 @@ def configure_swagger(app):
             'app_name': "NotScrum API"
         }
     )
-    
-    # Add route to serve the swagger.json file
-    @app.route("/static/swagger.json")
+
+    # Serve the OpenAPI document, built and encoded once on first request
+    @app.route(API_URL)
     def swagger_json():
-        return jsonify({
-            "openapi": "3.0.2",
-            "info": {
-                "title": "NotScrum API",
-                "version": "1.0.0",
-                "description": "API for the NotScrum kanban board application"
-            },
-            "paths": {
-                "/api/boards": {
-                    "get": {
-                        "summary": "Get all boards",
-                        "responses": {
-                            "200": {
-                                "description": "A list of boards",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
-                                            "type": "array",
-                                            "items": {"$ref": "#/components/schemas/Board"}
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    },
-                    "post": {
-                        "summary": "Create a new board",
-                        "requestBody": {
-                            "required": True,
-                            "content": {
-                                "application/json": {
-                                    "schema": {"$ref": "#/components/schemas/Board"}
-                                }
-                            }
-                        },
-                        "responses": {
-                            "201": {
-                                "description": "Board created successfully",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Board"}
-                                    }
-                                }
-                            },
-                            "400": {
-                                "description": "Invalid request data"
-                            }
-                        }
-                    }
-                },
-                "/api/boards/{board_id}": {
-                    "get": {
-                        "summary": "Get a specific board by ID",
-                        "parameters": [
-                            {
-                                "name": "board_id",
-                                "in": "path",
-                                "required": True,
-                                "schema": {
-                                    "type": "integer"
-                                },
-                                "description": "ID of the board to retrieve"
-                            }
-                        ],
-                        "responses": {
-                            "200": {
-                                "description": "Board details",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Board"}
-                                    }
-                                }
-                            },
-                            "404": {
-                                "description": "Board not found"
-                            }
-                        }
-                    },
-                    "put": {
-                        "summary": "Update a board",
-                        "parameters": [
-                            {
-                                "name": "board_id",
-                                "in": "path",
-                                "required": True,
-                                "schema": {
-                                    "type": "integer"
-                                },
-                                "description": "ID of the board to update"
-                            }
-                        ],
-                        "requestBody": {
-                            "required": True,
-                            "content": {
-                                "application/json": {
-                                    "schema": {"$ref": "#/components/schemas/Board"}
-                                }
-                            }
-                        },
-                        "responses": {
-                            "200": {
-                                "description": "Board updated successfully",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Board"}
-                                    }
-                                }
-                            },
-                            "404": {
-                                "description": "Board not found"
-                            }
-                        }
-                    },
-                    "delete": {
-                        "summary": "Delete a board",
-                        "parameters": [
-                            {
-                                "name": "board_id",
-                                "in": "path",
-                                "required": True,
-                                "schema": {
-                                    "type": "integer"
-                                },
-                                "description": "ID of the board to delete"
-                            }
-                        ],
-                        "responses": {
-                            "200": {
-                                "description": "Board deleted successfully"
-                            },
-                            "404": {
-                                "description": "Board not found"
-                            }
-                        }
-                    }
-                },
-                "/api/boards/{board_id}/lanes": {
-                    "get": {
-                        "summary": "Get all lanes for a specific board",
-                        "parameters": [
-                            {
-                                "name": "board_id",
-                                "in": "path",
-                                "required": True,
-                                "schema": {
-                                    "type": "integer"
-                                },
-                                "description": "ID of the board to retrieve lanes for"
-                            }
-                        ],
-                        "responses": {
-                            "200": {
-                                "description": "A list of lanes for the board",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
-                                            "type": "array",
-                                            "items": {"$ref": "#/components/schemas/Lane"}
-                                        }
-                                    }
-                                }
-                            },
-                            "404": {
-                                "description": "Board not found"
-                            }
-                        }
-                    }
-                },
-                "/api/lanes": {
-                    "get": {
-                        "summary": "Get all lanes",
-                        "responses": {
-                            "200": {
-                                "description": "A list of lanes",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
-                                            "type": "array",
-                                            "items": {"$ref": "#/components/schemas/Lane"}
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    },
-                    "post": {
-                        "summary": "Create a new lane",
-                        "requestBody": {
-                            "required": True,
-                            "content": {
-                                "application/json": {
-                                    "schema": {"$ref": "#/components/schemas/Lane"}
-                                }
-                            }
-                        },
-                        "responses": {
-                            "201": {
-                                "description": "Lane created successfully",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Lane"}
-                                    }
-                                }
-                            },
-                            "400": {
-                                "description": "Invalid request data"
-                            }
-                        }
-                    }
-                },
-                "/api/lanes/{lane_id}": {
-                    "get": {
-                        "summary": "Get a specific lane by ID",
-                        "parameters": [
-                            {
-                                "name": "lane_id",
-                                "in": "path",
-                                "required": True,
-                                "schema": {
-                                    "type": "integer"
-                                },
-                                "description": "ID of the lane to retrieve"
-                            }
-                        ],
-                        "responses": {
-                            "200": {
-                                "description": "Lane details",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Lane"}
-                                    }
-                                }
-                            },
-                            "404": {
-                                "description": "Lane not found"
-                            }
-                        }
-                    },
-                    "put": {
-                        "summary": "Update a lane",
-                        "parameters": [
-                            {
-                                "name": "lane_id",
-                                "in": "path",
-                                "required": True,
-                                "schema": {
-                                    "type": "integer"
-                                },
-                                "description": "ID of the lane to update"
-                            }
-                        ],
-                        "requestBody": {
-                            "required": True,
-                            "content": {
-                                "application/json": {
-                                    "schema": {"$ref": "#/components/schemas/Lane"}
-                                }
-                            }
-                        },
-                        "responses": {
-                            "200": {
-                                "description": "Lane updated successfully",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Lane"}
-                                    }
-                                }
-                            },
-                            "404": {
-                                "description": "Lane not found"
-                            }
-                        }
-                    },
-                    "delete": {
-                        "summary": "Delete a lane",
-                        "parameters": [
-                            {
-                                "name": "lane_id",
-                                "in": "path",
-                                "required": True,
-                                "schema": {
-                                    "type": "integer"
-                                },
-                                "description": "ID of the lane to delete"
-                            }
-                        ],
-                        "responses": {
-                            "200": {
-                                "description": "Lane deleted successfully"
-                            },
-                            "404": {
-                                "description": "Lane not found"
-                            }
-                        }
-                    }
-                },
-                "/api/lanes/{lane_id}/cards": {
-                    "get": {
-                        "summary": "Get all cards for a specific lane",
-                        "parameters": [
-                            {
-                                "name": "lane_id",
-                                "in": "path",
-                                "required": True,
-                                "schema": {
-                                    "type": "integer"
-                                },
-                                "description": "ID of the lane to retrieve cards for"
-                            }
-                        ],
-                        "responses": {
-                            "200": {
-                                "description": "A list of cards for the lane",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
-                                            "type": "array",
-                                            "items": {"$ref": "#/components/schemas/Card"}
-                                        }
-                                    }
-                                }
-                            },
-                            "404": {
-                                "description": "Lane not found"
-                            }
-                        }
-                    }
-                },
-                "/api/cards": {
-                    "get": {
-                        "summary": "Get all cards",
-                        "responses": {
-                            "200": {
-                                "description": "A list of cards",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
-                                            "type": "array",
-                                            "items": {"$ref": "#/components/schemas/Card"}
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    },
-                    "post": {
-                        "summary": "Create a new card",
-                        "requestBody": {
-                            "required": True,
-                            "content": {
-                                "application/json": {
-                                    "schema": {"$ref": "#/components/schemas/Card"}
-                                }
-                            }
-                        },
-                        "responses": {
-                            "201": {
-                                "description": "Card created successfully",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Card"}
-                                    }
-                                }
-                            },
-                            "400": {
-                                "description": "Invalid request data"
-                            }
-                        }
-                    }
-                },
-                "/api/cards/{card_id}": {
-                    "get": {
-                        "summary": "Get a specific card by ID",
-                        "parameters": [
-                            {
-                                "name": "card_id",
-                                "in": "path",
-                                "required": True,
-                                "schema": {
-                                    "type": "integer"
-                                },
-                                "description": "ID of the card to retrieve"
-                            }
-                        ],
-                        "responses": {
-                            "200": {
-                                "description": "Card details",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Card"}
-                                    }
-                                }
-                            },
-                            "404": {
-                                "description": "Card not found"
-                            }
-                        }
-                    },
-                    "put": {
-                        "summary": "Update a card",
-                        "parameters": [
-                            {
-                                "name": "card_id",
-                                "in": "path",
-                                "required": True,
-                                "schema": {
-                                    "type": "integer"
-                                },
-                                "description": "ID of the card to update"
-                            }
-                        ],
-                        "requestBody": {
-                            "required": True,
-                            "content": {
-                                "application/json": {
-                                    "schema": {"$ref": "#/components/schemas/Card"}
-                                }
-                            }
-                        },
-                        "responses": {
-                            "200": {
-                                "description": "Card updated successfully",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Card"}
-                                    }
-                                }
-                            },
-                            "404": {
-                                "description": "Card not found"
-                            }
-                        }
-                    },
-                    "delete": {
-                        "summary": "Delete a card",
-                        "parameters": [
-                            {
-                                "name": "card_id",
-                                "in": "path",
-                                "required": True,
-                                "schema": {
-                                    "type": "integer"
-                                },
-                                "description": "ID of the card to delete"
-                            }
-                        ],
-                        "responses": {
-                            "200": {
-                                "description": "Card deleted successfully"
-                            },
-                            "404": {
-                                "description": "Card not found"
-                            }
-                        }
-                    }
-                }
-            },
-            "components": {
-                "schemas": {
-                    "Board": spec.components.schemas["Board"],
-                    "Lane": spec.components.schemas["Lane"],
-                    "Card": spec.components.schemas["Card"]
-                }
-            }
-        })
-    
+        document = app.extensions.get('openapi')
+        if document is None:
+            body = dumps(build_spec(app))
+            document = app.extensions['openapi'] = (body, hashlib.sha1(body).hexdigest())
+        body, etag = document
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
     # Register Swagger UI blueprint
     app.register_blueprint(swaggerui_blueprint)
-    
+
     # Add root redirect to Swagger UI
     @app.route('/')
     def api_root():
-        return redirect('/api/docs')
\ No newline at end of file
+        return redirect('/api/docs')
@@ -0,0 +1,8 @@
+from flask import Blueprint, current_app, jsonify
+
+bp = Blueprint('system', __name__, url_prefix='/api')
+
+@bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get snapshot cache counters for this worker process"""
+    return jsonify(current_app.extensions['snapshot_cache'].stats()), 200
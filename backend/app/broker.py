@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import deque
+from sqlalchemy import select
+
+# Rows read from the board_event table per query
+POLL_BATCH_SIZE = 500
+
+class EventBroker:
+    """Fans committed board events out to the event-stream subscribers of one worker process.
+
+    A single poller thread tails the board_event table, so events committed
+    by other worker processes are delivered too, and keeps the most recent
+    ones in memory. Subscribers block on a condition variable until new
+    events arrive instead of each querying the database.
+    """
+
+    def __init__(self, app, poll_interval, buffer_size):
+        self.app = app
+        self.poll_interval = poll_interval
+        self.buffer_size = buffer_size
+        self.last_id = None
+        self._events = deque()
+        # Every event with floor < id <= last_id is in the buffer
+        self._floor = None
+        self._condition = threading.Condition()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = False
+        self.streams = 0
+
+    def start(self):
+        """Start the poller on first use (after any fork); returns the newest event id"""
+        with self._lock:
+            if self._thread is None:
+                from . import db
+                from .models.event import BoardEvent
+                with self.app.app_context():
+                    with db.engine.connect() as connection:
+                        self.last_id = self._floor = connection.execute(
+                            select(BoardEvent.id).order_by(BoardEvent.id.desc()).limit(1)).scalar() or 0
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name='event-broker', daemon=True)
+                self._thread.start()
+            return self.last_id
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopped = True
+            self._wake.set()
+        if thread is not None:
+            thread.join()
+
+    def open_stream(self, limit):
+        """Count a new subscriber unless limit (0 for none) are already open; returns whether it was"""
+        with self._lock:
+            if limit and self.streams >= limit:
+                return False
+            self.streams += 1
+            return True
+
+    def close_stream(self):
+        with self._lock:
+            self.streams -= 1
+
+    def notify(self):
+        """Poll now instead of at the next interval"""
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if self._stopped:
+                return
+            try:
+                with self.app.app_context():
+                    self.poll()
+            except Exception:
+                self.app.logger.exception('Polling board events failed')
+
+    def poll(self):
+        """Read events committed since the last poll into the buffer and wake the subscribers"""
+        from . import db
+        from .models.event import BoardEvent, serialize_event
+        table = BoardEvent.__table__
+        while True:
+            with db.engine.connect() as connection:
+                rows = connection.execute(select(table).where(table.c.id > self.last_id).order_by(
+                    table.c.id).limit(POLL_BATCH_SIZE)).all()
+            if not rows:
+                return
+            with self._condition:
+                for row in rows:
+                    if len(self._events) >= self.buffer_size:
+                        self._floor = self._events.popleft()['id']
+                    self._events.append(serialize_event(row))
+                self.last_id = rows[-1].id
+                self._condition.notify_all()
+            if len(rows) < POLL_BATCH_SIZE:
+                return
+
+    def wait(self, board_id, after_id, timeout):
+        """Return the board's events after after_id, waiting up to timeout seconds for one.
+
+        Returns an empty list on timeout, or None when after_id is older than
+        the buffer and the caller has to read the board_event table instead.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if after_id < self._floor:
+                    return None
+                events = []
+                for event in reversed(self._events):
+                    if event['id'] <= after_id:
+                        break
+                    if event['board_id'] == board_id:
+                        events.append(event)
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0:
+                    return events[::-1]
+                self._condition.wait(remaining)
+
+def init_app(app):
+    """Attach the (lazily started) event broker configured by the EVENTS_* settings"""
+    app.extensions['event_broker'] = EventBroker(
+        app, app.config['EVENTS_POLL_INTERVAL'], app.config['EVENTS_BUFFER_SIZE'])
@@ -0,0 +1,148 @@
+import threading
+from collections import OrderedDict
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .compression import compress, negotiate_encoding
+from .serialization import MSGPACK_MIMETYPES, dumps, packb, wants_msgpack
+
+# Rough per-entry bookkeeping cost on top of the cached bytes
+ENTRY_OVERHEAD = 200
+
+class SnapshotCache:
+    """Thread-safe LRU cache of serialized board responses, bounded by total size.
+    
+    Keys start with (board_id, version), so an entry can never be served once
+    the board has moved on to a newer version; invalidate() additionally frees
+    a board's entries as soon as a write to it commits.
+    """
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._keys_by_board = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, key, count_miss=True):
+        """The value for key, or None; count_miss=False for a lookup with a fallback to another key"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                if count_miss:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key, value):
+        cost = len(value) + ENTRY_OVERHEAD
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = value
+            self._keys_by_board.setdefault(key[0], set()).add(key)
+            self.size += cost
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def invalidate(self, *board_ids):
+        """Drop every entry for the given boards"""
+        with self._lock:
+            for board_id in board_ids:
+                for key in list(self._keys_by_board.get(board_id, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_board.clear()
+            self.size = 0
+    
+    def _remove(self, key):
+        value = self._entries.pop(key)
+        self.size -= len(value) + ENTRY_OVERHEAD
+        keys = self._keys_by_board[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_board[key[0]]
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+def init_app(app):
+    """Attach a snapshot cache sized by SNAPSHOT_CACHE_MAX_BYTES (0 disables it)"""
+    app.extensions['snapshot_cache'] = SnapshotCache(app.config['SNAPSHOT_CACHE_MAX_BYTES'])
+
+def cached_response(key, build):
+    """Respond with the cached body for key, calling build() for the data on a miss.
+    
+    The body is encoded in the format negotiated from the Accept header, each
+    format cached under its own key. Bodies large enough to compress are also
+    cached compressed, per content coding, so hits are not compressed again.
+    """
+    from . import db
+    config = current_app.config
+    cache = current_app.extensions['snapshot_cache']
+    if key[0] in db.session.info.get('changed_boards', ()):
+        # Written but not committed yet (within a batch), so never cached under the version it produces
+        cache = SnapshotCache(0)
+    if wants_msgpack():
+        key, encode, mimetype = key + ('msgpack',), packb, MSGPACK_MIMETYPES[0]
+    else:
+        encode, mimetype = dumps, config['JSONIFY_MIMETYPE']
+    
+    encoding = negotiate_encoding()
+    # A miss is counted once per request, by the lookup of the plain body
+    body = cache.get(key + (encoding,), count_miss=False) if encoding else None
+    if body is None:
+        body = cache.get(key)
+        if body is None:
+            body = encode(build())
+            cache.set(key, body)
+        if encoding and len(body) >= config['COMPRESS_MIN_SIZE']:
+            body = compress(body, encoding)
+            cache.set(key + (encoding,), body)
+        else:
+            encoding = None
+    
+    response = current_app.response_class(body, mimetype=mimetype)
+    response.vary.add('Accept')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_changed_boards(session):
+    """Free the cached snapshots of boards written by the committed transaction"""
+    if session.in_nested_transaction():
+        # A released SAVEPOINT; wait for the real commit
+        return
+    board_ids = session.info.pop('changed_boards', None)
+    if board_ids and has_app_context():
+        current_app.extensions['snapshot_cache'].invalidate(*board_ids)
+
+@event.listens_for(Session, 'after_rollback')
+def forget_changed_boards(session):
+    """Free any snapshots of boards written by the rolled-back transaction"""
+    board_ids = session.info.pop('changed_boards', None)
+    if board_ids and has_app_context():
+        current_app.extensions['snapshot_cache'].invalidate(*board_ids)
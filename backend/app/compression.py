@@ -0,0 +1,85 @@
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only without it
+    brotli = None
+
+# Media types worth compressing; event streams carry tiny, latency-bound messages
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'application/msgpack',
+    'text/plain',
+    'text/html',
+    'text/css',
+    'application/javascript',
+}
+
+def negotiate_encoding():
+    """The content coding to use: br, then gzip, as accepted by the client; None for identity"""
+    if not current_app.config['COMPRESS_LEVEL']:
+        return None
+    return request.accept_encodings.best_match(['br', 'gzip'] if brotli is not None else ['gzip'])
+
+def compressor(encoding):
+    """Return (compress, flush, finish) functions for an incremental stream in encoding"""
+    config = current_app.config
+    if encoding == 'br':
+        state = brotli.Compressor(quality=config['COMPRESS_BROTLI_QUALITY'])
+        return state.process, state.flush, state.finish
+    # wbits 31: a gzip header and trailer around the deflate stream
+    state = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
+    return state.compress, lambda: state.flush(zlib.Z_SYNC_FLUSH), state.flush
+
+def compress(body, encoding):
+    """Compress a whole body"""
+    compress_chunk, _, finish = compressor(encoding)
+    return compress_chunk(body) + finish()
+
+def compress_stream(chunks, functions, charset):
+    """Compress a streamed body chunk by chunk with compressor() functions, flushing each
+    chunk so clients never wait on the compressor"""
+    compress_chunk, flush, finish = functions
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode(charset)
+            if chunk:
+                yield compress_chunk(chunk) + flush()
+        yield finish()
+    finally:
+        # Close the wrapped generator (and its app context) when the client goes away
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+def compressible(response):
+    return (response.mimetype in COMPRESSIBLE_MIMETYPES and 200 <= response.status_code < 300
+            and response.status_code not in (204, 206) and not response.direct_passthrough)
+
+def init_app(app):
+    """Compress responses for clients that send Accept-Encoding"""
+
+    @app.after_request
+    def compress_response(response):
+        if not compressible(response):
+            return response
+        response.vary.add('Accept-Encoding')
+        if 'Content-Encoding' in response.headers or request.method == 'HEAD':
+            return response
+        encoding = negotiate_encoding()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            # Compressed as it is generated, so the body is never held in memory
+            response.response = compress_stream(response.response, compressor(encoding), response.charset)
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < app.config['COMPRESS_MIN_SIZE']:
+                return response
+            response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
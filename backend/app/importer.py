@@ -0,0 +1,145 @@
+import csv
+import json
+import os
+from datetime import datetime
+import click
+from app import db
+from app.models.board import Board
+from app.models.card import Card
+from app.models.event import BoardEvent
+from app.models.lane import Lane
+from app.ordering import key_between
+from app.sqlite import begin_immediate
+
+# Cards inserted per executemany and per transaction
+IMPORT_CHUNK_SIZE = 10000
+
+def read_ndjson(lines):
+    """Yield (line number, card) for every non-blank line of newline-delimited JSON"""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            raise ValueError(f'Line {number}: invalid JSON')
+        yield number, row
+
+def read_csv(lines):
+    """Yield (line number, card) for every row of CSV with a header line"""
+    reader = csv.DictReader(line.decode('utf-8') if isinstance(line, bytes) else line for line in lines)
+    for row in reader:
+        yield reader.line_num, {key: value for key, value in row.items() if value != ''}
+
+class CardImporter:
+    """Appends cards to the end of their lanes with large executemany INSERTs.
+
+    Input is consumed one row at a time and written every chunk_size rows,
+    each chunk in its own transaction, so memory stays bounded and other
+    writers get the database between chunks. add() raises ValueError for an
+    invalid row, and flush() for a lane that does not exist; the chunks
+    written before it stay imported.
+    """
+
+    def __init__(self, chunk_size=IMPORT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.imported = 0
+        self._rows = []
+        # lane_id -> line of its first card in the buffered chunk
+        self._lines = {}
+
+    def run(self, lines, format='ndjson'):
+        """Import every card in NDJSON or CSV lines"""
+        reader = read_csv if format == 'csv' else read_ndjson
+        try:
+            for number, row in reader(lines):
+                self.add(number, row)
+            self.flush()
+        except ValueError:
+            db.session.rollback()
+            raise
+
+    def add(self, number, row):
+        if not isinstance(row, dict) or not row.get('title'):
+            raise ValueError(f'Line {number}: title is required')
+        try:
+            lane_id = int(row['lane_id'])
+            due_date = datetime.fromisoformat(row['due_date']) if row.get('due_date') else None
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f'Line {number}: lane_id and an ISO due_date are required')
+        if not all(isinstance(row.get(field, ''), str) for field in ('description', 'color')):
+            raise ValueError(f'Line {number}: description and color must be strings')
+
+        self._lines.setdefault(lane_id, number)
+        now = datetime.utcnow()
+        self._rows.append({
+            'title': str(row['title']),
+            'description': row.get('description', ''),
+            'color': row.get('color', 'white'),
+            'due_date': due_date,
+            'lane_id': lane_id,
+            'created_at': now,
+            'updated_at': now
+        })
+        if len(self._rows) >= self.chunk_size:
+            self.flush()
+
+    def _load_lanes(self):
+        """Return lane_id -> [board_id, last rank] for the buffered lanes"""
+        lanes = {lane_id: [board_id, last_rank]
+                 for lane_id, board_id, last_rank in db.session.query(
+                     Lane.id, Lane.board_id, db.func.max(Card.rank)).outerjoin(
+                     Card, Card.lane_id == Lane.id).filter(Lane.id.in_(self._lines)).group_by(Lane.id)}
+        missing = [lane_id for lane_id in self._lines if lane_id not in lanes]
+        if missing:
+            lane_id = min(missing, key=self._lines.get)
+            raise ValueError(f'Line {self._lines[lane_id]}: lane {lane_id} not found')
+        return lanes
+
+    def flush(self):
+        """Append the buffered cards to their lanes in one statement and commit them"""
+        if not self._rows:
+            return
+        begin_immediate(db.session())
+        # Read under the write lock: other writers may have changed the lanes since the last chunk
+        lanes = self._load_lanes()
+        for row in self._rows:
+            lane = lanes[row['lane_id']]
+            lane[1] = row['rank'] = key_between(lane[1], None)
+
+        # The write lock is held, so the new cards are exactly those above the current highest id
+        first_id = (db.session.query(db.func.max(Card.id)).scalar() or 0) + 1
+        db.session.execute(Card.__table__.insert(), self._rows)
+
+        ids_by_board = {}
+        for card_id, lane_id in db.session.query(Card.id, Card.lane_id).filter(Card.id >= first_id).order_by(Card.id):
+            ids_by_board.setdefault(lanes[lane_id][0], []).append(card_id)
+        # One event per board rather than one per card, which would flood the log and every
+        # subscriber's buffer; the board's new cards are its cards from first_id to last_id
+        for board_id, ids in ids_by_board.items():
+            BoardEvent.record_summary(board_id, 'cards.imported', ids[0], {
+                'count': len(ids), 'first_id': ids[0], 'last_id': ids[-1]})
+        Board.touch(*ids_by_board)
+        db.session.commit()
+
+        self.imported += len(self._rows)
+        self._rows = []
+        self._lines = {}
+
+def init_app(app):
+    """Register the import-cards CLI command"""
+
+    @app.cli.command('import-cards')
+    @click.argument('source', type=click.File('rb'))
+    @click.option('--format', 'format_', type=click.Choice(['ndjson', 'csv']),
+                  help='Input format (default: from the file extension, else ndjson)')
+    def import_cards_command(source, format_):
+        """Append cards from an NDJSON or CSV file (- for stdin) to their lanes"""
+        if format_ is None:
+            format_ = 'csv' if os.path.splitext(source.name)[1].lower() == '.csv' else 'ndjson'
+        importer = CardImporter()
+        try:
+            importer.run(source, format_)
+        except ValueError as e:
+            raise click.ClickException(f'{e} ({importer.imported} cards imported before it)')
+        click.echo(f'Imported {importer.imported} cards')
@@ -0,0 +1,140 @@
+import os
+import time
+from functools import lru_cache
+from flask import Response, current_app, has_request_context, jsonify, request
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+                               generate_latest, multiprocess)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+# Per-request measurements, kept in the WSGI environ so a batch's sub-requests get their own
+ENVIRON_KEY = 'notscrum.metrics'
+
+# Label for requests that matched no route, so unknown URLs cannot create new series
+UNMATCHED_ROUTE = 'unmatched'
+
+REQUESTS = Counter(
+    'notscrum_http_requests_total', 'Requests handled, by route and status code',
+    ['method', 'route', 'status'])
+REQUEST_DURATION = Histogram(
+    'notscrum_http_request_duration_seconds', 'Time to produce a response (streamed bodies excluded)',
+    ['method', 'route'], buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+REQUESTS_IN_FLIGHT = Gauge(
+    'notscrum_http_requests_in_flight', 'Requests being handled',
+    ['method', 'route'], multiprocess_mode='livesum')
+SQL_STATEMENTS = Histogram(
+    'notscrum_http_request_sql_statements', 'SQL statements executed per request',
+    ['method', 'route'], buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89))
+SQL_DURATION = Histogram(
+    'notscrum_http_request_sql_seconds', 'Time spent executing SQL per request',
+    ['method', 'route'], buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1))
+POOL_CONNECTIONS = Gauge(
+    'notscrum_db_pool_connections', 'Database connections open, and checked out of the pool by a request',
+    ['state'], multiprocess_mode='livesum')
+CONNECTIONS_OPENED = Counter(
+    'notscrum_db_connections_opened_total', 'Database connections opened')
+
+POOL_OPEN = POOL_CONNECTIONS.labels('open')
+POOL_CHECKED_OUT = POOL_CONNECTIONS.labels('checked_out')
+
+@lru_cache(maxsize=None)
+def _route_metrics(method, route):
+    """The labelled series of a route, resolved once rather than on every request"""
+    return (REQUESTS_IN_FLIGHT.labels(method, route), REQUEST_DURATION.labels(method, route),
+            SQL_STATEMENTS.labels(method, route), SQL_DURATION.labels(method, route))
+
+def _registry():
+    """The registry to expose: every worker's metrics when gunicorn shares a metrics directory"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    if not has_request_context() or context is None:
+        return
+    stats = request.environ.get(ENVIRON_KEY)
+    if stats is not None:
+        stats['statements'] += 1
+        stats['sql_seconds'] += time.perf_counter() - getattr(context, '_metrics_start', time.perf_counter())
+
+@event.listens_for(Pool, 'connect')
+def count_connect(dbapi_connection, connection_record):
+    CONNECTIONS_OPENED.inc()
+    POOL_OPEN.inc()
+
+@event.listens_for(Pool, 'close')
+def count_close(dbapi_connection, connection_record):
+    POOL_OPEN.dec()
+
+@event.listens_for(Pool, 'close_detached')
+def count_close_detached(dbapi_connection):
+    POOL_OPEN.dec()
+
+@event.listens_for(Pool, 'checkout')
+def count_checkout(dbapi_connection, connection_record, connection_proxy):
+    POOL_CHECKED_OUT.inc()
+
+@event.listens_for(Pool, 'checkin')
+def count_checkin(dbapi_connection, connection_record):
+    POOL_CHECKED_OUT.dec()
+
+def init_app(app, db):
+    """Instrument every request and add the /metrics and /healthz endpoints"""
+
+    @app.before_request
+    def start_request_metrics():
+        method = request.method
+        route = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+        series = _route_metrics(method, route)
+        request.environ[ENVIRON_KEY] = {
+            'start': time.perf_counter(), 'statements': 0, 'sql_seconds': 0.0,
+            'method': method, 'route': route, 'series': series, 'recorded': False}
+        series[0].inc()
+
+    @app.after_request
+    def record_request_metrics(response):
+        _record(request.environ.get(ENVIRON_KEY), response.status_code)
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exc):
+        stats = request.environ.pop(ENVIRON_KEY, None)
+        if stats is None:
+            return
+        # after_request is skipped when the view raised
+        _record(stats, 500)
+        stats['series'][0].dec()
+
+    def _record(stats, status):
+        if stats is None or stats['recorded']:
+            return
+        stats['recorded'] = True
+        in_flight, duration, statements, sql_duration = stats['series']
+        REQUESTS.labels(stats['method'], stats['route'], status).inc()
+        duration.observe(time.perf_counter() - stats['start'])
+        statements.observe(stats['statements'])
+        sql_duration.observe(stats['sql_seconds'])
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Metrics in the Prometheus text format"""
+        return Response(generate_latest(_registry()), content_type=CONTENT_TYPE_LATEST)
+
+    @app.route('/healthz', methods=['GET'])
+    def healthz():
+        """Check that the app is up and can reach the database"""
+        try:
+            db.session.execute('SELECT 1')
+        except Exception as e:
+            current_app.logger.warning('Health check failed: %s', e)
+            return jsonify({'status': 'unavailable'}), 503
+        return jsonify({'status': 'ok'}), 200
@@ -1,5 +1,7 @@
 from app import db
 from datetime import datetime
+from app.models.card import Card
+from app.models.lane import Lane
 
 class Board(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -7,19 +9,49 @@ class Board(db.Model):
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped whenever the board, its lanes or its cards change
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     # Relationship with lanes
-    lanes = db.relationship('Lane', backref='board', lazy='dynamic', cascade='all, delete-orphan')
+    lanes = db.relationship('Lane', backref='board', lazy='dynamic', order_by='Lane.rank', cascade='all, delete-orphan')
     
     def to_dict(self):
+        lanes = self.lanes.all()
+        # Every card of the board in one query instead of one per lane
+        cards_by_lane = {lane.id: [] for lane in lanes}
+        for card in Card.query.filter(Card.lane_id.in_(cards_by_lane)).order_by(Card.lane_id, Card.rank):
+            cards_by_lane[card.lane_id].append(card.to_dict())
         return {
             'id': self.id,
             'name': self.name,
             'description': self.description,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
-            'lanes': [lane.to_dict() for lane in self.lanes]
+            'lanes': [lane.to_dict(cards_by_lane[lane.id]) for lane in lanes]
         }
+    
+    @classmethod
+    def touch(cls, *board_ids):
+        """Bump the version of boards changed in the current transaction"""
+        if not board_ids:
+            return
+        table = cls.__table__
+        db.session.execute(table.update().where(table.c.id.in_(board_ids)).values(
+            version=table.c.version + 1))
+        # Loaded boards still carry the old version
+        for obj in db.session.identity_map.values():
+            if isinstance(obj, cls):
+                db.session.expire(obj, ['version', 'updated_at'])
+        # Picked up after commit to invalidate cached snapshots
+        db.session.info.setdefault('changed_boards', set()).update(board_ids)
+
+    @classmethod
+    def touch_lanes(cls, *lane_ids):
+        """Bump the version of the boards owning the given lanes and return their ids"""
+        board_ids = [board_id for board_id, in db.session.query(Lane.board_id).filter(
+            Lane.id.in_(lane_ids)).distinct()]
+        cls.touch(*board_ids)
+        return board_ids
         
     def __repr__(self):
         return f'<Board {self.name}>'
\ No newline at end of file
@@ -1,24 +1,38 @@
 from app import db
 from datetime import datetime
+from app.models.ranked import RankedMixin
 
-class Card(db.Model):
+DICT_KEYS = ('id', 'title', 'description', 'color', 'due_date', 'lane_id', 'created_at', 'updated_at')
+
+class Card(RankedMixin, db.Model):
+    __rank_parent__ = 'lane_id'
+    __table_args__ = (
+        db.Index('ix_card_lane_id_rank', 'lane_id', 'rank'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     color = db.Column(db.String(20), default='white')  # For color-coding cards
-    position = db.Column(db.Integer, nullable=False)
     due_date = db.Column(db.DateTime, nullable=True)
     lane_id = db.Column(db.Integer, db.ForeignKey('lane.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # The fields of to_dict(), for queries that read them as plain rows
+    DICT_COLUMNS = (id, title, description, color, due_date, lane_id, created_at, updated_at)
+    
+    @staticmethod
+    def row_dict(row):
+        """to_dict() of a row of DICT_COLUMNS, leaving its datetimes for the encoder to write"""
+        return dict(zip(DICT_KEYS, row))
+    
     def to_dict(self):
         return {
             'id': self.id,
             'title': self.title,
             'description': self.description,
             'color': self.color,
-            'position': self.position,
             'due_date': self.due_date.isoformat() if self.due_date else None,
             'lane_id': self.lane_id,
             'created_at': self.created_at.isoformat(),
@@ -0,0 +1,124 @@
+import json
+from datetime import datetime
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app import db
+from app.models.board import Board
+from app.models.lane import Lane
+from app.models.card import Card
+
+# How each kind of row is described in an event; they only read attributes, so they
+# serialize Core rows (which are cheaper to load in bulk than ORM objects) as well
+SERIALIZERS = {
+    Board: lambda board: {
+        'id': board.id,
+        'name': board.name,
+        'description': board.description
+    },
+    Lane: lambda lane: {
+        'id': lane.id,
+        'name': lane.name,
+        'board_id': lane.board_id
+    },
+    Card: Card.to_dict
+}
+
+class BoardEvent(db.Model):
+    """Append-only log of committed changes to a board, its lanes and its cards"""
+    __table_args__ = (
+        db.Index('ix_board_event_board_id_id', 'board_id', 'id'),
+        db.Index('ix_board_event_board_id_version', 'board_id', 'version'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    # Not a foreign key, so the events of a deleted board are kept
+    board_id = db.Column(db.Integer, nullable=False)
+    # Board version the change produced
+    version = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.String(20), nullable=False)  # e.g. card.created, lane.moved, board.deleted, cards.imported
+    entity_id = db.Column(db.Integer, nullable=False)
+    data = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @staticmethod
+    def record(board_id, kind, entity):
+        """Log a change to entity (a board, lane or card) when the current transaction commits"""
+        pending = db.session.info.setdefault('pending_events', [])
+        if kind.endswith('.deleted'):
+            # The row is gone by commit time, so remember what is needed now
+            version = entity.version if isinstance(entity, Board) else None
+            pending.append((board_id, kind, type(entity), entity.id, version, None))
+        else:
+            pending.append((board_id, kind, type(entity), entity, None, None))
+
+    @staticmethod
+    def record_many(board_id, kind, model, ids):
+        """Log the same change to several rows known only by id, e.g. after a bulk UPDATE"""
+        db.session.info.setdefault('pending_events', []).extend(
+            (board_id, kind, model, entity_id, None, None) for entity_id in ids)
+
+    @staticmethod
+    def record_summary(board_id, kind, entity_id, data):
+        """Log one event standing for a change to many rows, with data describing them instead of a row"""
+        db.session.info.setdefault('pending_events', []).append((board_id, kind, None, entity_id, None, data))
+
+def serialize_event(row):
+    """Describe a board_event row (model instance or Core row) as sent to clients"""
+    return {
+        'id': row.id,
+        'board_id': row.board_id,
+        'version': row.version,
+        'kind': row.kind,
+        'entity_id': row.entity_id,
+        'data': json.loads(row.data) if row.data else None
+    }
+
+@event.listens_for(Session, 'before_commit')
+def write_pending_events(session):
+    """Insert the recorded events in the committing transaction, stamped with the new board versions"""
+    pending = session.info.pop('pending_events', None)
+    if not pending:
+        return
+    session.flush()
+
+    # Read every changed row that still exists with one query per model
+    ids_by_model = {}
+    for _, kind, model, entity, _, _ in pending:
+        if model is not None and not kind.endswith('.deleted'):
+            ids_by_model.setdefault(model, set()).add(entity if isinstance(entity, int) else entity.id)
+    data = {}
+    for model, ids in ids_by_model.items():
+        table = model.__table__
+        for row in session.execute(select(table).where(table.c.id.in_(ids))):
+            data[model, row.id] = json.dumps(SERIALIZERS[model](row))
+
+    versions = dict(session.query(Board.id, Board.version).filter(
+        Board.id.in_({board_id for board_id, _, _, _, _, _ in pending})))
+    rows = []
+    for board_id, kind, model, entity, version, summary in pending:
+        entity_id = entity if isinstance(entity, int) else entity.id
+        rows.append({
+            'board_id': board_id,
+            'version': versions.get(board_id, version),
+            'kind': kind,
+            'entity_id': entity_id,
+            'data': json.dumps(summary) if summary is not None else data.get((model, entity_id))
+        })
+    session.execute(BoardEvent.__table__.insert(), rows)
+    session.info['events_written'] = True
+
+@event.listens_for(Session, 'after_commit')
+def notify_event_broker(session):
+    """Wake this process's event broker so local subscribers see the events without waiting a poll"""
+    if session.in_nested_transaction():
+        return
+    if session.info.pop('events_written', None) and has_app_context():
+        broker = current_app.extensions.get('event_broker')
+        if broker is not None:
+            broker.notify()
+
+@event.listens_for(Session, 'after_rollback')
+def forget_pending_events(session):
+    session.info.pop('pending_events', None)
+    session.info.pop('events_written', None)
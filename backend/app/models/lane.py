@@ -1,26 +1,33 @@
 from app import db
 from datetime import datetime
+from app.models.ranked import RankedMixin
 
-class Lane(db.Model):
+class Lane(RankedMixin, db.Model):
+    __rank_parent__ = 'board_id'
+    __table_args__ = (
+        db.Index('ix_lane_board_id_rank', 'board_id', 'rank'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
-    position = db.Column(db.Integer, nullable=False)
     board_id = db.Column(db.Integer, db.ForeignKey('board.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationship with cards
-    cards = db.relationship('Card', backref='lane', lazy='dynamic', cascade='all, delete-orphan')
+    cards = db.relationship('Card', backref='lane', lazy='dynamic', order_by='Card.rank', cascade='all, delete-orphan')
     
-    def to_dict(self):
+    def to_dict(self, cards=None):
+        """Serialize the lane with its cards, loaded unless already serialized by the caller"""
+        if cards is None:
+            cards = [card.to_dict() for card in self.cards]
         return {
             'id': self.id,
             'name': self.name,
-            'position': self.position,
             'board_id': self.board_id,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
-            'cards': [card.to_dict() for card in self.cards]
+            'cards': cards
         }
         
     def __repr__(self):
@@ -0,0 +1,164 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import db
+from app.ordering import MAX_KEY_LENGTH, key_between, keys_after, keys_between
+
+class RankedMixin:
+    """Orders siblings (lanes in a board, cards in a lane) by a fractional rank key"""
+    # Name of the foreign key column that groups siblings
+    __rank_parent__ = None
+
+    rank = db.Column(db.String(64), nullable=False)
+
+    @classmethod
+    def _siblings(cls, parent_id, exclude_id=None):
+        query = db.session.query(cls.rank).filter(getattr(cls, cls.__rank_parent__) == parent_id)
+        if exclude_id is not None:
+            query = query.filter(cls.id != exclude_id)
+        return query
+
+    @classmethod
+    def last_rank(cls, parent_id):
+        """Get the highest rank among the siblings, or None if there are none"""
+        return cls._siblings(parent_id).order_by(cls.rank.desc()).limit(1).scalar()
+
+    @classmethod
+    def rank_for(cls, parent_id, after_id=None, before_id=None, index=None, exclude_id=None):
+        """Compute a rank placing a row in parent_id.
+
+        The row goes between the siblings after_id and before_id when given,
+        at the zero-based index when given, or at the end otherwise.
+        Raises ValueError if a neighbour is not a sibling in parent_id.
+        """
+        prev_rank, next_rank = cls._neighbours(parent_id, after_id, before_id, index, exclude_id)
+        if prev_rank is not None and next_rank is not None and prev_rank >= next_rank:
+            # Duplicate ranks from concurrent writers; spread them out again
+            cls.rebalance(parent_id)
+            prev_rank, next_rank = cls._neighbours(parent_id, after_id, before_id, index, exclude_id)
+
+        rank = key_between(prev_rank, next_rank)
+        if len(rank) > MAX_KEY_LENGTH:
+            cls.rebalance(parent_id)
+            rank = key_between(*cls._neighbours(parent_id, after_id, before_id, index, exclude_id))
+        return rank
+
+    @classmethod
+    def _neighbours(cls, parent_id, after_id, before_id, index, exclude_id):
+        siblings = cls._siblings(parent_id, exclude_id)
+
+        if after_id is not None or before_id is not None:
+            ids = [i for i in (after_id, before_id) if i is not None]
+            ranks = dict(cls._siblings(parent_id).with_entities(cls.id, cls.rank).filter(
+                cls.id.in_(ids)).all())
+            if set(ranks) != set(ids) or exclude_id in ranks:
+                raise ValueError('Neighbours must be other rows in the same parent')
+            prev_rank = ranks.get(after_id)
+            next_rank = ranks.get(before_id)
+            if before_id is None:
+                next_rank = siblings.filter(cls.rank > prev_rank).order_by(cls.rank).limit(1).scalar()
+            elif after_id is None:
+                prev_rank = siblings.filter(cls.rank < next_rank).order_by(
+                    cls.rank.desc()).limit(1).scalar()
+            return prev_rank, next_rank
+
+        if index is not None and index <= 0:
+            return None, siblings.order_by(cls.rank).limit(1).scalar()
+        if index is not None:
+            prev_rank = siblings.order_by(cls.rank).offset(index - 1).limit(1).scalar()
+            if prev_rank is not None:
+                return prev_rank, siblings.filter(cls.rank > prev_rank).order_by(cls.rank).limit(1).scalar()
+
+        return siblings.order_by(cls.rank.desc()).limit(1).scalar(), None
+
+    @classmethod
+    def rebalance(cls, parent_id):
+        """Rewrite the ranks of all siblings in parent_id with short, evenly spaced keys"""
+        ids = [row.id for row in cls._siblings(parent_id).with_entities(cls.id).order_by(
+            cls.rank, cls.id)]
+        db.session.execute(cls.__table__.update().where(cls.__table__.c.id == db.bindparam('_id')), [
+            {'_id': row_id, 'rank': rank} for row_id, rank in zip(ids, keys_after(None, len(ids)))])
+        cls._expire_loaded(['rank'])
+
+    @classmethod
+    def _expire_loaded(cls, attributes):
+        """Expire attributes of loaded instances after a bulk UPDATE bypassed the ORM"""
+        for obj in db.session.identity_map.values():
+            if isinstance(obj, cls):
+                db.session.expire(obj, attributes)
+
+    @classmethod
+    def move_many(cls, moves):
+        """Move several rows at once with a single bulk UPDATE.
+
+        moves is a list of (id, parent_id, index) tuples, where index is the
+        zero-based position in the parent's final order (None for the end).
+        Only the moved rows are written unless a parent has to be rebalanced.
+        """
+        parent_column = getattr(cls, cls.__rank_parent__)
+        moved = {row_id: (parent_id, index) for row_id, parent_id, index in moves}
+        parent_ids = {parent_id for parent_id, _ in moved.values()}
+
+        siblings = {parent_id: [] for parent_id in parent_ids}
+        ranks = {}
+        rows = db.session.query(cls.id, parent_column, cls.rank).filter(
+            parent_column.in_(parent_ids)).order_by(parent_column, cls.rank)
+        for row_id, parent_id, rank in rows:
+            if row_id not in moved:
+                siblings[parent_id].append(row_id)
+                ranks[row_id] = rank
+
+        # Insert in ascending index order so every row lands at its final index
+        for row_id, (parent_id, index) in sorted(
+                moved.items(), key=lambda item: (item[1][1] is None, item[1][1] or 0)):
+            order = siblings[parent_id]
+            order.insert(len(order) if index is None else min(max(index, 0), len(order)), row_id)
+
+        params = []
+        for parent_id, order in siblings.items():
+            try:
+                new_ranks = cls._ranks_for_runs(order, moved, ranks)
+            except ValueError:
+                new_ranks = {}
+            if not new_ranks or any(len(rank) > MAX_KEY_LENGTH for rank in new_ranks.values()):
+                # Rebalance the whole parent instead
+                new_ranks = dict(zip(order, keys_between(None, None, len(order))))
+            params.extend({'_id': row_id, cls.__rank_parent__: parent_id, 'rank': new_ranks[row_id]}
+                          for row_id in new_ranks)
+
+        if params:
+            table = cls.__table__
+            db.session.execute(table.update().where(table.c.id == db.bindparam('_id')), params)
+            cls._expire_loaded([cls.__rank_parent__, 'rank', 'updated_at'])
+
+    @staticmethod
+    def _ranks_for_runs(order, moved, ranks):
+        """Key each run of consecutive moved rows between the fixed rows around it"""
+        new_ranks = {}
+        run = []
+        prev_rank = None
+        for row_id in order + [None]:
+            if row_id in moved:
+                run.append(row_id)
+                continue
+            next_rank = ranks.get(row_id)
+            new_ranks.update(zip(run, keys_between(prev_rank, next_rank, len(run))))
+            run = []
+            prev_rank = next_rank
+        return new_ranks
+
+@event.listens_for(Session, 'before_flush')
+def assign_missing_ranks(session, flush_context, instances):
+    """Append new rows created without a rank to the end of their parent, in the order they were added"""
+    pending = {}
+    for obj in session.new:
+        if isinstance(obj, RankedMixin) and obj.rank is None:
+            parent_id = getattr(obj, obj.__rank_parent__)
+            pending.setdefault((type(obj), parent_id), []).append(obj)
+
+    for (cls, parent_id), objs in pending.items():
+        last = None
+        if parent_id is not None:
+            with session.no_autoflush:
+                last = cls.last_rank(parent_id)
+        for obj, rank in zip(objs, keys_after(last, len(objs))):
+            obj.rank = rank
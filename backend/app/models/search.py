@@ -0,0 +1,33 @@
+"""SQLite FTS5 full-text index over card titles and descriptions.
+
+card_fts is an external-content table: it stores only the index and reads
+the text from the card table. Triggers keep it in sync with every write,
+including bulk INSERTs that bypass the ORM. SQLite drops triggers along with
+their table, so a migration that recreates the card table (a batch
+migration) must recreate them.
+"""
+from sqlalchemy import DDL, event
+from app.models.card import Card
+
+CREATE_STATEMENTS = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS card_fts USING fts5(
+        title, description, content='card', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS card_fts_insert AFTER INSERT ON card BEGIN
+        INSERT INTO card_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS card_fts_delete AFTER DELETE ON card BEGIN
+        INSERT INTO card_fts (card_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS card_fts_update AFTER UPDATE OF title, description ON card BEGIN
+        INSERT INTO card_fts (card_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO card_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+]
+
+# Created and dropped with the card table by db.create_all() / db.drop_all()
+for statement in CREATE_STATEMENTS:
+    event.listen(Card.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+event.listen(Card.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS card_fts').execute_if(dialect='sqlite'))
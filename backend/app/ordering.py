@@ -0,0 +1,176 @@
+"""Fractional order keys for lanes and cards.
+
+Keys are base-62 strings that sort lexicographically in the desired order, so
+a row can be moved between two neighbours by writing a single new key instead
+of renumbering every sibling. A key is an integer part (a head character that
+encodes its length followed by that many digits) and an optional fractional
+part; appending at the end increments the integer part, so keys stay short
+for the common "add to the bottom of the lane" case.
+"""
+
+DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+# Keys longer than this trigger a rebalance of the siblings
+MAX_KEY_LENGTH = 32
+
+_SMALLEST_INTEGER = 'A' + DIGITS[0] * 26
+
+
+def _midpoint(a, b):
+    """Return a fraction string strictly between fractions a and b (b may be None)"""
+    if b is not None and a >= b:
+        raise ValueError(f'{a!r} is not less than {b!r}')
+    if a[-1:] == DIGITS[0] or (b is not None and b[-1:] == DIGITS[0]):
+        raise ValueError('Fractional part has a trailing zero')
+    if b:
+        # Skip the common prefix
+        n = 0
+        while (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else len(DIGITS)
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _integer_length(head):
+    if 'a' <= head <= 'z':
+        return ord(head) - ord('a') + 2
+    if 'A' <= head <= 'Z':
+        return ord('Z') - ord(head) + 2
+    raise ValueError(f'Invalid order key head {head!r}')
+
+
+def _integer_part(key):
+    length = _integer_length(key[0])
+    if length > len(key):
+        raise ValueError(f'Invalid order key {key!r}')
+    return key[:length]
+
+
+def _validate(key):
+    if key == _SMALLEST_INTEGER:
+        raise ValueError(f'Invalid order key {key!r}')
+    integer = _integer_part(key)
+    if key[len(integer):][-1:] == DIGITS[0]:
+        raise ValueError(f'Invalid order key {key!r}')
+
+
+def _increment_integer(x):
+    head, digits = x[0], list(x[1:])
+    for i in reversed(range(len(digits))):
+        d = DIGITS.index(digits[i]) + 1
+        if d < len(DIGITS):
+            digits[i] = DIGITS[d]
+            return head + ''.join(digits)
+        digits[i] = DIGITS[0]
+    # Carried past the most significant digit
+    if head == 'Z':
+        return 'a' + DIGITS[0]
+    if head == 'z':
+        return None
+    head = chr(ord(head) + 1)
+    if head > 'a':
+        digits.append(DIGITS[0])
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def _decrement_integer(x):
+    head, digits = x[0], list(x[1:])
+    for i in reversed(range(len(digits))):
+        d = DIGITS.index(digits[i]) - 1
+        if d >= 0:
+            digits[i] = DIGITS[d]
+            return head + ''.join(digits)
+        digits[i] = DIGITS[-1]
+    # Borrowed past the most significant digit
+    if head == 'a':
+        return 'Z' + DIGITS[-1]
+    if head == 'A':
+        return None
+    head = chr(ord(head) - 1)
+    if head < 'Z':
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def key_between(a, b):
+    """Return an order key that sorts strictly between a and b.
+
+    Either bound may be None, meaning "before everything" or "after everything".
+    """
+    if a is not None:
+        _validate(a)
+    if b is not None:
+        _validate(b)
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f'{a!r} is not less than {b!r}')
+
+    if a is None:
+        if b is None:
+            return 'a' + DIGITS[0]
+        integer_b = _integer_part(b)
+        fraction_b = b[len(integer_b):]
+        if integer_b == _SMALLEST_INTEGER:
+            return integer_b + _midpoint('', fraction_b)
+        if integer_b < b:
+            return integer_b
+        key = _decrement_integer(integer_b)
+        if key is None:
+            raise ValueError('Cannot decrement any further')
+        return key
+
+    integer_a = _integer_part(a)
+    fraction_a = a[len(integer_a):]
+    if b is None:
+        key = _increment_integer(integer_a)
+        return integer_a + _midpoint(fraction_a, None) if key is None else key
+
+    integer_b = _integer_part(b)
+    fraction_b = b[len(integer_b):]
+    if integer_a == integer_b:
+        return integer_a + _midpoint(fraction_a, fraction_b)
+    key = _increment_integer(integer_a)
+    if key is None:
+        raise ValueError('Cannot increment any further')
+    if key < b:
+        return key
+    return integer_a + _midpoint(fraction_a, None)
+
+
+def keys_after(a, n):
+    """Return n ascending order keys that all sort after a (which may be None)"""
+    keys = []
+    for _ in range(n):
+        a = key_between(a, None)
+        keys.append(a)
+    return keys
+
+
+def keys_between(a, b, n):
+    """Return n ascending order keys that all sort strictly between a and b"""
+    if n <= 0:
+        return []
+    if n == 1:
+        return [key_between(a, b)]
+    if b is None:
+        return keys_after(a, n)
+    if a is None:
+        keys = []
+        for _ in range(n):
+            b = key_between(None, b)
+            keys.append(b)
+        return keys[::-1]
+    # Split the range in half so the keys stay balanced
+    mid = n // 2
+    c = key_between(a, b)
+    return keys_between(a, c, mid) + [c] + keys_between(c, b, n - mid - 1)
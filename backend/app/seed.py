@@ -0,0 +1,165 @@
+import math
+import random
+import time
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from sqlalchemy import inspect
+from app import db, init_migrate
+from app.models.board import Board
+from app.models.card import Card
+from app.models.lane import Lane
+from app.ordering import keys_after
+
+WORDS = (
+    'add api auth backend bug cache card check client config crash dashboard data database deploy '
+    'design docs edge email endpoint error export feature field filter fix flaky form frontend '
+    'handle import index input issue job lane layout load log login migration mobile model move '
+    'notification page payment performance query refactor release report request retry review '
+    'search server session settings signup slow sort spec support sync test timeout token ui '
+    'update upload user validation view worker'
+).split()
+LANE_NAMES = ['Backlog', 'To Do', 'In Progress', 'Review', 'Testing', 'Done', 'Blocked', 'Ideas']
+COLORS = ['white', 'white', 'white', 'red', 'yellow', 'green', 'blue']
+
+# Description length in words: none for EMPTY_DESCRIPTIONS of the cards, otherwise
+# log-normal around MEDIAN_DESCRIPTION_WORDS and capped at MAX_DESCRIPTION_WORDS
+EMPTY_DESCRIPTIONS = 0.2
+MEDIAN_DESCRIPTION_WORDS = 25
+MAX_DESCRIPTION_WORDS = 600
+
+INSERT_CHUNK_SIZE = 5000
+
+SAMPLE_LANES = ['To Do', 'In Progress', 'Done']
+SAMPLE_CARDS = [
+    (0, 'Welcome to NotScrum', 'This is a sample card to get you started.'),
+    (0, 'Try dragging this card', 'You can drag cards between lanes to update their status.'),
+    (1, 'Create a new card', 'Click the + Add Card button at the bottom of a lane.'),
+    (2, 'Sample completed task', 'This is a sample of a completed task.'),
+]
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+def title(rng):
+    return sentence(rng, rng.randint(2, 8))
+
+def description(rng):
+    """Random text with the length distribution of real card descriptions"""
+    if rng.random() < EMPTY_DESCRIPTIONS:
+        return ''
+    words = min(MAX_DESCRIPTION_WORDS, max(1, int(rng.lognormvariate(math.log(MEDIAN_DESCRIPTION_WORDS), 1))))
+    sentences = []
+    while words > 0:
+        length = min(words, rng.randint(5, 15))
+        sentences.append(sentence(rng, length) + '.')
+        words -= length
+    return ' '.join(sentences)
+
+def create_sample_board():
+    """Create the getting-started board with a few example cards"""
+    board = Board(name='Sample Board', description='This is a sample board created automatically')
+    db.session.add(board)
+    db.session.flush()
+    # Added in order, so each lane and card goes after the ones before it
+    lanes = [Lane(name=name, board_id=board.id) for name in SAMPLE_LANES]
+    db.session.add_all(lanes)
+    db.session.flush()
+    for lane_index, card_title, card_description in SAMPLE_CARDS:
+        db.session.add(Card(title=card_title, description=card_description, lane_id=lanes[lane_index].id))
+    db.session.commit()
+    return {'boards': 1, 'lanes': len(lanes), 'cards': len(SAMPLE_CARDS)}
+
+def generate(boards=10, lanes=5, cards=40, seed=0):
+    """Insert boards × lanes × cards rows of synthetic data; returns the row counts.
+
+    cards is the number of cards per lane. Rows are written with multi-row
+    INSERTs from a seeded RNG, so the same arguments give the same data.
+    No board events are logged for the generated rows.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    lane_ranks = keys_after(None, lanes)
+    card_ranks = keys_after(None, cards)
+
+    first_board = (db.session.query(db.func.max(Board.id)).scalar() or 0) + 1
+    db.session.execute(Board.__table__.insert(), [{
+        'name': f'Board {first_board + n}: {title(rng)}',
+        'description': description(rng),
+        'version': 1,
+        'created_at': now,
+        'updated_at': now
+    } for n in range(boards)])
+    board_ids = [id for id, in db.session.query(Board.id).filter(Board.id >= first_board).order_by(Board.id)]
+    if not board_ids or not lanes:
+        db.session.commit()
+        return {'boards': len(board_ids), 'lanes': 0, 'cards': 0}
+
+    db.session.execute(Lane.__table__.insert(), [{
+        'name': LANE_NAMES[position % len(LANE_NAMES)],
+        'rank': lane_ranks[position],
+        'board_id': board_id,
+        'created_at': now,
+        'updated_at': now
+    } for board_id in board_ids for position in range(lanes)])
+    lane_ids = [id for id, in db.session.query(Lane.id).filter(Lane.board_id >= first_board).order_by(Lane.id)]
+
+    rows = []
+    for lane_id in lane_ids:
+        for position in range(cards):
+            created = now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+            rows.append({
+                'title': title(rng),
+                'description': description(rng),
+                'color': rng.choice(COLORS),
+                'rank': card_ranks[position],
+                'due_date': created + timedelta(days=rng.randint(1, 30)) if rng.random() < 0.3 else None,
+                'lane_id': lane_id,
+                'created_at': created,
+                'updated_at': created
+            })
+            if len(rows) >= INSERT_CHUNK_SIZE:
+                db.session.execute(Card.__table__.insert(), rows)
+                rows = []
+    if rows:
+        db.session.execute(Card.__table__.insert(), rows)
+    db.session.commit()
+    return {'boards': len(board_ids), 'lanes': len(lane_ids), 'cards': len(lane_ids) * cards}
+
+def migrate_schema():
+    """Bring the schema to the latest migration; returns what was done"""
+    init_migrate(current_app)
+    from flask_migrate import stamp, upgrade
+    
+    tables = inspect(db.engine).get_table_names()
+    if 'board' in tables and 'alembic_version' not in tables:
+        # Created by db.create_all(), which matches the latest migration
+        stamp()
+        return 'stamped'
+    upgrade()
+    return 'upgraded'
+
+def init_app(app):
+    """Register the init-db CLI command"""
+
+    @app.cli.command('init-db')
+    @click.option('--sample/--no-sample', default=True, help='Create the sample board (default) or nothing')
+    @click.option('--boards', type=int, help='Generate this many boards of synthetic data instead of the sample')
+    @click.option('--lanes', type=int, default=5, show_default=True, help='Lanes per generated board')
+    @click.option('--cards', type=int, default=40, show_default=True, help='Cards per generated lane')
+    @click.option('--seed', type=int, default=0, show_default=True, help='Random seed for generated data')
+    def init_db_command(sample, boards, lanes, cards, seed):
+        """Upgrade the database schema and seed an empty database; safe to run on every start"""
+        start = time.perf_counter()
+        click.echo(f'Schema {migrate_schema()}')
+
+        existing = Board.query.count()
+        if existing:
+            click.echo(f'Database has {existing} boards, not seeding')
+        elif boards:
+            counts = generate(boards, lanes, cards, seed)
+            click.echo(f"Generated {counts['boards']} boards, {counts['lanes']} lanes and {counts['cards']} cards")
+        elif sample:
+            create_sample_board()
+            click.echo('Created the sample board')
+        click.echo(f'Database ready in {time.perf_counter() - start:.2f}s')
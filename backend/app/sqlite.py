@@ -0,0 +1,120 @@
+import threading
+import click
+from flask import current_app
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.pool import NullPool, QueuePool
+
+# Applied to every new SQLite connection; override SQLITE_PRAGMAS to change or disable ({})
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',       # Readers no longer block behind a writer
+    'synchronous': 'NORMAL',     # Safe with WAL, fsyncs only at checkpoints
+    'busy_timeout': 5000,        # Wait for the write lock instead of failing with "database is locked"
+    'cache_size': -64000,        # 64 MiB page cache per connection
+    'mmap_size': 268435456,      # Read through a 256 MiB memory map
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
+class TunedSQLAlchemy(SQLAlchemy):
+    """Flask-SQLAlchemy that pools SQLite connections and applies the tuning pragmas"""
+
+    def apply_driver_hacks(self, app, sa_url, options):
+        sa_url, options = super().apply_driver_hacks(app, sa_url, options)
+        # Keep file connections (and their page cache and memory map) instead of reopening per request
+        if options.get('poolclass') is NullPool and app.config['SQLITE_POOL_SIZE']:
+            options['poolclass'] = QueuePool
+            options['pool_size'] = app.config['SQLITE_POOL_SIZE']
+            options.setdefault('connect_args', {})['check_same_thread'] = False
+        return sa_url, options
+
+    def create_engine(self, sa_url, engine_opts):
+        engine = super().create_engine(sa_url, engine_opts)
+        pragmas = current_app.config['SQLITE_PRAGMAS']
+        if engine.dialect.name == 'sqlite' and pragmas:
+            event.listen(engine, 'connect', _pragma_listener(pragmas))
+        return engine
+
+def _pragma_listener(pragmas):
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
+    return set_pragmas
+
+def run_maintenance(engine):
+    """Checkpoint the WAL back into the database file and refresh planner statistics"""
+    with engine.connect() as connection:
+        busy, log_pages, checkpointed = connection.exec_driver_sql('PRAGMA wal_checkpoint(PASSIVE)').one()
+        connection.exec_driver_sql('PRAGMA optimize')
+    return {'busy': busy, 'log_pages': log_pages, 'checkpointed': checkpointed}
+
+class MaintenanceThread:
+    """Runs run_maintenance every SQLITE_MAINTENANCE_INTERVAL seconds on a thread of its own.
+
+    Started by a worker's first request (after any fork), so no request
+    ever waits for a checkpoint. An interval of 0 leaves it to the
+    sqlite-maintenance command.
+    """
+
+    def __init__(self, app, db):
+        self.app = app
+        self.db = db
+        self.runs = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and self.app.config['SQLITE_MAINTENANCE_INTERVAL']:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='sqlite-maintenance', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stop.set()
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.app.config['SQLITE_MAINTENANCE_INTERVAL']):
+            try:
+                with self.app.app_context():
+                    if self.db.engine.dialect.name == 'sqlite':
+                        run_maintenance(self.db.engine)
+                self.runs += 1
+            except Exception:
+                self.app.logger.exception('SQLite maintenance failed')
+
+def init_app(app, db):
+    """Start the maintenance thread with the first request and register the CLI command"""
+    maintenance = app.extensions['sqlite_maintenance'] = MaintenanceThread(app, db)
+
+    @app.before_request
+    def start_maintenance():
+        maintenance.start()
+
+    @app.cli.command('sqlite-maintenance')
+    def sqlite_maintenance():
+        """Checkpoint the SQLite WAL and run PRAGMA optimize"""
+        result = run_maintenance(db.engine)
+        click.echo(f"Checkpointed {result['checkpointed']} of {result['log_pages']} WAL pages")
+
+def begin_immediate(session):
+    """Open the session's transaction with BEGIN IMMEDIATE, taking the write lock up front.
+    
+    The transaction cannot then fail halfway through on a lock held by
+    another writer, and no other writer can commit until it ends. It also
+    lets SAVEPOINTs nest: pysqlite only emits BEGIN before DML, so a
+    SAVEPOINT issued first would start the transaction itself and releasing
+    it would commit everything.
+    """
+    connection = session.connection()
+    if connection.dialect.name == 'sqlite' and not connection.connection.in_transaction:
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
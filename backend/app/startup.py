@@ -0,0 +1,64 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+import click
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in a fresh interpreter, so that every import is paid for as a new worker pays it
+PROFILE_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+created = time.perf_counter()
+print(json.dumps({'import': imported - start, 'create_app': created - imported, 'modules': sorted(sys.modules)}))
+'''
+
+def profile_startup():
+    """Start the app once in a fresh interpreter under -X importtime.
+
+    Returns the seconds spent importing the app package and in create_app(),
+    the names of the modules loaded by then, and the milliseconds of import
+    time (excluding nested imports) of each top-level package.
+    """
+    env = dict(os.environ)
+    # The flask command sets this, and create_app() would then set up the CLI-only extensions
+    env.pop('FLASK_RUN_FROM_CLI', None)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-W', 'ignore', '-c', PROFILE_SCRIPT],
+                            capture_output=True, text=True, check=True, cwd=BACKEND_DIR, env=env)
+    report = json.loads(result.stdout.splitlines()[-1])
+    packages = defaultdict(float)
+    for line in result.stderr.splitlines():
+        # import time: <self us> | <cumulative us> | <indented module name>
+        fields = line.split('|')
+        if not line.startswith('import time:') or len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        packages[fields[2].strip().split('.')[0]] += int(fields[0].split(':')[1]) / 1000
+    report['packages'] = dict(packages)
+    return report
+
+def init_app(app):
+    """Register the startup-profile CLI command"""
+
+    @app.cli.command('startup-profile')
+    @click.option('--runs', type=int, default=5, show_default=True, help='Fresh interpreters to start')
+    @click.option('--top', type=int, default=15, show_default=True, help='Packages to list')
+    def startup_profile_command(runs, top):
+        """Report where a worker's cold start goes: importing the app, by package, and create_app()"""
+        reports = [profile_startup() for _ in range(runs)]
+        imports = statistics.median(report['import'] for report in reports) * 1000
+        create = statistics.median(report['create_app'] for report in reports) * 1000
+        click.echo(f'Cold start, median of {runs} runs: {imports + create:.1f} ms')
+        click.echo(f'  import app    {imports:8.1f} ms')
+        click.echo(f'  create_app()  {create:8.1f} ms')
+
+        packages = {name: statistics.median(report['packages'].get(name, 0) for report in reports)
+                    for name in set().union(*(report['packages'] for report in reports))}
+        click.echo(f'Import time by top-level package (ms, {len(reports[0]["modules"])} modules loaded):')
+        for name, milliseconds in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+            click.echo(f'  {name:<24} {milliseconds:8.1f}')
@@ -0,0 +1,43 @@
+"""Generate a synthetic Kanban dataset of boards × lanes × cards.
+
+Rows are written with multi-row INSERTs by app.seed.generate(), so even large
+datasets take seconds. Titles and descriptions are drawn from a fixed
+vocabulary with a seeded RNG: descriptions follow a long-tailed length
+distribution (many empty or one-line cards, a few long specs), which is what
+the API serializes and the search index stores. The same arguments always
+produce the same data. `flask init-db --boards N` seeds an empty database the
+same way.
+
+    python benchmarks/dataset.py --database /tmp/bench.sqlite [--boards 10] [--lanes 5] [--cards 40]
+
+The file can then be served (DATABASE_URL=sqlite:////tmp/bench.sqlite gunicorn wsgi:app)
+and loaded with benchmarks/workload.py --url.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.seed import description, generate, title  # noqa: E402,F401
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', required=True, help='SQLite file to create or extend')
+    parser.add_argument('--boards', type=int, default=10)
+    parser.add_argument('--lanes', type=int, default=5, help='Lanes per board')
+    parser.add_argument('--cards', type=int, default=40, help='Cards per lane')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = f'sqlite:///{os.path.abspath(args.database)}'
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        counts = generate(args.boards, args.lanes, args.cards, args.seed)
+    print(f"Generated {counts['boards']} boards, {counts['lanes']} lanes and {counts['cards']} cards")
+
+if __name__ == '__main__':
+    main()
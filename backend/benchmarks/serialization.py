@@ -0,0 +1,82 @@
+"""Time the card listings with plain rows and orjson against ORM objects and jsonify.
+
+For each row count a fresh database gets one board with a single lane of that
+many cards (generated by app.seed.generate), so GET /api/cards and
+GET /api/lanes/<id>/cards both serialize every row. `orm` is the previous
+implementation (ORM objects, to_dict() and jsonify), `rows` the current view
+function; both run in a request context, the snapshot cache is emptied before
+each call, and their bodies are checked to be byte-identical.
+
+    python benchmarks/serialization.py [--rows 10000 100000] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5, help='Timed calls per endpoint and variant; the median is shown')
+    args = parser.parse_args()
+
+    from flask import jsonify
+    from app import create_app, db
+    from app.api import cards as cards_api, lanes as lanes_api
+    from app.models.card import Card
+    from app.seed import generate
+
+    def orm_all_cards():
+        return jsonify([card.to_dict() for card in Card.query.order_by(Card.id)])
+
+    def orm_lane_cards(lane_id):
+        return jsonify([{
+            'id': card.id,
+            'title': card.title,
+            'description': card.description,
+            'lane_id': card.lane_id,
+            'color': card.color
+        } for card in Card.query.filter_by(lane_id=lane_id).order_by(Card.rank, Card.id)])
+
+    print('| Endpoint | Rows | ORM + jsonify ms | Rows + orjson ms | Speedup | Body MB |')
+    print('|---|---|---|---|---|---|')
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'bench.sqlite')}"
+            app = create_app()
+            with app.app_context():
+                db.create_all()
+                generate(1, 1, rows)
+                cache = app.extensions['snapshot_cache']
+                variants = [
+                    ('GET /api/cards', '/api/cards', orm_all_cards, cards_api.get_all_cards),
+                    ('GET /api/lanes/<id>/cards', '/api/lanes/1/cards', lambda: orm_lane_cards(1),
+                     lambda: lanes_api.get_lane_cards(1)),
+                ]
+                for name, path, before, after in variants:
+                    timings = {}
+                    bodies = {}
+                    for label, view in (('orm', before), ('rows', after)):
+                        timings[label] = []
+                        for _ in range(args.repeat):
+                            cache.clear()
+                            with app.test_request_context(path):
+                                start = time.perf_counter()
+                                response = view()
+                                if isinstance(response, tuple):
+                                    response = response[0]
+                                bodies[label] = response.get_data()
+                                timings[label].append(time.perf_counter() - start)
+                            db.session.remove()
+                    if bodies['orm'] != bodies['rows']:
+                        sys.exit(f'{name}: the response bodies differ')
+                    orm, fast = statistics.median(timings['orm']), statistics.median(timings['rows'])
+                    print(f"| {name} | {rows} | {orm * 1000:.1f} | {fast * 1000:.1f} | {orm / fast:.1f}× "
+                          f"| {len(bodies['rows']) / 1e6:.1f} |")
+
+if __name__ == '__main__':
+    main()
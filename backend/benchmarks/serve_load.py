@@ -0,0 +1,179 @@
+"""Compare requests/s of the development server and gunicorn serving wsgi:app.
+
+Each server runs as a subprocess against a fresh, seeded database file, then
+client processes (each with a few threads on keep-alive connections) replay a
+read-heavy mix of board, lane and card requests for a fixed time.
+
+    python benchmarks/serve_load.py [--seconds 15] [--clients 2] [--threads 8] [--servers dev gunicorn]
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PORT = 5077
+
+SERVERS = {
+    # As docker-compose ran it before: Werkzeug with the debugger (the reloader
+    # is left off so the benchmark can stop it cleanly)
+    'dev': (['flask', 'run', '--port', str(PORT), '--no-reload'],
+            {'FLASK_ENV': 'development', 'FLASK_DEBUG': '1'}),
+    # gunicorn.conf.py with its defaults, unless GUNICORN_* variables are set
+    'gunicorn': (['gunicorn', '--bind', f'127.0.0.1:{PORT}', 'wsgi:app'], {}),
+}
+
+LANES = 4
+CARDS_PER_LANE = 50
+
+# (weight, method, path, body); {lane} is replaced by a random lane id
+WORKLOAD = [
+    (4, 'GET', '/api/boards/1?include=cards', None),
+    (3, 'GET', '/api/lanes/{lane}/cards', None),
+    (2, 'GET', '/api/cards?limit=50', None),
+    (1, 'POST', '/api/lanes/{lane}/cards', {'title': 'Load test card'}),
+]
+
+def seed(database_url):
+    """Create the schema and a board with LANES lanes of CARDS_PER_LANE cards"""
+    os.environ['DATABASE_URL'] = database_url
+    from app import create_app, db
+    from app.models.board import Board
+    from app.models.card import Card
+    from app.models.lane import Lane
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        board = Board(name='Load test')
+        db.session.add(board)
+        db.session.flush()
+        lanes = [Lane(name=f'Lane {i}', board_id=board.id) for i in range(LANES)]
+        db.session.add_all(lanes)
+        db.session.flush()
+        db.session.add_all(Card(title=f'Card {n}', description='Seeded', lane_id=lane.id)
+                           for lane in lanes for n in range(CARDS_PER_LANE))
+        db.session.commit()
+
+def client_process(seconds, threads, queue):
+    """Replay the workload from several threads and put the latencies on the queue"""
+    requests = [entry for entry in WORKLOAD for _ in range(entry[0])]
+    deadline = time.monotonic() + seconds
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+
+    def run():
+        connection = http.client.HTTPConnection('127.0.0.1', PORT, timeout=30)
+        local, failed = [], 0
+        while time.monotonic() < deadline:
+            _, method, path, body = random.choice(requests)
+            path = path.format(lane=random.randint(1, LANES))
+            start = time.perf_counter()
+            try:
+                connection.request(method, path, body=json.dumps(body) if body else None,
+                                   headers={'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                ok = response.status < 400
+                if response.getheader('Connection', '').lower() == 'close' or response.version == 10:
+                    connection.close()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                ok = False
+            if ok:
+                local.append(time.perf_counter() - start)
+            else:
+                failed += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    queue.put((latencies, errors[0]))
+
+def wait_until_up(process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('Server exited during startup')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', PORT, timeout=1)
+            connection.request('GET', '/api/boards/1')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('Server did not start')
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0
+
+def run_server(name, seconds, clients, threads):
+    """Serve a fresh database with one server and load it; returns the results"""
+    command, extra_env = SERVERS[name]
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f'sqlite:///{tmp}/load.sqlite'
+        seeder = multiprocessing.Process(target=seed, args=(database_url,))
+        seeder.start()
+        seeder.join()
+
+        env = dict(os.environ, FLASK_APP='wsgi.py', DATABASE_URL=database_url, **extra_env)
+        server = subprocess.Popen(command, cwd=BACKEND, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_up(server)
+            queue = multiprocessing.Queue()
+            processes = [multiprocessing.Process(target=client_process, args=(seconds, threads, queue))
+                         for _ in range(clients)]
+            for process in processes:
+                process.start()
+            latencies, errors = [], 0
+            for _ in processes:
+                process_latencies, process_errors = queue.get()
+                latencies += process_latencies
+                errors += process_errors
+            for process in processes:
+                process.join()
+        finally:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    return {
+        'server': name,
+        'requests': len(latencies),
+        'errors': errors,
+        'requests_per_second': round(len(latencies) / seconds, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=15)
+    parser.add_argument('--clients', type=int, default=2, help='Client processes')
+    parser.add_argument('--threads', type=int, default=8, help='Connections per client process')
+    parser.add_argument('--servers', nargs='+', choices=SERVERS, default=list(SERVERS))
+    args = parser.parse_args()
+
+    print(f"{'server':<10}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name in args.servers:
+        r = run_server(name, args.seconds, args.clients, args.threads)
+        print(f"{name:<10}{r['requests']:>10}{r['requests_per_second']:>10}{r['p50_ms']:>10}"
+              f"{r['p99_ms']:>10}{r['errors']:>8}")
+
+if __name__ == '__main__':
+    main()
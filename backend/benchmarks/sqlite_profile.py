@@ -0,0 +1,105 @@
+"""Compare read/write throughput with and without the SQLite tuning profile.
+
+Each profile runs in its own process against a fresh database file: a few
+writer threads create cards while reader threads list them, all through the
+Flask test client so the full request path (session, pool, pragmas) is used.
+
+    python benchmarks/sqlite_profile.py [--seconds 10] [--readers 8] [--writers 4]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+PROFILES = {
+    # SQLite's defaults and a new connection per request, as before the profile existed
+    'default': {'SQLITE_TUNING': 'off', 'SQLITE_POOL_SIZE': '0'},
+    'tuned': {},
+}
+
+def run_profile(seconds, readers, writers):
+    """Run the workload in this process and return the counters"""
+    from app import create_app, db
+    from app.models.board import Board
+    from app.models.lane import Lane
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        board = Board(name='Benchmark')
+        db.session.add(board)
+        db.session.commit()
+        lanes = [Lane(name=f'Lane {i}', board_id=board.id) for i in range(writers)]
+        db.session.add_all(lanes)
+        db.session.commit()
+        lane_ids = [lane.id for lane in lanes]
+        journal_mode = db.session.execute('PRAGMA journal_mode').scalar()
+
+    counts = {'reads': 0, 'writes': 0, 'read_errors': 0, 'write_errors': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def worker(kind, lane_id=None):
+        client = app.test_client()
+        done = errors = 0
+        while time.monotonic() < deadline:
+            if kind == 'writes':
+                response = client.post(f'/api/lanes/{lane_id}/cards', json={'title': 'Card'})
+            else:
+                response = client.get('/api/cards?limit=50')
+            if response.status_code < 400:
+                done += 1
+            else:
+                errors += 1
+        with lock:
+            counts[kind] += done
+            counts[kind[:-1] + '_errors'] += errors
+
+    threads = [threading.Thread(target=worker, args=('writes', lane_id)) for lane_id in lane_ids]
+    threads += [threading.Thread(target=worker, args=('reads',)) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    counts['journal_mode'] = journal_mode
+    counts['reads_per_second'] = round(counts['reads'] / seconds, 1)
+    counts['writes_per_second'] = round(counts['writes'] / seconds, 1)
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--profile', choices=PROFILES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        print(json.dumps(run_profile(args.seconds, args.readers, args.writers)))
+        return
+
+    results = {}
+    for name, env in PROFILES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, DATABASE_URL=f'sqlite:///{tmp}/bench.sqlite',
+                       SQLITE_MAINTENANCE_INTERVAL='0', **env)
+            output = subprocess.run(
+                [sys.executable, __file__, '--profile', name, '--seconds', str(args.seconds),
+                 '--readers', str(args.readers), '--writers', str(args.writers)],
+                env=env, check=True, capture_output=True, text=True).stdout
+            results[name] = json.loads(output.splitlines()[-1])
+
+    print(f"{'profile':<10}{'journal':>9}{'reads/s':>10}{'writes/s':>10}{'read err':>10}{'write err':>10}")
+    for name, r in results.items():
+        print(f"{name:<10}{r['journal_mode']:>9}{r['reads_per_second']:>10}{r['writes_per_second']:>10}"
+              f"{r['read_errors']:>10}{r['write_errors']:>10}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Compare JSON and MessagePack for the full snapshot of a large board.
+
+A fresh database gets one board of --lanes × --cards generated by
+app.seed.generate. GET /api/boards/1?include=cards is requested in both formats
+with the snapshot cache emptied before each call. The report gives each body's
+size, how long the server takes to encode the board data
+(app.serialization.dumps versus packb), how long a Python client takes to
+decode it (json.loads versus msgpack.unpackb), and the whole uncached request.
+
+    python benchmarks/wire_format.py [--lanes 10] [--cards 1000] [--repeat 20]
+"""
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def median_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def naive(value):
+    """Decoded MessagePack data back in the form the views build: naive UTC datetimes"""
+    if isinstance(value, dict):
+        return {key: naive(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [naive(item) for item in value]
+    if hasattr(value, 'tzinfo'):
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lanes', type=int, default=10)
+    parser.add_argument('--cards', type=int, default=1000, help='Cards per lane')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs of each step; the median is shown')
+    args = parser.parse_args()
+
+    import msgpack
+    from app import create_app, db
+    from app.seed import generate
+    from app.serialization import MSGPACK_MIMETYPES, dumps, packb
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'bench.sqlite')}"
+        app = create_app()
+        with app.app_context():
+            db.create_all()
+            generate(1, args.lanes, args.cards)
+            client = app.test_client()
+            cache = app.extensions['snapshot_cache']
+            url = '/api/boards/1?include=cards'
+            formats = {'JSON': 'application/json', 'MessagePack': MSGPACK_MIMETYPES[0]}
+
+            def request(accept):
+                cache.clear()
+                return client.get(url, headers={'Accept': accept}).data
+
+            bodies = {name: request(accept) for name, accept in formats.items()}
+            data = naive(msgpack.unpackb(bodies['MessagePack'], timestamp=3))
+            with app.test_request_context(url):
+                if dumps(data) != bodies['JSON']:
+                    sys.exit('The JSON and MessagePack bodies hold different data')
+                encode = {'JSON': median_ms(lambda: dumps(data), args.repeat),
+                          'MessagePack': median_ms(lambda: packb(data), args.repeat)}
+            decode = {'JSON': median_ms(lambda: json.loads(bodies['JSON']), args.repeat),
+                      'MessagePack': median_ms(lambda: msgpack.unpackb(bodies['MessagePack'], timestamp=3),
+                                               args.repeat)}
+            total = {name: median_ms(lambda: request(accept), args.repeat) for name, accept in formats.items()}
+
+    print(f'{args.lanes} lanes × {args.cards} cards')
+    print('| Format | Body KB | Gzipped KB | Encode ms | Decode ms | Request ms |')
+    print('|---|---|---|---|---|---|')
+    for name, body in bodies.items():
+        print(f'| {name} | {len(body) / 1024:.0f} | {len(gzip.compress(body)) / 1024:.0f} | {encode[name]:.1f} '
+              f'| {decode[name]:.1f} | {total[name]:.1f} |')
+
+if __name__ == '__main__':
+    main()
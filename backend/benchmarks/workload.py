@@ -0,0 +1,369 @@
+"""Drive a weighted Kanban workload against the API and report per-endpoint statistics.
+
+Targets:
+  client  the Flask test client in this process (no HTTP, measures the app itself)
+  server  the app served over HTTP from a threaded server in this process
+  url     an already running server, e.g. gunicorn (no SQL query counts)
+
+For client and server a fresh database is generated with benchmarks/dataset.py.
+Threads pick operations by weight (--mix) for --seconds after a --warmup.
+The report is JSON: per operation the request count, errors, throughput,
+p50/p95/p99 latency and, in-process, the SQL statements per request. Pass a
+previous report as --baseline to print the changes against it.
+
+    python benchmarks/workload.py --target client --output before.json
+    python benchmarks/workload.py --target client --baseline before.json
+    python benchmarks/workload.py --target url --url http://127.0.0.1:5000
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import dataset  # noqa: E402
+
+# Operation name -> default weight
+DEFAULT_MIX = {
+    'board_load': 30,   # GET /api/boards/<id>?include=cards
+    'board_lanes': 10,  # GET /api/boards/<id>/lanes
+    'lane_list': 25,    # GET /api/lanes/<id>/cards
+    'card_create': 10,  # POST /api/lanes/<id>/cards
+    'card_edit': 15,    # PUT /api/cards/<id>
+    'card_move': 10,    # PUT /api/cards/<id>/move
+}
+
+# Sent with every request so in-process statistics are attributed to the operation
+OPERATION_HEADER = 'X-Benchmark-Operation'
+
+class Layout:
+    """The lanes and cards of every board, updated as the workload creates cards"""
+
+    def __init__(self, boards):
+        # board_id -> ([lane ids], [card ids])
+        self.boards = boards
+        self.board_ids = list(boards)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def discover(cls, transport):
+        """Read the layout through the API"""
+        boards = {}
+        for board in transport.request('GET', '/api/boards')[1]:
+            data = transport.request('GET', f'/api/boards/{board["id"]}?include=cards')[1]
+            boards[board['id']] = ([lane['id'] for lane in data['lanes']],
+                                   [card['id'] for lane in data['lanes'] for card in lane['cards']])
+        return cls(boards)
+
+    def pick(self, rng):
+        board_id = rng.choice(self.board_ids)
+        lane_ids, card_ids = self.boards[board_id]
+        with self.lock:
+            card_id = rng.choice(card_ids) if card_ids else None
+        return board_id, rng.choice(lane_ids), card_id
+
+    def add_card(self, board_id, card_id):
+        with self.lock:
+            self.boards[board_id][1].append(card_id)
+
+def next_request(operation, layout, rng):
+    """Return (method, path, body, board_id) for one operation on a random board"""
+    board_id, lane_id, card_id = layout.pick(rng)
+    if operation == 'board_load':
+        return 'GET', f'/api/boards/{board_id}?include=cards', None, board_id
+    if operation == 'board_lanes':
+        return 'GET', f'/api/boards/{board_id}/lanes', None, board_id
+    if operation == 'lane_list':
+        return 'GET', f'/api/lanes/{lane_id}/cards', None, board_id
+    if operation == 'card_create':
+        return 'POST', f'/api/lanes/{lane_id}/cards', {
+            'title': dataset.title(rng), 'description': dataset.description(rng)}, board_id
+    if operation == 'card_edit':
+        return 'PUT', f'/api/cards/{card_id}', {
+            'title': dataset.title(rng), 'description': dataset.description(rng)}, board_id
+    if operation == 'card_move':
+        return 'PUT', f'/api/cards/{card_id}/move', {
+            'lane_id': lane_id, 'position': rng.randint(0, 10)}, board_id
+    raise ValueError(f'Unknown operation {operation}')
+
+class TestClientTransport:
+    """One test client per thread"""
+
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+
+    def request(self, method, path, body=None, operation=None):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body, headers={OPERATION_HEADER: operation or ''})
+        return response.status_code, response.get_json(silent=True)
+
+class HTTPTransport:
+    """One keep-alive connection per thread"""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.local = threading.local()
+
+    def request(self, method, path, body=None, operation=None):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = self.local.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            connection.request(method, path, body=json.dumps(body) if body is not None else None,
+                               headers={'Content-Type': 'application/json', OPERATION_HEADER: operation or ''})
+            response = connection.getresponse()
+            data = response.read()
+            if response.will_close:
+                connection.close()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            return 0, None
+        try:
+            return response.status, json.loads(data) if data else None
+        except ValueError:
+            return response.status, None
+
+class QueryCounter:
+    """Counts the SQL statements each request executes, by operation (in-process targets only)"""
+
+    def __init__(self, app, engine):
+        from flask import g, has_request_context, request
+        from sqlalchemy import event
+
+        self.counts = {}
+        self.lock = threading.Lock()
+        self.enabled = False
+
+        def count(*args):
+            if has_request_context():
+                g.benchmark_queries = g.get('benchmark_queries', 0) + 1
+
+        @app.after_request
+        def record(response):
+            operation = request.headers.get(OPERATION_HEADER)
+            if self.enabled and operation:
+                with self.lock:
+                    self.counts.setdefault(operation, []).append(g.get('benchmark_queries', 0))
+            return response
+
+        event.listen(engine, 'before_cursor_execute', count)
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))]
+
+def run_workload(transport, layout, mix, seconds, warmup, threads, seed):
+    """Run the mix from several threads; returns ({operation: [latencies]}, {operation: errors})"""
+    operations, weights = zip(*mix.items())
+    latencies = {operation: [] for operation in operations}
+    errors = {operation: 0 for operation in operations}
+    lock = threading.Lock()
+    start = time.monotonic() + warmup
+    deadline = start + seconds
+
+    def run(index):
+        rng = random.Random(seed * 1000 + index)
+        local = {operation: [] for operation in operations}
+        failed = {operation: 0 for operation in operations}
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            operation = rng.choices(operations, weights)[0]
+            method, path, body, board_id = next_request(operation, layout, rng)
+            began = time.perf_counter()
+            status, data = transport.request(method, path, body, operation)
+            elapsed = time.perf_counter() - began
+            if operation == 'card_create' and status == 201:
+                layout.add_card(board_id, data['id'])
+            if now < start:
+                continue
+            if 200 <= status < 400:
+                local[operation].append(elapsed)
+            else:
+                failed[operation] += 1
+        with lock:
+            for operation in operations:
+                latencies[operation] += local[operation]
+                errors[operation] += failed[operation]
+
+    workers = [threading.Thread(target=run, args=(index,)) for index in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return latencies, errors
+
+def summarize(latencies, errors, queries, seconds):
+    """Build the per-operation and total statistics of a run"""
+    endpoints = {}
+    for operation, values in latencies.items():
+        values = sorted(values)
+        counts = sorted(queries.get(operation, [])) if queries is not None else []
+        endpoints[operation] = {
+            'requests': len(values),
+            'errors': errors[operation],
+            'throughput_rps': round(len(values) / seconds, 2),
+            'latency_ms': {
+                'mean': round(sum(values) / len(values) * 1000, 3) if values else None,
+                'p50': round(percentile(values, 0.50) * 1000, 3) if values else None,
+                'p95': round(percentile(values, 0.95) * 1000, 3) if values else None,
+                'p99': round(percentile(values, 0.99) * 1000, 3) if values else None,
+                'max': round(values[-1] * 1000, 3) if values else None,
+            },
+            'sql_queries': {
+                'mean': round(sum(counts) / len(counts), 2),
+                'max': counts[-1],
+            } if counts else None,
+        }
+    total = sum(endpoint['requests'] for endpoint in endpoints.values())
+    all_latencies = sorted(value for values in latencies.values() for value in values)
+    return {
+        'total': {
+            'requests': total,
+            'errors': sum(errors.values()),
+            'throughput_rps': round(total / seconds, 2),
+            'latency_ms': {
+                'p50': round(percentile(all_latencies, 0.50) * 1000, 3) if all_latencies else None,
+                'p95': round(percentile(all_latencies, 0.95) * 1000, 3) if all_latencies else None,
+                'p99': round(percentile(all_latencies, 0.99) * 1000, 3) if all_latencies else None,
+            },
+        },
+        'endpoints': endpoints,
+    }
+
+def serve(app):
+    """Serve the app from a threaded WSGI server on a free local port; returns (server, url)"""
+    from werkzeug.serving import make_server
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+def run(args, mix):
+    """Set up the target, run the workload and return the report"""
+    report = {
+        'target': args.target,
+        'config': {
+            'seconds': args.seconds, 'warmup': args.warmup, 'threads': args.threads, 'seed': args.seed,
+            'mix': mix,
+        },
+        'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+    }
+    if args.target == 'url':
+        transport = HTTPTransport(args.url)
+        layout = Layout.discover(transport)
+        latencies, errors = run_workload(transport, layout, mix, args.seconds, args.warmup, args.threads, args.seed)
+        report.update(summarize(latencies, errors, None, args.seconds))
+        return report
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = f'sqlite:///{tmp}/workload.sqlite'
+        os.environ.setdefault('SQLITE_MAINTENANCE_INTERVAL', '0')
+        from app import create_app, db
+
+        app = create_app()
+        with app.app_context():
+            db.create_all()
+            report['dataset'] = dict(dataset.generate(args.boards, args.lanes, args.cards, args.seed),
+                                     lanes_per_board=args.lanes, cards_per_lane=args.cards)
+            report['environment']['sqlite'] = db.session.execute('SELECT sqlite_version()').scalar()
+            counter = QueryCounter(app, db.engine)
+
+        server = None
+        if args.target == 'server':
+            server, url = serve(app)
+            transport = HTTPTransport(url)
+        else:
+            transport = TestClientTransport(app)
+        try:
+            layout = Layout.discover(transport)
+            # Count queries only once the warmup is over
+            timer = threading.Timer(args.warmup, lambda: setattr(counter, 'enabled', True))
+            timer.start()
+            latencies, errors = run_workload(transport, layout, mix, args.seconds, args.warmup,
+                                             args.threads, args.seed)
+            timer.cancel()
+        finally:
+            if server is not None:
+                server.shutdown()
+        report.update(summarize(latencies, errors, counter.counts, args.seconds))
+    return report
+
+def print_summary(report, baseline=None, out=sys.stderr):
+    """Print a table of the report, with relative changes against a baseline report"""
+    def change(new, old):
+        if baseline is None or old in (None, 0) or new is None:
+            return ''
+        return f' ({(new - old) / old * 100:+.0f}%)'
+
+    header = f"{'operation':<13}{'req/s':>16}{'p50 ms':>18}{'p95 ms':>18}{'p99 ms':>18}{'queries':>9}{'errors':>8}"
+    print(header, file=out)
+    rows = list(report['endpoints'].items()) + [('total', report['total'])]
+    for operation, stats in rows:
+        old = (baseline['total'] if operation == 'total' else baseline['endpoints'].get(operation)) \
+            if baseline else None
+        old = old or {'latency_ms': {}}
+        line = f"{operation:<13}{str(stats['throughput_rps']) + change(stats['throughput_rps'], old.get('throughput_rps')):>16}"
+        for key in ('p50', 'p95', 'p99'):
+            value = stats['latency_ms'][key]
+            line += f"{str(value) + change(value, old['latency_ms'].get(key)):>18}"
+        queries = stats.get('sql_queries')
+        line += f"{queries['mean'] if queries else '':>9}{stats['errors']:>8}"
+        print(line, file=out)
+
+def parse_mix(value):
+    """Parse "board_load=30,card_move=5" into weights, starting from DEFAULT_MIX"""
+    mix = dict(DEFAULT_MIX)
+    if value:
+        for item in value.split(','):
+            name, _, weight = item.partition('=')
+            if name not in DEFAULT_MIX:
+                raise argparse.ArgumentTypeError(f'Unknown operation {name}')
+            mix[name] = float(weight)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', choices=['client', 'server', 'url'], default='client')
+    parser.add_argument('--url', help='Base URL of the server for --target url')
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--warmup', type=float, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--boards', type=int, default=10)
+    parser.add_argument('--lanes', type=int, default=5, help='Lanes per board')
+    parser.add_argument('--cards', type=int, default=40, help='Cards per lane')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(None),
+                        help='Operation weights, e.g. board_load=50,card_move=0 (default: %s)' %
+                             ','.join(f'{name}={weight}' for name, weight in DEFAULT_MIX.items()))
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    parser.add_argument('--baseline', type=argparse.FileType('r'), help='Earlier JSON report to compare with')
+    args = parser.parse_args()
+    if args.target == 'url' and not args.url:
+        parser.error('--target url needs --url')
+
+    report = run(args, args.mix)
+    print_summary(report, json.load(args.baseline) if args.baseline else None)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
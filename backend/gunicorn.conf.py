@@ -0,0 +1,84 @@
+"""Gunicorn settings for serving wsgi:app in production.
+
+Gunicorn reads this file from the working directory (or with -c), so
+`gunicorn wsgi:app` picks it up. Every setting can be overridden with the
+environment variable named next to it.
+"""
+import glob
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+def env_flag(name, default):
+    return os.environ.get(name, default).lower() in ('1', 'true', 'yes', 'on')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# gthread workers serve `threads` requests at once each; every open event stream
+# holds one of those threads, so sync workers would be taken over by a few subscribers.
+# Threads already cover I/O waits, so one process per core keeps the GIL contention low
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+# A worker serves `threads` subscribers and requests together. Event streams may take all
+# but GUNICORN_REQUEST_THREADS of them (and at most half), so a worker full of idle
+# subscribers answers further streams with 503 instead of leaving requests to queue
+threads = int(os.environ.get('GUNICORN_THREADS', 32))
+request_threads = int(os.environ.get('GUNICORN_REQUEST_THREADS', 8))
+# Read by create_app(), so it must be set before the app is loaded
+os.environ.setdefault('EVENTS_MAX_STREAMS', str(max(threads - request_threads, threads // 2, 1)))
+
+# Import the app once in the master so workers fork from it (faster start, shared memory pages)
+preload_app = env_flag('GUNICORN_PRELOAD', 'true')
+
+# Seconds to keep an idle client connection open for its next request
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+# Restart a worker after this many requests (0 disables it), staggered by up to the
+# jitter so the workers do not all restart at once, to bound any slow memory growth
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+# Seconds a worker may take to finish its requests on restart or shutdown before it is
+# killed; open event streams are cut then and their clients reconnect with Last-Event-ID
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+
+# Workers write their Prometheus metrics to files in this directory, so /metrics on
+# any worker reports the totals of all of them; it must be set before the app is loaded
+metrics_dir_created = not os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+if metrics_dir_created:
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='notscrum-metrics-')
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+def dispose_engine(server):
+    """Empty the SQLAlchemy connection pool of the preloaded app"""
+    if not server.cfg.preload_app:
+        return
+    from app import db
+    with server.app.wsgi().app_context():
+        db.engine.dispose()
+
+def on_starting(server):
+    # Counters restart from zero with the server, like a single process would
+    for path in glob.glob(os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], '*.db')):
+        os.remove(path)
+
+def on_exit(server):
+    if metrics_dir_created:
+        shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+
+def child_exit(server, worker):
+    # Drop the in-flight and pool gauges of a worker that is gone
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+def pre_fork(server, worker):
+    # Close any connection the master opened while loading the app, so no worker
+    # inherits one: a SQLite (or socket) handle must never be shared across processes
+    dispose_engine(server)
+
+def post_fork(server, worker):
+    # Each worker starts with its own empty pool and connects on its first request
+    dispose_engine(server)
@@ -93,6 +93,13 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # Batch migrations rebuild SQLite tables, which enforced foreign keys
+        # would refuse (or cascade into), so switch enforcement off meanwhile
+        foreign_keys = None
+        if connection.dialect.name == 'sqlite':
+            foreign_keys = connection.exec_driver_sql('PRAGMA foreign_keys').scalar()
+            connection.exec_driver_sql('PRAGMA foreign_keys = OFF')
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
@@ -103,6 +110,9 @@ def run_migrations_online():
         with context.begin_transaction():
             context.run_migrations()
 
+        if foreign_keys:
+            connection.exec_driver_sql('PRAGMA foreign_keys = ON')
+
 
 if context.is_offline_mode():
     run_migrations_offline()
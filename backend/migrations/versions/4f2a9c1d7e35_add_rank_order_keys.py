@@ -0,0 +1,50 @@
+"""Add fractional rank order keys to lanes and cards
+
+Revision ID: 4f2a9c1d7e35
+Revises: b3319e839cd8
+Create Date: 2026-10-18 09:12:41.532107
+
+"""
+from itertools import groupby
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.ordering import keys_after
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2a9c1d7e35'
+down_revision = 'b3319e839cd8'
+branch_labels = None
+depends_on = None
+
+
+def _backfill(table, parent):
+    """Give existing rows ranks that follow their current position order"""
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        f'SELECT id, {parent} FROM {table} ORDER BY {parent}, position, id')).fetchall()
+    params = []
+    for _, siblings in groupby(rows, key=lambda row: row[1]):
+        ids = [row[0] for row in siblings]
+        params.extend({'id': row_id, 'rank': rank} for row_id, rank in zip(ids, keys_after(None, len(ids))))
+    if params:
+        conn.execute(sa.text(f'UPDATE {table} SET rank = :rank WHERE id = :id'), params)
+
+
+def upgrade():
+    for table, parent in (('lane', 'board_id'), ('card', 'lane_id')):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('rank', sa.String(length=64), nullable=True))
+        _backfill(table, parent)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('rank', existing_type=sa.String(length=64), nullable=False)
+            batch_op.create_index(f'ix_{table}_{parent}_rank', [parent, 'rank'], unique=False)
+
+
+def downgrade():
+    for table, parent in (('card', 'lane_id'), ('lane', 'board_id')):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_index(f'ix_{table}_{parent}_rank')
+            batch_op.drop_column('rank')
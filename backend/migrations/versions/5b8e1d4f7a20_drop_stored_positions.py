@@ -0,0 +1,36 @@
+"""Drop the stored lane and card positions
+
+Revision ID: 5b8e1d4f7a20
+Revises: c6f1e8a3b2d7
+Create Date: 2026-10-18 21:40:12.318457
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e1d4f7a20'
+down_revision = 'c6f1e8a3b2d7'
+branch_labels = None
+depends_on = None
+
+# (table, foreign key column that groups siblings)
+RANKED_TABLES = [('lane', 'board_id'), ('card', 'lane_id')]
+
+
+def upgrade():
+    # A plain DROP COLUMN rather than a batch table rebuild, which would lose the card_fts triggers
+    for table, parent in RANKED_TABLES:
+        op.drop_index(f'ix_{table}_{parent}_position', table_name=table)
+        op.drop_column(table, 'position')
+
+
+def downgrade():
+    for table, parent in RANKED_TABLES:
+        op.add_column(table, sa.Column('position', sa.Integer(), nullable=False, server_default='0'))
+        # Zero-based index in rank order
+        op.execute(f'''UPDATE {table} SET position = ranked.position FROM (
+            SELECT id, row_number() OVER (PARTITION BY {parent} ORDER BY rank, id) - 1 AS position FROM {table}
+        ) AS ranked WHERE {table}.id = ranked.id''')
+        op.create_index(f'ix_{table}_{parent}_position', table, [parent, 'position'], unique=False)
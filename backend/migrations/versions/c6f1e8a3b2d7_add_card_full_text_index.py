@@ -0,0 +1,68 @@
+"""Add card full-text index
+
+Revision ID: c6f1e8a3b2d7
+Revises: 7a3d5f9e2c61
+Create Date: 2026-10-18 16:12:50.662394
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6f1e8a3b2d7'
+down_revision = '7a3d5f9e2c61'
+branch_labels = None
+depends_on = None
+
+# Cards indexed per INSERT while building the index for existing rows
+BATCH_SIZE = 5000
+
+# Copied from app/models/search.py so this revision keeps working if that module changes
+CREATE_STATEMENTS = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS card_fts USING fts5(
+        title, description, content='card', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS card_fts_insert AFTER INSERT ON card BEGIN
+        INSERT INTO card_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS card_fts_delete AFTER DELETE ON card BEGIN
+        INSERT INTO card_fts (card_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS card_fts_update AFTER UPDATE OF title, description ON card BEGIN
+        INSERT INTO card_fts (card_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO card_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+]
+
+
+def upgrade():
+    connection = op.get_bind()
+    if connection.dialect.name != 'sqlite':
+        return
+    for statement in CREATE_STATEMENTS:
+        op.execute(statement)
+
+    # Index the existing cards in id order, a batch at a time
+    last_id = 0
+    while True:
+        batch_end = connection.execute(sa.text(
+            'SELECT max(id) FROM (SELECT id FROM card WHERE id > :last_id ORDER BY id LIMIT :batch_size)'),
+            {'last_id': last_id, 'batch_size': BATCH_SIZE}).scalar()
+        if batch_end is None:
+            break
+        connection.execute(sa.text(
+            'INSERT INTO card_fts (rowid, title, description) '
+            'SELECT id, title, description FROM card WHERE id > :last_id AND id <= :batch_end'),
+            {'last_id': last_id, 'batch_end': batch_end})
+        last_id = batch_end
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for trigger in ['card_fts_insert', 'card_fts_delete', 'card_fts_update']:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS card_fts')
@@ -41,18 +41,18 @@ def init_database(app):
         
         # Create test lanes
         lanes = [
-            Lane(name='Todo', position=0, board_id=board.id),
-            Lane(name='Doing', position=1, board_id=board.id),
-            Lane(name='Done', position=2, board_id=board.id)
+            Lane(name='Todo', board_id=board.id),
+            Lane(name='Doing', board_id=board.id),
+            Lane(name='Done', board_id=board.id)
         ]
         db.session.add_all(lanes)
         db.session.commit()
         
         # Create test cards
         cards = [
-            Card(title='Card 1', description='Description 1', position=0, lane_id=lanes[0].id),
-            Card(title='Card 2', description='Description 2', position=1, lane_id=lanes[0].id),
-            Card(title='Card 3', description='Description 3', position=0, lane_id=lanes[1].id)
+            Card(title='Card 1', description='Description 1', lane_id=lanes[0].id),
+            Card(title='Card 2', description='Description 2', lane_id=lanes[0].id),
+            Card(title='Card 3', description='Description 3', lane_id=lanes[1].id)
         ]
         db.session.add_all(cards)
         db.session.commit()
@@ -0,0 +1,107 @@
+import json
+from app import db
+from app.models.board import Board
+from app.models.card import Card
+from app.models.event import BoardEvent
+
+def test_batch_with_references(client, init_database):
+    """Test running dependent requests in one batch"""
+    response = client.post('/api/batch', json={'requests': [
+        {'method': 'POST', 'path': '/api/boards', 'body': {'name': 'Batch Board'}},
+        {'method': 'POST', 'path': '/api/boards/$0.id/lanes', 'body': {'name': 'Extra'}},
+        {'method': 'POST', 'path': '/api/cards', 'body': {'title': 'Batch Card', 'lane_id': '$1.id'}},
+        {'method': 'PUT', 'path': '/api/cards/$2.id', 'body': {'title': 'Renamed'}},
+        {'method': 'GET', 'path': '/api/lanes/$1.id/cards'}
+    ]})
+    assert response.status_code == 200
+    results = json.loads(response.data)['results']
+    assert [result['status'] for result in results] == [201, 201, 201, 200, 200]
+    assert results[2]['body']['lane_id'] == results[1]['body']['id']
+    assert [card['title'] for card in results[4]['body']] == ['Renamed']
+    
+    # Committed together, with the usual versions and events
+    board = Board.query.get(results[0]['body']['id'])
+    assert board.version == 4
+    assert BoardEvent.query.filter_by(board_id=board.id).count() == 7
+
+def test_batch_is_all_or_nothing(client, init_database):
+    """Test that a failing request rolls back the whole batch"""
+    response = client.post('/api/batch', json={'requests': [
+        {'method': 'POST', 'path': '/api/lanes/1/cards', 'body': {'title': 'Kept?'}},
+        {'method': 'PUT', 'path': '/api/boards/1', 'body': {'name': 'Renamed'}},
+        {'method': 'DELETE', 'path': '/api/cards/999'}
+    ]})
+    assert response.status_code == 404
+    data = json.loads(response.data)
+    assert data['index'] == 2
+    assert [result['status'] for result in data['results']] == [201, 200, 404]
+    
+    assert Card.query.filter_by(title='Kept?').count() == 0
+    board = Board.query.get(1)
+    assert board.name == 'Test Board'
+    assert board.version == 1
+    assert BoardEvent.query.count() == 0
+
+def test_batch_invalid_requests(client, init_database):
+    """Test batches that are rejected before anything is applied"""
+    assert client.post('/api/batch', json={}).status_code == 400
+    assert client.post('/api/batch', json={'requests': []}).status_code == 400
+    
+    response = client.post('/api/batch', json={'requests': [
+        {'method': 'POST', 'path': '/api/lanes/1/cards', 'body': {'title': 'New'}},
+        {'method': 'PUT', 'path': '/api/cards/$5.id', 'body': {'title': 'Missing'}}
+    ]})
+    assert response.status_code == 400
+    assert json.loads(response.data)['index'] == 1
+    assert Card.query.filter_by(title='New').count() == 0
+    
+    for sub_request in [{'path': '/api/batch'}, {'method': 'PATCH', 'path': '/api/cards/1'},
+                        {'path': '/api/cards?stream=1'}, {'method': 'GET'}, 'GET /api/cards']:
+        response = client.post('/api/batch', json={'requests': [sub_request]})
+        assert response.status_code == 400
+
+def test_batch_rejects_import(client, init_database):
+    """Test that an import, which commits in chunks of its own, cannot join a batch"""
+    response = client.post('/api/batch', json={'requests': [
+        {'method': 'POST', 'path': '/api/lanes/1/cards', 'body': {'title': 'New'}},
+        {'method': 'POST', 'path': '/api/cards/import', 'body': {'lane_id': 1, 'title': 'Imported'}}
+    ]})
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data['index'] == 1
+    assert 'cannot be batched' in data['error']
+    assert Card.query.filter(Card.title.in_(['New', 'Imported'])).count() == 0
+
+def test_batch_rollback_leaves_no_cached_snapshot(client, init_database):
+    """Test that a board read within a failed batch is not served from the cache afterwards"""
+    response = client.post('/api/batch', json={'requests': [
+        {'method': 'PUT', 'path': '/api/boards/1', 'body': {'name': 'Rolled back'}},
+        {'method': 'GET', 'path': '/api/boards/1'},
+        {'method': 'DELETE', 'path': '/api/cards/999'}
+    ]})
+    assert response.status_code == 404
+    assert json.loads(response.data)['results'][1]['body']['name'] == 'Rolled back'
+    
+    # Another worker commits the version the batch had produced
+    db.session.execute(Board.__table__.update().values(version=2))
+    db.session.commit()
+    data = json.loads(client.get('/api/boards/1').data)
+    assert data['version'] == 2
+    assert data['name'] == 'Test Board'
+
+def test_batch_rejects_handler_committing_twice(app, client, init_database):
+    """Test that a handler ending the batch's transaction early is a conflict, not a crash"""
+    def commit_twice():
+        Board.query.get(1).name = 'First'
+        db.session.commit()
+        Board.query.get(1).description = 'Second'
+        db.session.commit()
+        return {}
+    app.add_url_rule('/api/commit-twice', 'commit_twice', commit_twice, methods=['POST'])
+    
+    response = client.post('/api/batch', json={'requests': [
+        {'method': 'GET', 'path': '/api/boards/1'},
+        {'method': 'POST', 'path': '/api/commit-twice'}
+    ]})
+    assert response.status_code == 409
+    assert json.loads(response.data)['index'] == 1
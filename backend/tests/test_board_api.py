@@ -1,5 +1,8 @@
 import json
 import pytest
+from sqlalchemy import event
+from app import db
+from app.seed import generate
 
 def test_get_boards(client, init_database):
     response = client.get('/api/boards')
@@ -55,4 +58,86 @@ def test_delete_board(client, init_database):
     
     # Confirm board is deleted
     response = client.get('/api/boards/1')
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+def test_get_board_with_cards(client, init_database):
+    response = client.get('/api/boards/1?include=cards')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert [len(lane['cards']) for lane in data['lanes']] == [2, 1, 0]
+    assert data['lanes'][0]['cards'][0]['title'] == 'Card 1'
+    assert data['lanes'][0]['cards'][1]['title'] == 'Card 2'
+    assert data['lanes'][1]['cards'][0]['title'] == 'Card 3'
+
+def test_get_board_without_cards(client, init_database):
+    response = client.get('/api/boards/1')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert all(lane['cards'] == [] for lane in data['lanes'])
+
+def test_export_board(client, init_database):
+    response = client.get('/api/boards/1/export')
+    assert response.status_code == 200
+    assert response.headers['Content-Disposition'] == 'attachment; filename=board-1.json'
+    data = json.loads(response.data)
+    assert data['name'] == 'Test Board'
+    assert [lane['name'] for lane in data['lanes']] == ['Todo', 'Doing', 'Done']
+    assert [card['title'] for card in data['lanes'][0]['cards']] == ['Card 1', 'Card 2']
+    assert data['lanes'][2]['cards'] == []
+
+def test_export_board_ndjson(client, init_database):
+    response = client.get('/api/boards/1/export', headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [row['type'] for row in rows] == ['board', 'lane', 'card', 'card', 'lane', 'card', 'lane']
+    assert rows[5]['title'] == 'Card 3'
+
+def test_clone_board(client, init_database):
+    response = client.post('/api/boards/1/clone', json={'name': 'From Template'})
+    assert response.status_code == 201
+    clone = json.loads(response.data)
+    assert clone['name'] == 'From Template'
+    assert clone['id'] != 1
+    
+    original = json.loads(client.get('/api/boards/1?include=cards').data)
+    copy = json.loads(client.get(f'/api/boards/{clone["id"]}?include=cards').data)
+    assert [lane['name'] for lane in copy['lanes']] == [lane['name'] for lane in original['lanes']]
+    assert [[card['title'] for card in lane['cards']] for lane in copy['lanes']] == \
+        [[card['title'] for card in lane['cards']] for lane in original['lanes']]
+    
+    # The copy is independent of the original
+    copied_card = copy['lanes'][0]['cards'][0]
+    assert copied_card['id'] != original['lanes'][0]['cards'][0]['id']
+    client.put(f'/api/cards/{copied_card["id"]}', json={'title': 'Changed'})
+    assert json.loads(client.get('/api/cards/1').data)['title'] == 'Card 1'
+
+def test_clone_board_default_name(client, init_database):
+    response = client.post('/api/boards/1/clone')
+    assert json.loads(response.data)['name'] == 'Test Board (copy)'
+    assert client.post('/api/boards/999/clone').status_code == 404
+
+def test_clone_board_sql_independent_of_lanes(app, client):
+    """Test that cloning binds the same parameters whatever the number of lanes"""
+    generate(2, 3, 2)
+    generate(1, 60, 1)
+    
+    parameters = []
+    
+    def record(conn, cursor, statement, params, context, executemany):
+        parameters.append(len(params))
+    
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        counts = []
+        for board_id in (1, 3):
+            parameters.clear()
+            assert client.post(f'/api/boards/{board_id}/clone').status_code == 201
+            counts.append(parameters[:])
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    assert counts[0] == counts[1]
+    
+    copy = json.loads(client.get('/api/boards/5?include=cards').data)
+    assert len(copy['lanes']) == 60
+    assert all(len(lane['cards']) == 1 for lane in copy['lanes'])
@@ -0,0 +1,71 @@
+import json
+import threading
+from app.cache import ENTRY_OVERHEAD, SnapshotCache
+
+def test_cache_evicts_least_recently_used():
+    cache = SnapshotCache(max_bytes=2 * (ENTRY_OVERHEAD + 10))
+    cache.set((1, 1, 'board'), b'x' * 10)
+    cache.set((2, 1, 'board'), b'y' * 10)
+    assert cache.get((1, 1, 'board')) == b'x' * 10
+    cache.set((3, 1, 'board'), b'z' * 10)
+    
+    assert cache.get((2, 1, 'board')) is None
+    assert cache.get((1, 1, 'board')) is not None
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['entries'] == 2
+    assert stats['size'] <= stats['max_bytes']
+
+def test_cache_skips_oversized_values():
+    cache = SnapshotCache(max_bytes=100)
+    cache.set((1, 1, 'board'), b'x' * 100)
+    assert cache.get((1, 1, 'board')) is None
+
+def test_cache_invalidates_whole_board():
+    cache = SnapshotCache(max_bytes=10000)
+    cache.set((1, 1, 'board'), b'a')
+    cache.set((1, 1, 'lanes'), b'b')
+    cache.set((2, 1, 'board'), b'c')
+    cache.invalidate(1)
+    assert cache.get((1, 1, 'board')) is None
+    assert cache.get((1, 1, 'lanes')) is None
+    assert cache.get((2, 1, 'board')) == b'c'
+    assert cache.stats()['size'] == 1 + ENTRY_OVERHEAD
+
+def test_cache_is_thread_safe():
+    cache = SnapshotCache(max_bytes=50 * (ENTRY_OVERHEAD + 10))
+    
+    def worker(n):
+        for i in range(2000):
+            key = (i % 20, n, 'board')
+            cache.set(key, b'x' * 10)
+            cache.get(key)
+            if i % 100 == 0:
+                cache.invalidate(i % 20)
+    
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats['size'] == stats['entries'] * (ENTRY_OVERHEAD + 10)
+    assert stats['size'] <= stats['max_bytes']
+
+def test_board_reads_are_cached(client, init_database):
+    first = client.get('/api/boards/1?include=cards')
+    second = client.get('/api/boards/1?include=cards')
+    assert first.data == second.data
+    stats = json.loads(client.get('/api/cache/stats').data)
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+def test_writes_invalidate_cached_reads(client, init_database):
+    client.get('/api/lanes/1/cards')
+    client.put('/api/cards/1', data=json.dumps({'title': 'Changed'}), content_type='application/json')
+    
+    data = json.loads(client.get('/api/lanes/1/cards').data)
+    assert data[0]['title'] == 'Changed'
+    stats = json.loads(client.get('/api/cache/stats').data)
+    assert stats['invalidations'] == 1
+    assert stats['hits'] == 0
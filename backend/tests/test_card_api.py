@@ -24,7 +24,7 @@ def test_get_card(client, init_database):
     data = json.loads(response.data)
     assert data['title'] == 'Card 1'
     assert data['description'] == 'Description 1'
-    assert data['position'] == 0
+    assert 'position' not in data  # Deprecated: the order is that of the lane's listing
     assert data['lane_id'] == 1
 
 def test_create_card(client, init_database):
@@ -42,8 +42,11 @@ def test_create_card(client, init_database):
     assert data['title'] == 'New Card'
     assert data['description'] == 'New Description'
     assert data['color'] == 'blue'
-    assert data['position'] == 2  # Should be added at the end
     assert data['lane_id'] == 1
+    
+    # Should be added at the end
+    data = json.loads(client.get('/api/lanes/1/cards').data)
+    assert [card['title'] for card in data] == ['Card 1', 'Card 2', 'New Card']
 
 def test_update_card(client, init_database):
     response = client.put(
@@ -87,7 +90,6 @@ def test_move_card(client, init_database):
     assert response.status_code == 200
     data = json.loads(response.data)
     assert data['lane_id'] == 2
-    assert data['position'] == 1
     
     # Check card is in the new lane
     response = client.get('/api/lanes/2/cards')
@@ -96,6 +98,12 @@ def test_move_card(client, init_database):
     assert len(data) == 2
     assert data[1]['id'] == 1
 
+def test_move_card_invalid_arguments(client, init_database):
+    for body in [{'lane_id': 1, 'position': 'a'}, {'lane_id': 'a'}, {'lane_id': [2]}, {'lane_id': 2, 'position': {}}]:
+        response = client.put('/api/cards/1/move', json=body)
+        assert response.status_code == 400
+    assert json.loads(client.get('/api/cards/1').data)['lane_id'] == 1
+
 def test_reorder_cards(client, init_database):
     # Lane 1 has cards 1 and 2
     # Current order: [1, 2]
@@ -109,4 +117,117 @@ def test_reorder_cards(client, init_database):
     data = json.loads(response.data)
     assert len(data) == 2
     assert data[0]['id'] == 2
-    assert data[1]['id'] == 1
\ No newline at end of file
+    assert data[1]['id'] == 1
+
+def test_update_card_between_neighbours(client, init_database):
+    # Move card 3 into lane 1 between cards 1 and 2
+    response = client.put(
+        '/api/cards/3',
+        data=json.dumps({'lane_id': 1, 'after_id': 1, 'before_id': 2}),
+        content_type='application/json'
+    )
+    assert response.status_code == 200
+    
+    response = client.get('/api/lanes/1/cards')
+    data = json.loads(response.data)
+    assert [card['id'] for card in data] == [1, 3, 2]
+
+def test_update_card_to_front(client, init_database):
+    response = client.put(
+        '/api/cards/2',
+        data=json.dumps({'before_id': 1}),
+        content_type='application/json'
+    )
+    assert response.status_code == 200
+    
+    response = client.get('/api/lanes/1/cards')
+    data = json.loads(response.data)
+    assert [card['id'] for card in data] == [2, 1]
+
+def test_update_card_neighbour_in_other_lane(client, init_database):
+    response = client.put(
+        '/api/cards/1',
+        data=json.dumps({'after_id': 3}),
+        content_type='application/json'
+    )
+    assert response.status_code == 400
+
+def test_move_cards_bulk(client, init_database):
+    response = client.post(
+        '/api/cards/move',
+        data=json.dumps({'moves': [
+            {'card_id': 1, 'lane_id': 2, 'position': 0},
+            {'card_id': 2, 'lane_id': 2, 'position': 2},
+            {'card_id': 3, 'lane_id': 3, 'position': 0}
+        ]}),
+        content_type='application/json'
+    )
+    assert response.status_code == 200
+    assert len(json.loads(response.data)) == 3
+    
+    lane_cards = [[card['id'] for card in json.loads(client.get(f'/api/lanes/{lane_id}/cards').data)]
+                  for lane_id in (1, 2, 3)]
+    assert lane_cards == [[], [1, 2], [3]]
+
+def test_move_cards_bulk_is_all_or_nothing(client, init_database):
+    response = client.post(
+        '/api/cards/move',
+        data=json.dumps({'moves': [
+            {'card_id': 1, 'lane_id': 2, 'position': 0},
+            {'card_id': 99, 'lane_id': 2, 'position': 1}
+        ]}),
+        content_type='application/json'
+    )
+    assert response.status_code == 404
+    assert json.loads(response.data)['cards'] == [99]
+    
+    data = json.loads(client.get('/api/lanes/1/cards').data)
+    assert [card['id'] for card in data] == [1, 2]
+
+def test_move_cards_rejects_negative_position(client, init_database):
+    response = client.post('/api/cards/move', json={'moves': [{'card_id': 3, 'lane_id': 1, 'position': -1}]})
+    assert response.status_code == 400
+    response = client.put('/api/cards/3/move', json={'lane_id': 1, 'position': -1})
+    assert response.status_code == 400
+    
+    data = json.loads(client.get('/api/lanes/1/cards').data)
+    assert [card['id'] for card in data] == [1, 2]
+
+def test_move_cards_bulk_rejects_other_board(client, init_database):
+    response = client.post(
+        '/api/boards',
+        data=json.dumps({'name': 'Other Board'}),
+        content_type='application/json'
+    )
+    board_id = json.loads(response.data)['id']
+    other_lane = json.loads(client.get(f'/api/boards/{board_id}/lanes').data)[0]['id']
+    
+    response = client.post(
+        '/api/cards/move',
+        data=json.dumps({'moves': [{'card_id': 1, 'lane_id': other_lane}]}),
+        content_type='application/json'
+    )
+    assert response.status_code == 400
+
+def test_create_card_lane_not_found(client, init_database):
+    response = client.post('/api/cards', json={'title': 'Orphan', 'lane_id': 99})
+    assert response.status_code == 404
+    assert json.loads(response.data)['error'] == 'Lane not found'
+    
+    response = client.post('/api/lanes/99/cards', json={'title': 'Orphan'})
+    assert response.status_code == 404
+    assert len(json.loads(client.get('/api/cards').data)) == 3
+
+def test_update_card_lane_not_found(client, init_database):
+    response = client.put('/api/cards/1', json={'title': 'Moved', 'lane_id': 77})
+    assert response.status_code == 404
+    data = json.loads(client.get('/api/cards/1').data)
+    assert data['lane_id'] == 1
+    assert data['title'] == 'Card 1'
+
+@pytest.mark.parametrize('body', [{'position': 'a'}, {'position': -1}, {'after_id': 'a'}, {'before_id': [2]}])
+def test_update_card_invalid_placement(client, init_database, body):
+    response = client.put('/api/cards/1', json=dict(body, title='Moved'))
+    assert response.status_code == 400
+    assert 'must be a non-negative integer' in json.loads(response.data)['error']
+    assert json.loads(client.get('/api/cards/1').data)['title'] == 'Card 1'
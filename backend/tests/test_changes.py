@@ -0,0 +1,80 @@
+import json
+
+def test_changes_since_version(client, init_database):
+    """Test getting only the rows changed since a board version"""
+    response = client.post('/api/lanes/1/cards', json={'title': 'New Card'})
+    new_card = json.loads(response.data)
+    client.put('/api/lanes/2', json={'name': 'Review'})
+    client.put(f'/api/cards/{new_card["id"]}', json={'title': 'Renamed'})
+    client.delete('/api/cards/3')
+    client.delete('/api/lanes/3')
+    
+    response = client.get('/api/boards/1/changes?since=1')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['version'] == 6
+    assert data['board'] is None
+    assert [card['title'] for card in data['cards']] == ['Renamed']
+    assert [lane['name'] for lane in data['lanes']] == ['Review']
+    assert data['deleted'] == {'board': False, 'lanes': [3], 'cards': [3]}
+    
+    # Only the changes after the given version
+    data = json.loads(client.get('/api/boards/1/changes?since=5').data)
+    assert data['cards'] == [] and data['lanes'] == []
+    assert data['deleted']['lanes'] == [3]
+    
+    data = json.loads(client.get('/api/boards/1/changes?since=6').data)
+    assert data['lanes'] == [] and data['cards'] == [] and data['deleted']['lanes'] == []
+
+def test_changes_include_imported_cards(client, init_database):
+    """Test that cards logged by one import event are returned in their latest state"""
+    lines = [{'lane_id': 1, 'title': 'Imported 1'}, {'lane_id': 2, 'title': 'Imported 2'},
+             {'lane_id': 1, 'title': 'Imported 3'}]
+    client.post('/api/cards/import', data='\n'.join(json.dumps(line) for line in lines),
+                content_type='application/x-ndjson')
+    client.put('/api/cards/5', json={'title': 'Renamed'})
+    client.delete('/api/cards/6')
+    
+    data = json.loads(client.get('/api/boards/1/changes?since=1').data)
+    assert data['version'] == 4
+    assert sorted(card['title'] for card in data['cards']) == ['Imported 1', 'Renamed']
+    assert data['deleted']['cards'] == [6]
+    
+    data = json.loads(client.get('/api/boards/1/changes?since=2').data)
+    assert [card['title'] for card in data['cards']] == ['Renamed']
+
+def test_changes_of_deleted_board(client, init_database):
+    """Test that a deleted board is reported with a tombstone"""
+    client.put('/api/boards/1', json={'name': 'Renamed'})
+    client.delete('/api/boards/1')
+    
+    response = client.get('/api/boards/1/changes?since=1')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['version'] == 3
+    assert data['deleted']['board'] is True
+
+def test_changes_before_history(client, init_database):
+    """Test that versions older than the logged history ask for a reload"""
+    client.put('/api/boards/1', json={'name': 'Renamed'})
+    client.put('/api/boards/1', json={'name': 'Renamed again'})
+    
+    # The fixture board was created without events, so only changes after version 1 are known
+    assert client.get('/api/boards/1/changes?since=0').status_code == 410
+    data = json.loads(client.get('/api/boards/1/changes?since=1').data)
+    assert data['board']['name'] == 'Renamed again'
+
+def test_changes_of_new_board(client):
+    """Test that a board created through the API has its whole history"""
+    response = client.post('/api/boards', json={'name': 'New Board'})
+    board_id = json.loads(response.data)['id']
+    
+    data = json.loads(client.get(f'/api/boards/{board_id}/changes?since=0').data)
+    assert data['board']['name'] == 'New Board'
+    assert [lane['name'] for lane in data['lanes']] == ['To Do', 'In Progress', 'Done']
+
+def test_changes_invalid_requests(client, init_database):
+    """Test changes with a missing version or board"""
+    assert client.get('/api/boards/1/changes').status_code == 400
+    assert client.get('/api/boards/1/changes?since=abc').status_code == 400
+    assert client.get('/api/boards/999/changes?since=0').status_code == 404
@@ -0,0 +1,94 @@
+import gzip
+import json
+import zlib
+import pytest
+from app.seed import generate
+
+@pytest.fixture
+def large_board(app):
+    generate(1, 3, 20)
+
+def test_gzip_listing(client, large_board):
+    plain = client.get('/api/cards')
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+
+    response = client.get('/api/cards', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert int(response.headers['Content-Length']) == len(response.data) < len(plain.data)
+    assert gzip.decompress(response.data) == plain.data
+
+def test_brotli_preferred_when_installed(client, large_board):
+    brotli = pytest.importorskip('brotli')
+    plain = client.get('/api/cards')
+
+    response = client.get('/api/cards', headers={'Accept-Encoding': 'gzip, deflate, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.data) == plain.data
+
+    response = client.get('/api/cards', headers={'Accept-Encoding': 'br;q=0.5, gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+def test_not_compressed(app, client, large_board):
+    # Below the size threshold
+    response = client.get('/api/cards/1', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert json.loads(response.data)['id'] == 1
+
+    # Not accepted by the client
+    for accept in ('identity', 'gzip;q=0', 'deflate'):
+        response = client.get('/api/cards', headers={'Accept-Encoding': accept})
+        assert 'Content-Encoding' not in response.headers
+
+    app.config['COMPRESS_LEVEL'] = 0
+    response = client.get('/api/cards', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+def test_stream_compressed_chunk_by_chunk(client, large_board):
+    plain = client.get('/api/cards?stream=1').data
+
+    response = client.get('/api/cards?stream=1', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    decompressor = zlib.decompressobj(31)
+    body = b''
+    for chunk in response.response:
+        body += decompressor.decompress(chunk)
+        # Every chunk is flushed, so what has arrived decodes to whole lines
+        assert body.endswith(b'\n') or not body
+    response.close()
+    assert body + decompressor.flush() == plain
+
+def test_export_stream_compressed(client, large_board):
+    plain = client.get('/api/boards/1/export').data
+    response = client.get('/api/boards/1/export', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == plain
+
+def test_snapshot_cache_keeps_compressed_bytes(app, client, large_board):
+    cache = app.extensions['snapshot_cache']
+    cache.clear()
+    plain = client.get('/api/boards/1?include=cards').data
+    assert cache.stats()['entries'] == 1
+
+    first = client.get('/api/boards/1?include=cards', headers={'Accept-Encoding': 'gzip'})
+    assert first.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(first.data) == plain
+    assert cache.stats()['entries'] == 2
+
+    hits = cache.stats()['hits']
+    second = client.get('/api/boards/1?include=cards', headers={'Accept-Encoding': 'gzip'})
+    assert second.data == first.data
+    assert cache.stats()['hits'] == hits + 1
+    assert cache.stats()['entries'] == 2
+
+def test_snapshot_cache_counts_one_miss_per_request(app, client, large_board):
+    cache = app.extensions['snapshot_cache']
+    cache.clear()
+    before = cache.stats()
+    client.get('/api/boards/1?include=cards', headers={'Accept-Encoding': 'gzip'})
+    client.get('/api/boards/1?include=cards', headers={'Accept-Encoding': 'gzip'})
+    stats = cache.stats()
+    assert stats['misses'] - before['misses'] == 1
+    assert stats['hits'] - before['hits'] == 1
@@ -0,0 +1,70 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+from app import db
+from app.models.board import Board
+
+def test_get_board_sends_validators(client, init_database):
+    response = client.get('/api/boards/1')
+    assert response.status_code == 200
+    assert response.headers['ETag'] == 'W/"board-1-v1"'
+    assert 'Last-Modified' in response.headers
+    assert json.loads(response.data)['version'] == 1
+
+def test_get_board_not_modified(app, client, init_database):
+    full = client.get('/api/boards/1', headers={'Accept-Encoding': 'gzip'})
+    etag = full.headers['ETag']
+    for url in ['/api/boards/1', '/api/boards/1/lanes', '/api/lanes/1/cards']:
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert response.data == b''
+        assert set(response.vary) == set(full.vary) == {'Accept', 'Accept-Encoding'}
+        
+        # The test client's response adds a default Content-Type, so look at what is sent
+        _, status, headers = run_wsgi_app(app, EnvironBuilder(url, headers={'If-None-Match': etag}).get_environ())
+        assert status.startswith('304')
+        assert 'Content-Type' not in headers
+
+def test_if_modified_since_cannot_hide_a_write_in_the_same_second(client, init_database):
+    # Both writes fall in the second the first response's Last-Modified names
+    base = (datetime.utcnow() - timedelta(seconds=10)).replace(microsecond=100000)
+    db.session.execute(Board.__table__.update().values(updated_at=base))
+    db.session.commit()
+    last_modified = client.get('/api/boards/1').headers['Last-Modified']
+    
+    client.put('/api/boards/1', json={'name': 'Second write'})
+    db.session.execute(Board.__table__.update().values(updated_at=base.replace(microsecond=600000)))
+    db.session.commit()
+    response = client.get('/api/boards/1', headers={'If-Modified-Since': last_modified})
+    assert response.status_code == 200
+    assert response.headers['Last-Modified'] == last_modified
+    assert json.loads(response.data)['name'] == 'Second write'
+
+@pytest.mark.parametrize('method,url,body', [
+    ('PUT', '/api/boards/1', {'name': 'Renamed'}),
+    ('POST', '/api/boards/1/lanes', {'name': 'New Lane'}),
+    ('POST', '/api/lanes', {'name': 'New Lane', 'board_id': 1}),
+    ('PUT', '/api/lanes/1', {'name': 'Renamed'}),
+    ('DELETE', '/api/lanes/3', None),
+    ('POST', '/api/lanes/1/cards', {'title': 'New Card'}),
+    ('POST', '/api/cards', {'title': 'New Card', 'lane_id': 2}),
+    ('PUT', '/api/cards/1', {'title': 'Renamed'}),
+    ('PUT', '/api/cards/1/move', {'lane_id': 2}),
+    ('DELETE', '/api/cards/3', None),
+])
+def test_mutations_bump_board_version(client, init_database, method, url, body):
+    etag = client.get('/api/lanes/1/cards').headers['ETag']
+    response = client.open(url, method=method, data=json.dumps(body) if body else None,
+                           content_type='application/json')
+    assert response.status_code < 400
+    
+    response = client.get('/api/lanes/1/cards', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert json.loads(client.get('/api/boards/1').data)['version'] == 2
+
+def test_lane_cards_not_found(client, init_database):
+    response = client.get('/api/lanes/99/cards')
+    assert response.status_code == 404
@@ -0,0 +1,197 @@
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import pytest
+from app import create_app, db
+from app.startup import BACKEND_DIR
+from app.models.event import BoardEvent
+
+@pytest.fixture
+def app(tmp_path):
+    # The event broker polls from its own thread, which needs a real database file
+    app = create_app()
+    app.config.update({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path}/events.sqlite',
+        'EVENTS_POLL_INTERVAL': 0.05,
+        'EVENTS_KEEPALIVE': 5
+    })
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        app.extensions['event_broker'].stop()
+        db.session.remove()
+        db.drop_all()
+
+def read_events(chunks, count):
+    """Read Server-Sent Events from a streamed response until count have arrived"""
+    events = []
+    while len(events) < count:
+        for message in next(chunks).decode().split('\n\n'):
+            fields = dict(line.split(': ', 1) for line in message.splitlines() if not line.startswith(':'))
+            if 'data' in fields:
+                events.append((int(fields['id']), fields['event'], json.loads(fields['data'])))
+    return events
+
+def test_writes_record_events(client, init_database):
+    """Test that card writes are logged with the board version they produced"""
+    response = client.post('/api/lanes/1/cards', json={'title': 'New Card'})
+    card_id = json.loads(response.data)['id']
+    client.put(f'/api/cards/{card_id}', json={'title': 'Renamed'})
+    client.post('/api/cards/move', json={'moves': [{'card_id': card_id, 'lane_id': 2, 'position': 0}]})
+    client.delete(f'/api/cards/{card_id}')
+    
+    events = BoardEvent.query.order_by(BoardEvent.id).all()
+    assert [event.kind for event in events] == ['card.created', 'card.updated', 'card.moved', 'card.deleted']
+    assert all(event.board_id == 1 and event.entity_id == card_id for event in events)
+    assert [event.version for event in events] == [2, 3, 4, 5]
+    assert json.loads(events[1].data)['title'] == 'Renamed'
+    assert json.loads(events[2].data)['lane_id'] == 2
+    assert events[3].data is None
+
+def test_event_stream_resumes_after_last_event_id(client, init_database):
+    """Test that a reconnecting client gets the events it missed"""
+    client.post('/api/lanes/1/cards', json={'title': 'First'})
+    client.post('/api/lanes/1/cards', json={'title': 'Second'})
+    first_id = BoardEvent.query.order_by(BoardEvent.id).first().id
+    
+    response = client.get('/api/boards/1/events', headers={'Last-Event-ID': str(first_id)})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    chunks = iter(response.response)
+    
+    events = read_events(chunks, 1)
+    assert events[0][0] > first_id
+    assert events[0][1] == 'card.created'
+    assert events[0][2]['data']['title'] == 'Second'
+    response.close()
+
+def test_event_stream_delivers_new_events(app, client, init_database):
+    """Test that subscribers receive changes committed after they connected"""
+    response = client.get('/api/boards/1/events')
+    chunks = iter(response.response)
+    assert next(chunks).startswith(b'retry:')
+    
+    client.put('/api/lanes/2', json={'name': 'Review'})
+    events = read_events(chunks, 1)
+    assert events[0][1] == 'lane.updated'
+    assert events[0][2]['data']['name'] == 'Review'
+    
+    # Events written by another worker process are picked up by polling the table
+    db.session.execute(BoardEvent.__table__.insert(), {
+        'board_id': 1, 'version': 99, 'kind': 'card.updated', 'entity_id': 1, 'data': None})
+    db.session.commit()
+    events = read_events(chunks, 1)
+    assert events[0][2]['version'] == 99
+    
+    client.delete('/api/boards/1')
+    events = read_events(chunks, 1)
+    assert events[0][1] == 'board.deleted'
+    # The stream ends once the board is gone
+    with pytest.raises(StopIteration):
+        next(chunks)
+    response.close()
+
+def test_quiet_subscriber_behind_buffer_waits(app, client, init_database):
+    """Test that a subscriber the buffer has moved past blocks instead of spinning"""
+    app.config['EVENTS_KEEPALIVE'] = 0.3
+    broker = app.extensions['event_broker']
+    broker.buffer_size = 3
+    response = client.get('/api/boards/1/events')
+    chunks = iter(response.response)
+    assert next(chunks).startswith(b'retry:')
+    
+    # Another board's changes push board 1's subscriber out of the buffer
+    board_id = json.loads(client.post('/api/boards', json={'name': 'Busy'}).data)['id']
+    lane_id = json.loads(client.post(f'/api/boards/{board_id}/lanes', json={'name': 'Lane'}).data)['id']
+    for number in range(10):
+        client.put(f'/api/lanes/{lane_id}', json={'name': f'Lane {number}'})
+    newest = db.session.query(db.func.max(BoardEvent.id)).scalar()
+    deadline = time.monotonic() + 5
+    while broker.last_id < newest and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert broker._floor > 0
+    
+    for _ in range(2):
+        start = time.monotonic()
+        assert next(chunks) == b': keepalive\n\n'
+        assert time.monotonic() - start >= 0.25
+    
+    client.put('/api/lanes/1', json={'name': 'Doing'})
+    events = read_events(chunks, 1)
+    assert events[0][1] == 'lane.updated'
+    response.close()
+
+def test_event_streams_capped_per_worker(app, client, init_database):
+    """Test that streams beyond EVENTS_MAX_STREAMS are refused while requests are still served"""
+    app.config['EVENTS_MAX_STREAMS'] = 2
+    streams = [client.get('/api/boards/1/events') for _ in range(2)]
+    assert [response.status_code for response in streams] == [200, 200]
+    
+    response = client.get('/api/boards/1/events')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '3'
+    assert '/api/boards/1/changes' in json.loads(response.data)['error']
+    assert client.get('/api/boards/1').status_code == 200
+    
+    # A closed stream frees its place, even if its body was never read
+    streams.pop().close()
+    streams.append(client.get('/api/boards/1/events'))
+    assert streams[-1].status_code == 200
+    for response in streams:
+        response.close()
+    assert app.extensions['event_broker'].streams == 0
+
+def test_requests_served_while_subscribers_hold_gunicorn_threads(tmp_path):
+    """Test that a gunicorn worker with the shipped settings answers requests with every stream taken"""
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'serve.sqlite'}", FLASK_APP='wsgi.py',
+               GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_WORKERS='1', GUNICORN_THREADS='4',
+               GUNICORN_GRACEFUL_TIMEOUT='1')
+    env.pop('EVENTS_MAX_STREAMS', None)
+    subprocess.run([sys.executable, '-m', 'flask', 'init-db'], cwd=BACKEND_DIR, env=env, check=True,
+                   capture_output=True)
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'wsgi:app'], cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    connections = []
+    
+    def get(path):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        connections.append(connection)
+        connection.request('GET', path)
+        return connection.getresponse()
+    
+    try:
+        deadline = time.monotonic() + 15
+        while True:
+            try:
+                get('/api/boards').read()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+        
+        # As many subscribers as the worker has threads: half of them are turned away
+        statuses = [get('/api/boards/1/events').status for _ in range(4)]
+        assert sorted(statuses) == [200, 200, 503, 503]
+        response = get('/api/boards/1')
+        assert response.status == 200
+        assert json.loads(response.read())['name'] == 'Sample Board'
+    finally:
+        for connection in connections:
+            connection.close()
+        server.terminate()
+        server.wait(10)
+
+def test_event_stream_board_not_found(client):
+    """Test streaming events of a board that doesn't exist"""
+    response = client.get('/api/boards/999/events')
+    assert response.status_code == 404
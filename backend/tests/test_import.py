@@ -0,0 +1,101 @@
+import json
+import pytest
+from app.importer import CardImporter
+from app.models.board import Board
+from app.models.card import Card
+from app.models.event import BoardEvent
+
+def test_import_ndjson(client, init_database):
+    """Test appending cards from NDJSON to several lanes"""
+    lines = [
+        {'lane_id': 1, 'title': 'Imported 1', 'color': 'red'},
+        {'lane_id': 2, 'title': 'Imported 2', 'due_date': '2026-01-31T12:00:00'},
+        {'lane_id': 1, 'title': 'Imported 3'}
+    ]
+    response = client.post('/api/cards/import', data='\n'.join(json.dumps(line) for line in lines) + '\n',
+                           content_type='application/x-ndjson')
+    assert response.status_code == 201
+    assert json.loads(response.data)['imported'] == 3
+    
+    # Appended after the existing cards, in input order
+    titles = [card['title'] for card in json.loads(client.get('/api/lanes/1/cards').data)]
+    assert titles == ['Card 1', 'Card 2', 'Imported 1', 'Imported 3']
+    card = Card.query.filter_by(title='Imported 2').one()
+    assert card.due_date.day == 31
+    assert Board.query.get(1).version == 2
+    # One event for the board's imported cards, not one per card
+    event, = BoardEvent.query.all()
+    assert (event.kind, event.version) == ('cards.imported', 2)
+    assert json.loads(event.data) == {'count': 3, 'first_id': 4, 'last_id': 6}
+
+def test_import_csv(client, init_database):
+    """Test importing cards from CSV"""
+    data = 'lane_id,title,description\n3,"Quoted, title",Multi\n3,Plain,\n'
+    response = client.post('/api/cards/import', data=data, content_type='text/csv')
+    assert response.status_code == 201
+    cards = json.loads(client.get('/api/lanes/3/cards').data)
+    assert [(card['title'], card['description']) for card in cards] == [
+        ('Quoted, title', 'Multi'), ('Plain', '')]
+
+def test_import_invalid_rows(client, init_database):
+    """Test that an invalid row stops the import and reports its line"""
+    data = '{"lane_id": 1, "title": "Fine"}\n{"lane_id": 999, "title": "No lane"}\n'
+    response = client.post('/api/cards/import', data=data, content_type='application/x-ndjson')
+    assert response.status_code == 400
+    result = json.loads(response.data)
+    assert result['error'] == 'Line 2: lane 999 not found'
+    assert result['imported'] == 0
+    assert Card.query.filter_by(title='Fine').count() == 0
+    
+    for data in ['not json\n', '{"lane_id": 1}\n', '{"title": "No lane"}\n',
+                 '{"lane_id": 1, "title": "T", "description": {}}\n', '{"lane_id": 1, "title": "T", "color": []}\n']:
+        response = client.post('/api/cards/import', data=data, content_type='application/x-ndjson')
+        assert response.status_code == 400
+
+def test_import_in_chunks(app, init_database):
+    """Test that full chunks are committed as they fill up"""
+    importer = CardImporter(chunk_size=2)
+    lines = [json.dumps({'lane_id': 2, 'title': f'Card {i}'}) for i in range(5)] + ['{"lane_id": 2}']
+    try:
+        importer.run(lines)
+    except ValueError:
+        pass
+    assert importer.imported == 4
+    assert Card.query.filter_by(lane_id=2).count() == 5
+    titles = [card.title for card in Card.query.filter_by(lane_id=2).order_by(Card.rank)]
+    assert titles == ['Card 3', 'Card 0', 'Card 1', 'Card 2', 'Card 3']
+
+def test_import_chunks_see_other_writers(client, init_database):
+    """Test that each chunk appends after cards written by others since the last one"""
+    importer = CardImporter(chunk_size=2)
+    for number in range(2):
+        importer.add(number + 1, {'lane_id': 1, 'title': f'Imported {number}'})
+    client.post('/api/lanes/1/cards', json={'title': 'Other writer'})
+    for number in range(2, 4):
+        importer.add(number + 1, {'lane_id': 1, 'title': f'Imported {number}'})
+    
+    cards = Card.query.filter_by(lane_id=1).order_by(Card.rank).all()
+    assert [card.title for card in cards][-5:] == [
+        'Imported 0', 'Imported 1', 'Other writer', 'Imported 2', 'Imported 3']
+    assert len({card.rank for card in cards}) == len(cards)
+
+def test_import_lane_deleted_between_chunks(client, init_database):
+    """Test that a lane deleted by another writer fails the import with its line"""
+    importer = CardImporter(chunk_size=2)
+    importer.add(1, {'lane_id': 3, 'title': 'First'})
+    importer.add(2, {'lane_id': 3, 'title': 'Second'})
+    client.delete('/api/lanes/3')
+    importer.add(3, {'lane_id': 1, 'title': 'Third'})
+    # The chunk is full, so adding its last card writes it
+    with pytest.raises(ValueError, match='Line 4: lane 3 not found'):
+        importer.add(4, {'lane_id': 3, 'title': 'Fourth'})
+    assert importer.imported == 2
+
+def test_import_cards_command(runner, init_database, tmp_path):
+    """Test the import-cards CLI command"""
+    source = tmp_path / 'cards.csv'
+    source.write_text('lane_id,title\n1,From CLI\n2,Also from CLI\n')
+    result = runner.invoke(args=['import-cards', str(source)])
+    assert result.exit_code == 0
+    assert 'Imported 2 cards' in result.output
+    assert Card.query.filter(Card.title.like('%CLI')).count() == 2
@@ -24,7 +24,7 @@ def test_get_lane(client, init_database):
     assert response.status_code == 200
     data = json.loads(response.data)
     assert data['name'] == 'Todo'
-    assert data['position'] == 0
+    assert 'position' not in data  # Deprecated: the order is that of the board's listing
     assert data['board_id'] == 1
     assert len(data['cards']) == 2  # Based on our test data
 
@@ -37,8 +37,11 @@ def test_create_lane(client, init_database):
     assert response.status_code == 201
     data = json.loads(response.data)
     assert data['name'] == 'New Lane'
-    assert data['position'] == 3  # Should be added at the end
     assert data['board_id'] == 1
+    
+    # Should be added at the end
+    data = json.loads(client.get('/api/boards/1/lanes').data)
+    assert [lane['name'] for lane in data] == ['Todo', 'Doing', 'Done', 'New Lane']
 
 def test_update_lane(client, init_database):
     response = client.put(
@@ -49,7 +52,9 @@ def test_update_lane(client, init_database):
     assert response.status_code == 200
     data = json.loads(response.data)
     assert data['name'] == 'Updated Lane'
-    assert data['position'] == 3
+    
+    data = json.loads(client.get('/api/boards/1/lanes').data)
+    assert [lane['id'] for lane in data] == [2, 3, 1]
 
 def test_delete_lane(client, init_database):
     # First confirm lane exists
@@ -77,4 +82,35 @@ def test_reorder_lanes(client, init_database):
     assert len(data) == 3
     assert data[0]['id'] == 3
     assert data[1]['id'] == 1
-    assert data[2]['id'] == 2
\ No newline at end of file
+    assert data[2]['id'] == 2
+
+def test_update_lane_after_neighbour(client, init_database):
+    response = client.put(
+        '/api/lanes/1',
+        data=json.dumps({'after_id': 2}),
+        content_type='application/json'
+    )
+    assert response.status_code == 200
+    
+    response = client.get('/api/boards/1/lanes')
+    data = json.loads(response.data)
+    assert [lane['id'] for lane in data] == [2, 1, 3]
+
+def test_create_lane_board_not_found(client, init_database):
+    response = client.post('/api/lanes', json={'name': 'Orphan', 'board_id': 99})
+    assert response.status_code == 404
+    assert json.loads(response.data)['error'] == 'Board not found'
+    assert len(json.loads(client.get('/api/lanes').data)) == 3
+
+@pytest.mark.parametrize('body', [{'position': 'a'}, {'position': -1}, {'after_id': 'a'}, {'before_id': None, 'after_id': {}}])
+def test_update_lane_invalid_placement(client, init_database, body):
+    response = client.put('/api/lanes/1', json=dict(body, name='Moved'))
+    assert response.status_code == 400
+    assert 'must be a non-negative integer' in json.loads(response.data)['error']
+    assert json.loads(client.get('/api/lanes/1').data)['name'] == 'Todo'
+
+def test_create_lane_invalid_position(client, init_database):
+    response = client.post('/api/boards/1/lanes', json={'name': 'New Lane', 'position': 'a'})
+    assert response.status_code == 400
+    assert json.loads(response.data)['error'] == 'position must be a non-negative integer'
+    assert len(json.loads(client.get('/api/boards/1/lanes').data)) == 3
@@ -0,0 +1,63 @@
+import json
+import pytest
+from app.models.card import Card
+
+def fetch_all_pages(client, url, limit):
+    items, pages, cursor = [], 0, None
+    while True:
+        response = client.get(url, query_string={'limit': limit, **({'after': cursor} if cursor else {})})
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        items.extend(data['items'])
+        pages += 1
+        cursor = data['next']
+        if cursor is None:
+            return items, pages
+
+def test_paginate_cards(client, init_database):
+    items, pages = fetch_all_pages(client, '/api/cards', 2)
+    assert [card['id'] for card in items] == [1, 2, 3]
+    assert pages == 2
+
+def test_paginate_lane_cards_in_order(client, init_database):
+    for i in range(5):
+        client.post('/api/lanes/1/cards', data=json.dumps({'title': f'Extra {i}'}),
+                    content_type='application/json')
+    # Move the last card to the front of the lane
+    client.put('/api/cards/8', data=json.dumps({'before_id': 1}), content_type='application/json')
+    
+    items, pages = fetch_all_pages(client, '/api/lanes/1/cards', 3)
+    ordered = [card.id for card in Card.query.filter_by(lane_id=1).order_by(Card.rank)]
+    assert [card['id'] for card in items] == ordered
+    assert ordered[0] == 8
+    assert pages == 3
+
+def test_paginate_boards_and_lanes(client, init_database):
+    items, _ = fetch_all_pages(client, '/api/boards', 10)
+    assert [board['name'] for board in items] == ['Test Board']
+    items, _ = fetch_all_pages(client, '/api/lanes', 1)
+    assert [lane['name'] for lane in items] == ['Todo', 'Doing', 'Done']
+
+def test_unpaginated_listing_is_a_plain_list(client, init_database):
+    data = json.loads(client.get('/api/lanes').data)
+    assert isinstance(data, list)
+
+@pytest.mark.parametrize('query', ['limit=0', 'limit=abc', 'limit=5000', 'after=not-a-cursor',
+                                   'after=W3t9XQ', 'after=W1sxXV0', 'after=W251bGxd'])
+def test_paginate_rejects_bad_arguments(client, init_database, query):
+    response = client.get(f'/api/cards?{query}')
+    assert response.status_code == 400
+
+def test_stream_cards_as_ndjson(client, init_database):
+    response = client.get('/api/cards', headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.is_streamed
+    rows = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [card['title'] for card in rows] == ['Card 1', 'Card 2', 'Card 3']
+
+def test_stream_lane_cards_with_query_flag(client, init_database, monkeypatch):
+    monkeypatch.setattr('app.api.listing.STREAM_BATCH_SIZE', 1)
+    response = client.get('/api/lanes/1/cards?stream=1')
+    assert response.mimetype == 'application/x-ndjson'
+    assert [json.loads(line)['id'] for line in response.data.decode().splitlines()] == [1, 2]
@@ -0,0 +1,41 @@
+import json
+from prometheus_client import REGISTRY
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+def test_request_metrics(client, init_database):
+    """Test that requests are counted and timed per route"""
+    labels = {'method': 'GET', 'route': '/api/boards/<int:board_id>'}
+    requests = sample('notscrum_http_requests_total', status='200', **labels)
+    durations = sample('notscrum_http_request_duration_seconds_count', **labels)
+    statements = sample('notscrum_http_request_sql_statements_sum', **labels)
+    missing = sample('notscrum_http_requests_total', method='GET', route='unmatched', status='404')
+    
+    client.get('/api/boards/1')
+    client.get('/api/boards/1')
+    client.get('/no/such/path')
+    
+    assert sample('notscrum_http_requests_total', status='200', **labels) == requests + 2
+    assert sample('notscrum_http_request_duration_seconds_count', **labels) == durations + 2
+    assert sample('notscrum_http_request_sql_statements_sum', **labels) > statements
+    assert sample('notscrum_http_requests_total', method='GET', route='unmatched', status='404') == missing + 1
+    assert sample('notscrum_http_requests_in_flight', **labels) == 0
+
+def test_metrics_endpoint(client, init_database):
+    """Test the Prometheus text exposition"""
+    client.post('/api/lanes/1/cards', json={'title': 'Counted'})
+    
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    body = response.data.decode()
+    assert 'notscrum_http_requests_total{method="POST",route="/api/lanes/<int:lane_id>/cards",status="201"}' in body
+    assert 'notscrum_http_request_sql_seconds_bucket' in body
+    assert 'notscrum_db_pool_connections{state="checked_out"}' in body
+
+def test_healthz(client):
+    """Test the health check"""
+    response = client.get('/healthz')
+    assert response.status_code == 200
+    assert json.loads(response.data) == {'status': 'ok'}
@@ -0,0 +1,67 @@
+import json
+from datetime import datetime, timezone
+import msgpack
+from app.models.card import Card
+
+MSGPACK = 'application/msgpack'
+
+def unpack(response):
+    assert response.content_type == MSGPACK
+    return msgpack.unpackb(response.data, timestamp=3)
+
+def as_json(value):
+    """The JSON form of a decoded MessagePack value: naive UTC datetimes in ISO 8601"""
+    if isinstance(value, dict):
+        return {key: as_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [as_json(item) for item in value]
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+    return value
+
+def test_json_by_default(client, init_database):
+    for accept in (None, '*/*', 'application/json', f'application/json, {MSGPACK}'):
+        response = client.get('/api/boards/1?include=cards', headers={'Accept': accept} if accept else {})
+        assert response.content_type == 'application/json'
+        assert 'Accept' in response.headers['Vary']
+
+def test_msgpack_responses_match_json(client, init_database):
+    for url in ('/api/boards', '/api/boards/1?include=cards', '/api/boards/1/lanes', '/api/lanes/1',
+                '/api/lanes/1/cards', '/api/cards', '/api/cards?limit=2', '/api/cards/1'):
+        response = client.get(url, headers={'Accept': MSGPACK})
+        assert response.status_code == 200, url
+        assert 'Accept' in response.headers['Vary']
+        assert as_json(unpack(response)) == json.loads(client.get(url).data), url
+
+def test_msgpack_datetimes_are_timestamps(client, init_database):
+    response = client.get('/api/boards/1?include=cards', headers={'Accept': MSGPACK})
+    card = unpack(response)['lanes'][0]['cards'][0]
+    assert card['created_at'] == Card.query.get(card['id']).created_at.replace(tzinfo=timezone.utc)
+    # Well under the 28 bytes of the quoted ISO 8601 string
+    assert len(msgpack.packb(msgpack.Timestamp.from_datetime(card['created_at']))) <= 12
+
+def test_snapshot_cache_keeps_formats_apart(app, client, init_database):
+    app.extensions['snapshot_cache'].clear()
+    for _ in range(2):
+        assert client.get('/api/boards/1', headers={'Accept': MSGPACK}).content_type == MSGPACK
+        assert client.get('/api/boards/1').content_type == 'application/json'
+    assert app.extensions['snapshot_cache'].stats()['entries'] == 2
+
+def test_msgpack_request_bodies(client, init_database):
+    due = datetime(2024, 3, 4, 5, 6, 7, tzinfo=timezone.utc)
+    response = client.post('/api/cards', data=msgpack.packb({'title': 'Packed', 'lane_id': 1}),
+                           content_type=MSGPACK, headers={'Accept': MSGPACK})
+    assert response.status_code == 201
+    card = unpack(response)
+    assert card['title'] == 'Packed'
+
+    response = client.put(f"/api/cards/{card['id']}", content_type=MSGPACK,
+                          data=msgpack.packb({'title': 'Repacked', 'due_date': msgpack.Timestamp.from_datetime(due)}))
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['title'] == 'Repacked'
+    assert data['due_date'] == '2024-03-04T05:06:07'
+
+def test_invalid_msgpack_body(client, init_database):
+    response = client.post('/api/cards', data=b'\xc1', content_type=MSGPACK)
+    assert response.status_code == 400
@@ -0,0 +1,46 @@
+import random
+import pytest
+from app.ordering import MAX_KEY_LENGTH, key_between, keys_after
+from app.models.card import Card
+
+def test_key_between_bounds():
+    assert key_between(None, None) == 'a0'
+    assert key_between('a0', None) == 'a1'
+    assert key_between(None, 'a0') == 'Zz'
+    assert 'a0' < key_between('a0', 'a1') < 'a1'
+
+def test_key_between_random_inserts_stay_sorted():
+    random.seed(42)
+    keys = [key_between(None, None)]
+    for _ in range(2000):
+        i = random.randint(0, len(keys))
+        before = keys[i - 1] if i > 0 else None
+        after = keys[i] if i < len(keys) else None
+        keys.insert(i, key_between(before, after))
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+
+def test_key_between_rejects_unordered_bounds():
+    with pytest.raises(ValueError):
+        key_between('a1', 'a0')
+
+def test_keys_after_appends_short_keys():
+    keys = keys_after(None, 1000)
+    assert keys == sorted(keys)
+    assert max(len(key) for key in keys) <= 3
+
+def test_rank_for_rebalances_long_keys(app, init_database):
+    card = Card.query.get(3)
+    card.lane_id, card.rank = 1, Card.rank_for(1)
+    # Keep squeezing one card between the first card and the other one to grow the keys
+    moving, other = 2, 3
+    for _ in range(MAX_KEY_LENGTH * 8):
+        rank = Card.rank_for(1, after_id=1, before_id=other, exclude_id=moving)
+        assert len(rank) <= MAX_KEY_LENGTH
+        Card.query.filter_by(id=moving).update({'rank': rank})
+        moving, other = other, moving
+    assert [card.id for card in Card.query.filter_by(lane_id=1).order_by(Card.rank)] == [1, other, moving]
+
+def test_move_many_clamps_negative_index_to_front(app, init_database):
+    Card.move_many([(3, 1, -1)])
+    assert [card.id for card in Card.query.filter_by(lane_id=1).order_by(Card.rank)] == [3, 1, 2]
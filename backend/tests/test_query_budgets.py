@@ -0,0 +1,129 @@
+import json
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models.board import Board
+from app.models.card import Card
+from app.models.lane import Lane
+from app.seed import generate
+
+def batch(*entries):
+    """A POST /api/batch of BUDGETS entries, allowed their budgets plus BEGIN IMMEDIATE and
+    a SAVEPOINT and RELEASE for each"""
+    def body(ids):
+        return {'requests': [{'method': method, 'path': url.format(**ids),
+                              'body': data(ids) if callable(data) else data} for method, url, data, _ in entries]}
+    return ('POST', '/api/batch', body, 1 + sum(budget + 2 for *_, budget in entries))
+
+# (method, url, body, most statements allowed). The url is formatted with the ids of the
+# board under test; a callable body is called with them when the request is made, and a
+# string body is sent as it is. Requests run in order against the same board, so later
+# ones see the earlier writes.
+BUDGETS = [
+    ('GET', '/api/boards', None, 1),
+    ('GET', '/api/boards/{board}', None, 2),
+    ('GET', '/api/boards/{board}?include=cards', None, 3),
+    ('GET', '/api/boards/{board}/lanes', None, 2),
+    ('GET', '/api/boards/{board}/export', None, 2),
+    ('GET', '/api/boards/{board}/export?stream=1', None, 2),
+    ('GET', '/api/lanes?limit=10', None, 1),
+    ('GET', '/api/lanes/{lane}', None, 1),
+    ('GET', '/api/lanes/{lane}/cards', None, 2),
+    ('GET', '/api/lanes/{lane}/cards?limit=5', None, 2),
+    ('GET', '/api/cards?limit=10', None, 1),
+    ('GET', '/api/cards/{card}', None, 1),
+    ('GET', '/api/search?q=card&board_id={board}', None, 1),
+    ('POST', '/api/cards', lambda ids: {'title': 'New Card', 'lane_id': ids['lane']}, 8),
+    ('POST', '/api/lanes/{lane}/cards', {'title': 'Lane Card'}, 8),
+    ('POST', '/api/cards/import', lambda ids: '\n'.join(
+        json.dumps({'lane_id': lane_id, 'title': f'Imported {n}'}) for n in range(5)
+        for lane_id in (ids['lane'], ids['lane2'])), 9),
+    batch(('POST', '/api/lanes/{lane}/cards', {'title': 'Batched'}, 8),
+          ('PUT', '/api/cards/$0.id', {'title': 'Batched and renamed'}, 11)),
+    ('PUT', '/api/cards/{card}', lambda ids: {'title': 'Renamed', 'after_id': ids['card2']}, 11),
+    ('PUT', '/api/cards/{card}/move', lambda ids: {'lane_id': ids['lane2'], 'position': 0}, 10),
+    ('POST', '/api/cards/move',
+     lambda ids: {'moves': [{'card_id': ids['card2'], 'lane_id': ids['lane2'], 'position': 0}]}, 9),
+    ('PUT', '/api/lanes/{lane3}/cards/reorder', lambda ids: {'card_order': [
+        id for id, in db.session.query(Card.id).filter_by(lane_id=ids['lane3']).order_by(Card.rank.desc())]}, 11),
+    ('POST', '/api/boards/{board}/lanes', {'name': 'New Lane'}, 8),
+    ('POST', '/api/lanes', lambda ids: {'name': 'Another Lane', 'board_id': ids['board']}, 8),
+    ('PUT', '/api/lanes/{lane2}', {'name': 'Renamed', 'position': 0}, 9),
+    ('PUT', '/api/boards/{board}', {'name': 'Renamed'}, 7),
+    ('POST', '/api/boards', {'name': 'New Board'}, 9),
+    ('PUT', '/api/boards/{board}/lanes/reorder', lambda ids: {'lane_order': [
+        id for id, in db.session.query(Lane.id).filter_by(board_id=ids['board']).order_by(Lane.rank.desc())]}, 9),
+    # One more to read the cards of the import above
+    ('GET', '/api/boards/{board}/changes?since=1', None, 4),
+    ('POST', '/api/boards/{board}/clone', {}, 7),
+    ('DELETE', '/api/cards/{last_card}', None, 6),
+    ('DELETE', '/api/lanes/{last_lane}', None, 8),
+    ('DELETE', '/api/boards/{board}', None, 10),
+]
+
+@pytest.fixture
+def count_statements(app):
+    counts = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if counts:
+            counts[-1] += 1
+
+    def run(callable):
+        """Call callable and return the number of statements it executed"""
+        counts.append(0)
+        try:
+            callable()
+            return counts[-1]
+        finally:
+            counts.pop()
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count)
+    yield run
+    event.remove(engine, 'before_cursor_execute', count)
+
+def board_ids(board_id):
+    """The ids the requests of BUDGETS refer to, on one board"""
+    lanes = [id for id, in db.session.query(Lane.id).filter_by(board_id=board_id).order_by(Lane.rank)]
+    cards = [id for id, in db.session.query(Card.id).filter_by(lane_id=lanes[0]).order_by(Card.rank)]
+    last_cards = [id for id, in db.session.query(Card.id).filter_by(lane_id=lanes[-1]).order_by(Card.rank)]
+    return {'board': board_id, 'lane': lanes[0], 'lane2': lanes[1], 'lane3': lanes[2], 'last_lane': lanes[-1],
+            'card': cards[0], 'card2': cards[1], 'last_card': last_cards[-1]}
+
+def test_statements_within_budget_and_independent_of_board_size(app, client, count_statements):
+    generate(1, 3, 2)
+    generate(1, 50, 20)
+    small, large = board_ids(1), board_ids(2)
+
+    failures = []
+    for method, url, body, budget in BUDGETS:
+        counts = []
+        for ids in (small, large):
+            # A cold snapshot cache, so reads are counted the way a first request runs them
+            app.extensions['snapshot_cache'].clear()
+            data = body(ids) if callable(body) else body
+
+            def request():
+                response = client.open(url.format(**ids), method=method, content_type='application/json',
+                                       data=json.dumps(data) if data is not None and not isinstance(data, str) else data)
+                response.get_data()  # Streamed bodies run their queries while being read
+                assert response.status_code < 400, (method, url, response.data)
+            counts.append(count_statements(request))
+        if counts[0] > budget or counts[0] != counts[1]:
+            failures.append(f'{method} {url}: {counts[0]} statements on 3 lanes, {counts[1]} on 50 '
+                            f'(budget {budget})')
+
+    assert not failures, '\n'.join(failures)
+
+def test_board_to_dict_statements_independent_of_lanes(app, count_statements):
+    generate(1, 3, 2)
+    generate(1, 20, 5)
+    small, large = Board.query.get(1), Board.query.get(2)
+
+    assert count_statements(small.to_dict) == count_statements(large.to_dict) == 2
+    data = large.to_dict()
+    assert len(data['lanes']) == 20
+    assert all(len(lane['cards']) == 5 for lane in data['lanes'])
+    assert data['lanes'][0]['cards'][0]['id'] == Card.query.filter_by(
+        lane_id=data['lanes'][0]['id']).order_by(Card.rank).first().id
@@ -0,0 +1,86 @@
+import json
+import re
+import pytest
+from sqlalchemy import event
+from app import db
+from app.api.listing import encode_cursor
+
+# Listing every row is a full scan by definition
+FULL_SCAN_ALLOWED = {
+    ('GET', '/api/boards'),
+    ('GET', '/api/lanes'),
+    ('GET', '/api/cards'),
+}
+
+ENDPOINTS = [
+    ('GET', '/api/boards', None),
+    ('GET', '/api/boards?limit=1&after=' + encode_cursor([1]), None),
+    ('GET', '/api/boards/1', None),
+    ('GET', '/api/boards/1?include=cards', None),
+    ('GET', '/api/boards/1/lanes', None),
+    ('POST', '/api/boards/1/lanes', {'name': 'New Lane'}),
+    ('PUT', '/api/boards/1', {'name': 'Renamed'}),
+    ('PUT', '/api/boards/1/lanes/reorder', {'lane_order': [3, 2, 1, 4]}),
+    ('GET', '/api/lanes', None),
+    ('GET', '/api/lanes?limit=1&after=' + encode_cursor([1]), None),
+    ('GET', '/api/lanes/1', None),
+    ('POST', '/api/lanes', {'name': 'Another Lane', 'board_id': 1}),
+    ('PUT', '/api/lanes/2', {'after_id': 3}),
+    ('PUT', '/api/lanes/2', {'position': 0}),
+    ('GET', '/api/lanes/1/cards', None),
+    ('GET', '/api/lanes/1/cards?limit=1&after=' + encode_cursor(['a0', 1]), None),
+    ('GET', '/api/cards', None),
+    ('GET', '/api/cards?limit=1&after=' + encode_cursor([1]), None),
+    ('GET', '/api/cards/1', None),
+    ('POST', '/api/cards', {'title': 'New Card', 'lane_id': 1}),
+    ('POST', '/api/lanes/1/cards', {'title': 'Lane Card'}),
+    ('POST', '/api/cards/import', {'lane_id': 1, 'title': 'Imported'}),
+    ('PUT', '/api/cards/1', {'title': 'Renamed', 'after_id': 2}),
+    ('PUT', '/api/cards/1', {'lane_id': 2}),
+    ('PUT', '/api/cards/2/move', {'lane_id': 2, 'position': 0}),
+    ('POST', '/api/cards/move', {'moves': [{'card_id': 3, 'lane_id': 1, 'position': 0}]}),
+    ('PUT', '/api/lanes/2/cards/reorder', {'card_order': [1, 2]}),
+    ('GET', '/api/boards/1/changes?since=1', None),
+    ('GET', '/api/search?q=Card&board_id=1', None),
+    ('GET', '/api/search?q=Card&limit=1&after=' + encode_cursor([-1.0, 1]), None),
+    ('GET', '/api/boards/1/export', None),
+    ('POST', '/api/boards/1/clone', {}),
+    ('DELETE', '/api/cards/1', None),
+    ('DELETE', '/api/lanes/2', None),
+    ('DELETE', '/api/boards/1', None),
+]
+
+FULL_SCAN = re.compile(r'^SCAN (board|lane|card|board_event)\b')
+
+@pytest.fixture
+def statements(app):
+    captured = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            parameters = parameters[0]
+        captured.append((statement, parameters))
+    
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', capture)
+    yield captured
+    event.remove(engine, 'before_cursor_execute', capture)
+
+def test_endpoints_use_indexes(client, init_database, statements):
+    failures = []
+    for method, url, body in ENDPOINTS:
+        del statements[:]
+        response = client.open(url, method=method, data=json.dumps(body) if body else None,
+                               content_type='application/json')
+        assert response.status_code < 400, (method, url, response.data)
+        
+        for statement, parameters in list(statements):
+            if not statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+                continue
+            plan = db.session.connection().exec_driver_sql(
+                'EXPLAIN QUERY PLAN ' + statement, tuple(parameters))
+            for row in plan:
+                if FULL_SCAN.match(row[-1]) and (method, url) not in FULL_SCAN_ALLOWED:
+                    failures.append(f'{method} {url}: {row[-1]} in {statement}')
+    
+    assert not failures, '\n'.join(failures)
@@ -0,0 +1,67 @@
+import json
+
+def search(client, query):
+    response = client.get(f'/api/search?{query}')
+    assert response.status_code == 200
+    return json.loads(response.data)
+
+def test_search_cards(client, init_database):
+    """Test that search matches titles and descriptions, best matches first"""
+    client.post('/api/lanes/1/cards', json={'title': 'Login page', 'description': 'Fix the login redirect'})
+    client.post('/api/lanes/2/cards', json={'title': 'Signup', 'description': 'Link to the login page'})
+    client.post('/api/lanes/3/cards', json={'title': 'Unrelated', 'description': 'Nothing to see'})
+    
+    data = search(client, 'q=login')
+    assert [card['title'] for card in data['items']] == ['Login page', 'Signup']
+    assert data['items'][0]['lane_id'] == 1 and data['items'][0]['board_id'] == 1
+    assert data['next'] is None
+    
+    # Every word must match, the last one as a prefix
+    assert [card['title'] for card in search(client, 'q=login+redir')['items']] == ['Login page']
+    assert search(client, 'q=logout')['items'] == []
+
+def test_search_diacritics_and_snippets(client, init_database):
+    """Test accent-insensitive matching and HTML-escaped snippets"""
+    client.post('/api/lanes/1/cards', json={'title': 'Café <b>menu</b>', 'description': ''})
+    
+    data = search(client, 'q=cafe')
+    assert len(data['items']) == 1
+    assert data['items'][0]['snippet'] == '<mark>Café</mark> &lt;b&gt;menu&lt;/b&gt;'
+
+def test_search_board_filter(client, init_database):
+    """Test restricting search to one board"""
+    board = json.loads(client.post('/api/boards', json={'name': 'Other'}).data)
+    lane = json.loads(client.post(f'/api/boards/{board["id"]}/lanes', json={'name': 'Todo'}).data)
+    client.post(f'/api/lanes/{lane["id"]}/cards', json={'title': 'Card 4'})
+    
+    assert len(search(client, 'q=card')['items']) == 4
+    data = search(client, f'q=card&board_id={board["id"]}')
+    assert [card['title'] for card in data['items']] == ['Card 4']
+
+def test_search_pagination(client, init_database):
+    """Test paging through results with the next cursor"""
+    titles = []
+    query = 'q=card&limit=2'
+    while True:
+        data = search(client, query)
+        titles += [card['title'] for card in data['items']]
+        if not data['next']:
+            break
+        query = f'q=card&limit=2&after={data["next"]}'
+    
+    assert sorted(titles) == ['Card 1', 'Card 2', 'Card 3']
+
+def test_search_follows_changes(client, init_database):
+    """Test that the index follows card updates and deletes"""
+    client.put('/api/cards/1', json={'title': 'Renamed'})
+    client.delete('/api/cards/2')
+    
+    assert [card['id'] for card in search(client, 'q=card')['items']] == [3]
+    assert [card['id'] for card in search(client, 'q=renamed')['items']] == [1]
+
+def test_search_invalid(client, init_database):
+    """Test that a query without words or a bad limit is rejected"""
+    assert client.get('/api/search').status_code == 400
+    assert client.get('/api/search?q=%22*%22').status_code == 400
+    assert client.get('/api/search?q=card&limit=0').status_code == 400
+    assert client.get('/api/search?q=card&after=bad').status_code == 400
@@ -0,0 +1,37 @@
+from app.models.board import Board
+from app.models.card import Card
+from app.models.lane import Lane
+
+def test_init_db_creates_sample_board(runner):
+    """Test that init-db seeds an empty database once"""
+    result = runner.invoke(args=['init-db'])
+    assert result.exit_code == 0, result.output
+    assert 'Created the sample board' in result.output
+    assert Board.query.count() == 1
+    lane = Lane.query.filter_by(name='To Do').one()
+    assert [card.title for card in Card.query.filter_by(lane_id=lane.id).order_by(Card.rank)] == \
+        ['Welcome to NotScrum', 'Try dragging this card']
+    
+    # Running it again leaves the data alone
+    result = runner.invoke(args=['init-db'])
+    assert result.exit_code == 0, result.output
+    assert 'not seeding' in result.output
+    assert Board.query.count() == 1
+
+def test_init_db_generates_data(runner):
+    """Test generating a synthetic dataset with init-db"""
+    result = runner.invoke(args=['init-db', '--boards', '2', '--lanes', '3', '--cards', '4'])
+    assert result.exit_code == 0, result.output
+    assert 'Generated 2 boards, 6 lanes and 24 cards' in result.output
+    assert Card.query.count() == 24
+    
+    lane = Lane.query.first()
+    cards = Card.query.filter_by(lane_id=lane.id).order_by(Card.rank).all()
+    ranks = [card.rank for card in cards]
+    assert len(set(ranks)) == len(ranks) == 4
+
+def test_init_db_without_sample(runner):
+    """Test that --no-sample only prepares the schema"""
+    result = runner.invoke(args=['init-db', '--no-sample'])
+    assert result.exit_code == 0, result.output
+    assert Board.query.count() == 0
@@ -0,0 +1,76 @@
+import json
+from datetime import datetime
+from flask import json as flask_json, jsonify
+from app import db
+from app.models.card import Card
+from app.serialization import dumps
+
+SAMPLES = [
+    [],
+    {'b': 1, 'a': [True, False, None], 'c': {'z': 'x', 'y': -12}},
+    {'text': 'plain ascii with "quotes" \\ and /slashes/'},
+    {'text': 'control \n\r\t\b\f\x00\x1f\x7f characters'},
+    {'text': 'non-ascii: café ☃ \U0001f600  '},
+    {2: 'integer keys', 1: 'b'},
+    {'big': 2 ** 70},
+]
+
+def test_dumps_matches_jsonify(app):
+    for sample in SAMPLES:
+        assert dumps(sample) == jsonify(sample).get_data(), sample
+
+def test_dumps_writes_datetimes_like_to_dict(app):
+    value = {'at': datetime(2024, 5, 6, 7, 8, 9, 123456), 'whole': datetime(2024, 5, 6, 7, 8, 9)}
+    expected = {'at': '2024-05-06T07:08:09.123456', 'whole': '2024-05-06T07:08:09'}
+    assert dumps(value) == jsonify(expected).get_data()
+
+    # Also when the output needs Flask's encoder
+    value['text'] = expected['text'] = 'café'
+    assert dumps(value) == jsonify(expected).get_data()
+
+def test_dumps_follows_json_config(app):
+    app.config['JSON_AS_ASCII'] = False
+    app.config['JSON_SORT_KEYS'] = False
+    sample = {'b': 'café', 'a': 1}
+    assert dumps(sample) == jsonify(sample).get_data()
+
+    app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+    assert dumps(sample) == jsonify(sample).get_data()
+
+def add_cards():
+    lane_id = Card.query.first().lane_id
+    db.session.add_all([
+        Card(title='Café ☃', description=None, lane_id=lane_id,
+             due_date=datetime(2024, 1, 2, 3, 4, 5), created_at=datetime(2024, 1, 1)),
+        Card(title='Tabs\tand "quotes"', description='Line\nbreak', lane_id=lane_id,
+             color='red', due_date=datetime(2024, 1, 2, 3, 4, 5, 6)),
+    ])
+    db.session.commit()
+    return lane_id
+
+def test_card_listing_unchanged(client, init_database):
+    add_cards()
+    cards = [card.to_dict() for card in Card.query.order_by(Card.id)]
+
+    response = client.get('/api/cards')
+    assert response.data == jsonify(cards).get_data()
+
+    response = client.get('/api/cards?limit=2')
+    assert response.data == jsonify({'items': cards[:2], 'next': json.loads(response.data)['next']}).get_data()
+
+    response = client.get('/api/cards?stream=1')
+    assert response.data.decode() == ''.join(flask_json.dumps(card) + '\n' for card in cards)
+
+def test_lane_card_listing_unchanged(client, init_database):
+    lane_id = add_cards()
+    cards = [{
+        'id': card.id,
+        'title': card.title,
+        'description': card.description,
+        'lane_id': card.lane_id,
+        'color': card.color
+    } for card in Card.query.filter_by(lane_id=lane_id).order_by(Card.rank, Card.id)]
+
+    assert client.get(f'/api/lanes/{lane_id}/cards').data == jsonify(cards).get_data()
+    # Served again from the snapshot cache
+    assert client.get(f'/api/lanes/{lane_id}/cards').data == jsonify(cards).get_data()
@@ -0,0 +1,35 @@
+import time
+from app import db
+from app.sqlite import DEFAULT_PRAGMAS
+
+def test_pragmas_applied_on_connect(app):
+    """Test that new connections run the tuning pragmas"""
+    connection = db.session.connection()
+    assert connection.exec_driver_sql('PRAGMA busy_timeout').scalar() == DEFAULT_PRAGMAS['busy_timeout']
+    assert connection.exec_driver_sql('PRAGMA cache_size').scalar() == DEFAULT_PRAGMAS['cache_size']
+    assert connection.exec_driver_sql('PRAGMA foreign_keys').scalar() == 1
+
+def test_sqlite_maintenance_command(runner):
+    """Test the WAL checkpoint and optimize command"""
+    result = runner.invoke(args=['sqlite-maintenance'])
+    assert result.exit_code == 0
+    assert 'Checkpointed' in result.output
+
+def test_maintenance_runs_off_the_request_thread(app, client):
+    """Test that the first request starts the maintenance thread and no request runs it"""
+    maintenance = app.extensions['sqlite_maintenance']
+    app.config['SQLITE_MAINTENANCE_INTERVAL'] = 0.01
+    assert client.get('/api/boards').status_code == 200
+    try:
+        for _ in range(200):
+            if maintenance.runs:
+                break
+            time.sleep(0.01)
+        assert maintenance.runs
+    finally:
+        maintenance.stop()
+
+def test_maintenance_disabled(app, client):
+    app.config['SQLITE_MAINTENANCE_INTERVAL'] = 0
+    client.get('/api/boards')
+    assert app.extensions['sqlite_maintenance']._thread is None
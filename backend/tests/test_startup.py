@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+from app.startup import BACKEND_DIR, profile_startup
+
+# A worker's create_app(), once the app package is imported, in milliseconds
+CREATE_APP_BUDGET = 200
+# The whole cold start of a fresh interpreter; importing Flask and SQLAlchemy is most of it
+COLD_START_BUDGET = 750
+
+# Needed by the CLI or the API documentation only, so never imported by create_app()
+DEFERRED_MODULES = ('alembic', 'flask_migrate', 'apispec', 'marshmallow')
+
+def test_startup_budget():
+    # The fastest of a few runs, so a busy machine does not fail the build
+    reports = [profile_startup() for _ in range(3)]
+    create_app = min(report['create_app'] for report in reports) * 1000
+    cold_start = min(report['import'] + report['create_app'] for report in reports) * 1000
+    assert create_app < CREATE_APP_BUDGET
+    assert cold_start < COLD_START_BUDGET
+
+    modules = set(reports[0]['modules'])
+    for name in DEFERRED_MODULES:
+        assert name not in modules
+    assert 'sqlalchemy' in reports[0]['packages']
+
+def test_startup_profile_command(runner):
+    result = runner.invoke(args=['startup-profile', '--runs', '1', '--top', '3'])
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0].startswith('Cold start, median of 1 runs:')
+    assert 'create_app()' in lines[2]
+    assert len(lines) == 7
+
+def test_migrations_available_to_cli(tmp_path):
+    # Flask-Migrate is set up lazily, only when create_app() runs under the flask command
+    env = dict(os.environ, FLASK_APP='wsgi.py', DATABASE_URL=f"sqlite:///{tmp_path / 'cli.sqlite'}")
+    result = subprocess.run([sys.executable, '-m', 'flask', 'db', 'heads'],
+                            capture_output=True, text=True, cwd=BACKEND_DIR, env=env)
+    assert result.returncode == 0, result.stderr
+    assert '(head)' in result.stdout
@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+
+def test_spec_covers_every_api_route(app, client):
+    response = client.get('/static/swagger.json')
+    assert response.status_code == 200
+    spec = json.loads(response.data)
+    assert spec['openapi'] == '3.0.2'
+    assert set(spec['components']['schemas']) == {'Board', 'Lane', 'Card'}
+    
+    for rule in app.url_map.iter_rules():
+        if not rule.rule.startswith('/api/') or rule.endpoint.startswith('swagger_ui.'):
+            continue
+        path = rule.rule.replace('<int:', '{').replace('>', '}')
+        for method in rule.methods - {'HEAD', 'OPTIONS'}:
+            assert method.lower() in spec['paths'][path], (method, path)
+    
+    operation = spec['paths']['/api/cards/{card_id}']['put']
+    assert operation['summary'] == 'Update a card'
+    assert operation['parameters'][0]['name'] == 'card_id'
+    assert operation['parameters'][0]['schema'] == {'type': 'integer'}
+    assert operation['requestBody']['content']['application/json']['schema'] == {'$ref': '#/components/schemas/Card'}
+    assert '404' in operation['responses']
+    assert spec['paths']['/api/cards']['post']['responses']['201']
+    
+    position = spec['components']['schemas']['Card']['properties']['position']
+    assert position['writeOnly'] and position['deprecated']
+
+def test_spec_is_cached_with_etag(client):
+    first = client.get('/static/swagger.json')
+    etag = first.headers['ETag']
+    assert client.get('/static/swagger.json').data == first.data
+    
+    response = client.get('/static/swagger.json', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+
+def test_docs_stack_imported_lazily():
+    code = ('import sys; from app import create_app; app = create_app(); '
+            'print("apispec" in sys.modules); app.test_client().get("/static/swagger.json"); '
+            'print("apispec" in sys.modules)')
+    result = subprocess.run([sys.executable, '-W', 'ignore', '-c', code], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert result.stdout.split() == ['False', 'True']
+
+def test_docs_ui_served(client):
+    assert client.get('/api/docs/').status_code == 200
+    assert client.get('/').headers['Location'].endswith('/api/docs')